@@ -0,0 +1,177 @@
+"""
+Per-endpoint latency, status, payload and retry metrics for the API client.
+
+Endpoints are grouped by template (``/teachers/{id}``) so metrics don't grow
+with the number of records. Metrics are process-wide, shared by every session,
+and can be dumped in the Prometheus text exposition format.
+"""
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+
+# Upper bounds (seconds) of the cumulative latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Latest samples kept per endpoint for p50/p95/p99
+QUANTILE_WINDOW = int(os.getenv("API_METRICS_WINDOW", "1024"))
+# When set, the Prometheus text dump is rewritten there (at most every METRICS_FILE_INTERVAL seconds)
+METRICS_FILE = os.getenv("API_METRICS_FILE")
+METRICS_FILE_INTERVAL = float(os.getenv("API_METRICS_FILE_INTERVAL", "10"))
+
+# A path segment containing a digit is a record id (Mongo ObjectIds, UUIDs, numeric ids)
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_template(endpoint):
+    """Collapse record ids in a path: "/teachers/65f0c1/x?a=1" -> "/teachers/{id}/x"."""
+    path = endpoint.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.search(segment) else segment for segment in path.split("/"))
+
+
+def quantile(sorted_values, q):
+    """Nearest-rank quantile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class EndpointMetrics:
+    """Counters for one (method, endpoint template) pair."""
+
+    __slots__ = ("count", "latency_sum", "buckets", "recent", "statuses", "request_bytes",
+                 "response_bytes", "retries")
+
+    def __init__(self):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.recent = deque(maxlen=QUANTILE_WINDOW)
+        self.statuses = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+    def observe(self, seconds, status, request_bytes, response_bytes, retries):
+        self.count += 1
+        self.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.recent.append(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.retries += retries
+
+    def summary(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "p50_ms": _ms(quantile(recent, 0.50)),
+            "p95_ms": _ms(quantile(recent, 0.95)),
+            "p99_ms": _ms(quantile(recent, 0.99)),
+            "mean_ms": _ms(self.latency_sum / self.count if self.count else None),
+            "statuses": dict(self.statuses),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class ApiMetrics:
+    """
+    Thread-safe registry of `EndpointMetrics`, keyed by (method, endpoint template).
+
+    Args:
+        metrics_file (str): Optional path the Prometheus dump is periodically written to.
+        file_interval (float): Minimum seconds between two writes of `metrics_file`.
+    """
+
+    def __init__(self, metrics_file=METRICS_FILE, file_interval=METRICS_FILE_INTERVAL):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.metrics_file = metrics_file
+        self.file_interval = file_interval
+        self._last_write = 0.0
+
+    def observe(self, method, endpoint, seconds, status, request_bytes=0, response_bytes=0, retries=0):
+        """
+        Record one request.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Request path; ids are collapsed by `endpoint_template`.
+            seconds (float): Wall-clock latency, including retries.
+            status (int or str): HTTP status, or an error name if no response arrived.
+            request_bytes (int): Size of the request body.
+            response_bytes (int): Size of the (decoded) response body.
+            retries (int): Transport-level retries made before the final response.
+        """
+        key = (method.upper(), endpoint_template(endpoint))
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = EndpointMetrics()
+            metrics.observe(seconds, str(status), request_bytes, response_bytes, retries)
+        if self.metrics_file and time.monotonic() - self._last_write >= self.file_interval:
+            self.write_prometheus(self.metrics_file)
+
+    def snapshot(self):
+        """Summary per endpoint: {(method, template): {...}}, sorted by template."""
+        with self._lock:
+            return {key: metrics.summary() for key, metrics in sorted(self._endpoints.items(),
+                                                                      key=lambda item: (item[0][1], item[0][0]))}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def prometheus_text(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._endpoints.items(), key=lambda item: (item[0][1], item[0][0]))
+            lines = [
+                "# HELP api_request_duration_seconds Backend API request latency.",
+                "# TYPE api_request_duration_seconds histogram",
+            ]
+            for (method, template), metrics in items:
+                labels = f'method="{method}",endpoint="{template}"'
+                for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                    lines.append(f'api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+                lines.append(f"api_request_duration_seconds_sum{{{labels}}} {metrics.latency_sum:.6f}")
+                lines.append(f"api_request_duration_seconds_count{{{labels}}} {metrics.count}")
+            lines += ["# HELP api_responses_total Backend API responses by status.",
+                      "# TYPE api_responses_total counter"]
+            for (method, template), metrics in items:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'api_responses_total{{method="{method}",endpoint="{template}",'
+                                 f'status="{status}"}} {count}')
+            for name, attribute, help_text in (
+                    ("api_request_bytes_total", "request_bytes", "Request body bytes sent."),
+                    ("api_response_bytes_total", "response_bytes", "Response body bytes received."),
+                    ("api_retries_total", "retries", "Transport-level retries.")):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, template), metrics in items:
+                    lines.append(f'{name}{{method="{method}",endpoint="{template}"}} {getattr(metrics, attribute)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically (write + rename) dump `prometheus_text()` to `path`, e.g. for a textfile collector."""
+        self._last_write = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".api_metrics")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+# Process-wide registry used by the shared API client
+api_metrics = ApiMetrics()
@@ -0,0 +1,359 @@
+"""
+Compact, pre-parsed availability.
+
+Availability arrives as lists of {"start", "end"} ISO 8601 strings. Parsing
+those with ``datetime.fromisoformat`` on every rerun is the bulk of the
+dashboards' render time, so each list is parsed once, in bulk, into NumPy
+int64 epoch-second arrays and memoized alongside the fetched record.
+"""
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+# Saved availability is snapped inward to this many minutes (0 = keep exact times)
+AVAILABILITY_GRID_MINUTES = int(os.getenv("AVAILABILITY_GRID_MINUTES", "0"))
+
+# What NumPy's datetime64 parse reads exactly as datetime.fromisoformat does: a full date,
+# optionally a time, "YYYY-MM-DD[Thh[:mm[:ss[.ffffff]]]]" ("T" or a space). Each position's
+# allowed characters, and the lengths at which a string may end.
+_ISO_TEMPLATE = "0000-00-00T00:00:00.000000"
+_ISO_LENGTHS = (10, 13, 16, 19, 21, 22, 23, 24, 25, 26)
+
+LONG_FORMAT = ("%A, %B %d, %Y at %I:%M %p", "%A, %B %d, %Y at %I:%M %p")
+CARD_FORMAT = ("%A, %B %d, %Y at %I:%M %p", "%I:%M %p")
+
+
+def to_epoch(value):
+    """Convert an ISO 8601 string or datetime to epoch seconds (naive values are taken as UTC)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        return int(value.timestamp())
+    return (value - _EPOCH) // _SECOND
+
+
+def from_epoch(seconds):
+    return _EPOCH + timedelta(seconds=int(seconds))
+
+
+def parse_iso_array(values):
+    """
+    Parse a sequence of ISO 8601 strings into epoch seconds in one pass.
+
+    Returns:
+        tuple: (int64 array of epoch seconds, bool array marking which values parsed)
+    """
+    values = list(values)
+    if not values:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+    bulk_safe = _bulk_safe(values)
+    parsed = _bulk_parse(values) if bulk_safe.all() else None
+    if parsed is None:
+        # NumPy rejects the whole array over one bad value: blank out what Python
+        # can't parse, rewrite the rest in a form NumPy reads the same way, and
+        # give the bulk parse one more try
+        parsed = _bulk_parse([value if safe else _numpy_friendly(value)
+                              for value, safe in zip(values, bulk_safe.tolist())])
+    if parsed is not None:
+        valid = ~np.isnat(parsed)
+        return np.where(valid, parsed.astype(np.int64), 0), valid
+
+    epochs = np.zeros(len(values), dtype=np.int64)
+    valid = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        try:
+            epochs[i] = to_epoch(value)
+            valid[i] = True
+        except (TypeError, ValueError):
+            continue
+    return epochs, valid
+
+
+def _iso_template_tables():
+    # Per position (plus one that always fails): the lowest allowed byte and how many follow it
+    low = np.array([ord(c) for c in _ISO_TEMPLATE] + [0], dtype=np.uint8)
+    span = np.array([10 if c == "0" else 1 for c in _ISO_TEMPLATE] + [0], dtype=np.uint8)
+    ends = np.zeros(len(_ISO_TEMPLATE) + 1, dtype=bool)
+    ends[list(_ISO_LENGTHS)] = True
+    return low, span, ends
+
+
+_ISO_LOW, _ISO_SPAN, _ISO_ENDS = _iso_template_tables()
+
+
+def _bulk_safe(values):
+    """
+    Which strings are full dates/datetimes that the bulk NumPy parse reads like fromisoformat.
+
+    NumPy also accepts partial dates ("2030-01"), "now" and a few other forms
+    fromisoformat rejects; those must go through fromisoformat so a value's
+    validity never depends on the rest of its list. Checked for all values at
+    once against the template, byte by byte.
+    """
+    # One byte wider than the template: longer strings are cut there and fail on it
+    width = len(_ISO_TEMPLATE) + 1
+    try:
+        codes = np.array(values, dtype=f"S{width}").view(np.uint8).reshape(len(values), width)
+    except UnicodeEncodeError:
+        return np.zeros(len(values), dtype=bool)
+    matches = (codes - _ISO_LOW) < _ISO_SPAN  # wraps around below the lowest byte
+    separator = _ISO_TEMPLATE.index("T")
+    matches[:, separator] |= codes[:, separator] == ord(" ")
+    # The first position off the template must be where the string ends, at an allowed length
+    ends = np.argmin(matches, axis=1)
+    return (codes[np.arange(len(values)), ends] == 0) & _ISO_ENDS[ends]
+
+
+def _bulk_parse(values):
+    try:
+        with warnings.catch_warnings():
+            # NumPy only warns on timezone offsets; those are rewritten by _numpy_friendly
+            warnings.simplefilter("error")
+            return np.array(values, dtype="datetime64[s]")
+    except (ValueError, TypeError, UserWarning, DeprecationWarning):
+        return None
+
+
+def _numpy_friendly(value):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return ""  # NaT
+    if parsed.tzinfo is None:
+        return parsed.isoformat()
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class ParsedAvailability:
+    """Availability list parsed into parallel epoch-second arrays (same order as the raw list)."""
+
+    __slots__ = ("raw", "starts", "ends", "valid")
+
+    def __init__(self, raw, starts, ends, valid):
+        self.raw = raw
+        self.starts = starts
+        self.ends = ends
+        self.valid = valid
+
+    @classmethod
+    def parse(cls, available):
+        intervals = [interval if isinstance(interval, dict) else {} for interval in available]
+        starts = [interval.get("start") for interval in intervals]
+        ends = [interval.get("end") for interval in intervals]
+        start_epochs, start_ok = parse_iso_array(_as_iso(starts))
+        end_epochs, end_ok = parse_iso_array(_as_iso(ends))
+        return cls(available, start_epochs, end_epochs, start_ok & end_ok)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def intervals(self):
+        """Valid (start, end) epoch pairs, in their original order."""
+        return list(zip(self.starts[self.valid].tolist(), self.ends[self.valid].tolist()))
+
+    def formatted(self, formats=LONG_FORMAT):
+        """
+        Format every interval for display.
+
+        Returns:
+            list: (start_str, end_str) per raw interval; entries that failed to
+            parse fall back to their raw strings.
+        """
+        start_format, end_format = formats
+        result = []
+        for i, (start, end, ok) in enumerate(zip(self.starts.tolist(), self.ends.tolist(), self.valid.tolist())):
+            if ok:
+                result.append((format_epoch(start, start_format), format_epoch(end, end_format)))
+            else:
+                interval = self.raw[i] if isinstance(self.raw[i], dict) else {}
+                result.append((str(interval.get("start", "N/A")), str(interval.get("end", "N/A"))))
+        return result
+
+
+def _as_iso(values):
+    return [v if isinstance(v, str) else v.isoformat() if isinstance(v, datetime) else "" for v in values]
+
+
+@lru_cache(maxsize=4096)
+def format_epoch(seconds, fmt):
+    """strftime for an epoch value, memoized: directories repeat the same slots over and over."""
+    return from_epoch(seconds).strftime(fmt)
+
+
+# Parsed availability memoized per fetched record (records are kept alive so ids stay unique)
+_MEMO_SIZE = 4096
+_memo = OrderedDict()  # id(record) -> (record, raw list, ParsedAvailability)
+_memo_lock = threading.Lock()
+
+
+def parsed_availability(record, field="available"):
+    """Return the ParsedAvailability for a fetched record, parsing it at most once per payload."""
+    raw = record.get(field) or []
+    key = id(record)
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is not None and entry[0] is record and entry[1] is raw:
+            _memo.move_to_end(key)
+            return entry[2]
+    parsed = ParsedAvailability.parse(raw)
+    with _memo_lock:
+        _memo[key] = (record, raw, parsed)
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return parsed
+
+
+def memo_entries():
+    """Snapshot of the memo's (record, raw list, ParsedAvailability) entries, for memory accounting."""
+    with _memo_lock:
+        return list(_memo.values())
+
+
+def parse_many(records, field="available"):
+    """
+    Parse the availability of many records with a single bulk parse.
+
+    Returns:
+        tuple: (owner index array, start epochs, end epochs) for every valid interval.
+    """
+    lists = [record.get(field) or () for record in records]
+    owners = np.repeat(np.arange(len(lists), dtype=np.int64), [len(intervals) for intervals in lists])
+    intervals = [interval if isinstance(interval, dict) else {} for intervals in lists for interval in intervals]
+    start_epochs, start_ok = parse_iso_array(_as_iso([interval.get("start") for interval in intervals]))
+    end_epochs, end_ok = parse_iso_array(_as_iso([interval.get("end") for interval in intervals]))
+    keep = start_ok & end_ok
+    return owners[keep], start_epochs[keep], end_epochs[keep]
+
+
+def validate_iso_pairs(pairs):
+    """Return a boolean mask of which (start, end) ISO string pairs both parse."""
+    starts_ok = parse_iso_array(p[0] for p in pairs)[1]
+    ends_ok = parse_iso_array(p[1] for p in pairs)[1]
+    return starts_ok & ends_ok
+
+
+class NormalizationReport:
+    """What `normalize_availability` collapsed or dropped, counted in intervals."""
+
+    __slots__ = ("received", "invalid", "empty", "expired", "clipped", "duplicates", "merged", "kept")
+
+    def __init__(self, **counts):
+        for name in self.__slots__:
+            setattr(self, name, counts.get(name, 0))
+
+    @property
+    def changed(self):
+        """True if the normalized list differs in content from the one received."""
+        return self.kept != self.received or bool(self.clipped)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self):
+        """A short human-readable description, e.g. "2 overlapping merged, 1 expired dropped"."""
+        parts = [(self.duplicates, "duplicate", "removed"), (self.merged, "overlapping", "merged"),
+                 (self.expired, "expired", "dropped"), (self.clipped, "partly past", "trimmed"),
+                 (self.invalid + self.empty, "invalid", "dropped")]
+        return ", ".join(f"{count} {what} {done}" for count, what, done in parts if count) or "no changes"
+
+    def __repr__(self):
+        return f"NormalizationReport({self.as_dict()})"
+
+
+def _in_source_offsets(epochs, sources):
+    """
+    ISO strings for epoch values, each in the UTC offset its source value was given in.
+
+    Naive sources (taken as UTC) give naive strings, so offset-aware
+    availability keeps its offsets through normalization instead of being
+    rewritten as naive UTC.
+    """
+    strings = np.datetime_as_string(epochs.astype("datetime64[s]")).tolist()
+    if not sources:
+        return strings
+    # Full naive datetimes match the bulk template (datetimes as str()); only the rest can carry an offset
+    for i in np.flatnonzero(~_bulk_safe(sources)).tolist():
+        source = sources[i]
+        offset = (source if isinstance(source, datetime) else datetime.fromisoformat(source)).tzinfo
+        if offset is not None:
+            strings[i] = datetime.fromtimestamp(int(epochs[i]), offset).isoformat()
+    return strings
+
+
+def normalize_availability(available, now=None, grid_minutes=AVAILABILITY_GRID_MINUTES):
+    """
+    Canonical form of an availability list: sorted, deduplicated, merged and current.
+
+    Unparseable and empty intervals are dropped, then intervals that ended
+    before `now` are dropped and ones in progress start at `now`. With a
+    grid, starts are rounded up and ends down to it (never claiming time that
+    was not offered). Finally exact duplicates are removed and overlapping or
+    touching intervals are merged, in one sort and one sweep over NumPy arrays.
+
+    Args:
+        available (list): {"start", "end"} dicts of ISO strings or datetimes.
+        now: Datetime, ISO string or epoch seconds; None keeps past intervals.
+        grid_minutes (int): Slot grid in minutes, 0 for none.
+
+    Returns:
+        tuple: (list of {"start", "end"} ISO string dicts, NormalizationReport).
+        Each boundary keeps the UTC offset of the value it came from; naive
+        values (UTC) stay naive.
+    """
+    parsed = ParsedAvailability.parse(available)
+    report = NormalizationReport(received=len(parsed), invalid=int((~parsed.valid).sum()))
+    sources = np.flatnonzero(parsed.valid)  # each interval's position in `available`
+    starts, ends = parsed.starts[sources], parsed.ends[sources]
+
+    if now is not None:
+        now = now if isinstance(now, (int, np.integer)) else to_epoch(now)
+        live = ends > now
+        report.expired = int((~live).sum())
+        starts, ends, sources = starts[live], ends[live], sources[live]
+        report.clipped = int((starts < now).sum())
+        starts = np.maximum(starts, now)
+    if grid_minutes:
+        step = grid_minutes * 60
+        starts = -(-starts // step) * step
+        ends = ends // step * step
+
+    keep = ends > starts
+    report.empty = int((~keep).sum())
+    starts, ends, sources = starts[keep], ends[keep], sources[keep]
+
+    order = np.lexsort((ends, starts))
+    starts, ends, sources = starts[order], ends[order], sources[order]
+    unique = np.ones(len(starts), dtype=bool)
+    unique[1:] = (starts[1:] != starts[:-1]) | (ends[1:] != ends[:-1])
+    report.duplicates = int((~unique).sum())
+    starts, ends, sources = starts[unique], ends[unique], sources[unique]
+
+    # An interval opens a new group unless it starts before every earlier one has ended;
+    # a group ends where the interval reaching furthest so far does, at its last member
+    positions = np.arange(len(ends))
+    reach = np.maximum.accumulate(ends) if len(ends) else ends
+    furthest = np.maximum.accumulate(np.where(ends == reach, positions, 0)) if len(ends) else positions
+    opens = np.ones(len(starts), dtype=bool)
+    opens[1:] = starts[1:] > reach[:-1]
+    lasts = np.append(np.flatnonzero(opens)[1:] - 1, len(ends) - 1) if len(ends) else positions
+    starts, start_sources = starts[opens], sources[opens]
+    ends, end_sources = reach[lasts], sources[furthest[lasts]]
+    report.merged = int((~opens).sum())
+    report.kept = len(starts)
+
+    # Valid intervals are dicts with both keys
+    raw = parsed.raw
+    strings = _in_source_offsets(np.concatenate((starts, ends)),
+                                 [raw[i]["start"] for i in start_sources.tolist()]
+                                 + [raw[i]["end"] for i in end_sources.tolist()])
+    normalized = [{"start": start, "end": end} for start, end in zip(strings[:len(starts)], strings[len(starts):])]
+    return normalized, report
@@ -0,0 +1,301 @@
+"""
+In-memory interval index over teacher availability.
+
+Intervals are kept in a treap ordered by start time and augmented with the
+largest end time in each subtree, which lets overlap and containment queries
+skip whole subtrees: O(log n + k) for k results. Teachers can be added,
+replaced or removed one at a time when they save their availability.
+"""
+import gc
+import random
+import threading
+
+import numpy as np
+
+from availability import ParsedAvailability, parse_many, to_epoch
+
+
+class _Node:
+    __slots__ = ("start", "end", "owner", "priority", "left", "right", "max_end")
+
+    def __init__(self, start, end, owner, priority):
+        self.start = start
+        self.end = end
+        self.owner = owner
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    def key(self):
+        return self.start, self.end, self.owner
+
+    def update(self):
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _insert(node, new):
+    if node is None:
+        return new
+    if new.key() < node.key():
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            node = _rotate_right(node)
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            node = _rotate_left(node)
+    node.update()
+    return node
+
+
+def _delete(node, key):
+    if node is None:
+        return None
+    node_key = node.key()
+    if key < node_key:
+        node.left = _delete(node.left, key)
+    elif key > node_key:
+        node.right = _delete(node.right, key)
+    else:
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        if node.left.priority > node.right.priority:
+            node = _rotate_right(node)
+            node.right = _delete(node.right, key)
+        else:
+            node = _rotate_left(node)
+            node.left = _delete(node.left, key)
+    node.update()
+    return node
+
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    node.update()
+    pivot.update()
+    return pivot
+
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    node.update()
+    pivot.update()
+    return pivot
+
+
+class AvailabilityIndex:
+    """
+    Interval index answering "who is available between X and Y".
+
+    Intervals are half-open [start, end) in epoch seconds, each tagged with
+    the id of the teacher who owns it.
+    """
+
+    def __init__(self, seed=None):
+        self._root = None
+        self._by_owner = {}  # owner -> (raw availability key, [(start, end), ...])
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._source = None
+
+    def __len__(self):
+        return sum(len(intervals) for _, intervals in self._by_owner.values())
+
+    @classmethod
+    def from_teachers(cls, teachers, seed=None):
+        """Bulk-build an index from a `/teachers/` payload in O(n log n)."""
+        index = cls(seed=seed)
+        index.sync(teachers)
+        return index
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def replace_teacher(self, owner, available):
+        """Replace one teacher's intervals with their newly saved `available` list."""
+        raw_key = _raw_key(available)
+        with self._lock:
+            existing = self._by_owner.get(owner)
+            if existing is not None and existing[0] == raw_key:
+                return
+            self.remove_teacher(owner)
+            intervals = _parse(available)
+            self._by_owner[owner] = (raw_key, intervals)
+            for start, end in intervals:
+                self._root = _insert(self._root, _Node(start, end, owner, self._random.random()))
+
+    def remove_teacher(self, owner):
+        with self._lock:
+            existing = self._by_owner.pop(owner, None)
+            if existing is None:
+                return
+            for start, end in existing[1]:
+                self._root = _delete(self._root, (start, end, owner))
+
+    def sync(self, teachers):
+        """
+        Bring the index in line with a full `/teachers/` listing.
+
+        Only teachers whose availability changed are re-indexed. An empty index
+        is bulk-built in linear time after sorting. Syncing the same listing
+        object twice is a no-op.
+        """
+        with self._lock:
+            if teachers is self._source:
+                return
+            if not self._by_owner:
+                self._bulk_build(teachers)
+            else:
+                seen = set()
+                for teacher in teachers:
+                    owner = teacher.get("id")
+                    seen.add(owner)
+                    self.replace_teacher(owner, teacher.get("available", []))
+                for owner in [o for o in self._by_owner if o not in seen]:
+                    self.remove_teacher(owner)
+            self._source = teachers
+
+    def _bulk_build(self, teachers):
+        # Millions of short-lived tuples and nodes would otherwise trigger repeated full GC passes
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._bulk_build_nogc(teachers)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _bulk_build_nogc(self, teachers):
+        owner_ids = [teacher.get("id") for teacher in teachers]
+        raw_keys = [_raw_key(teacher.get("available", [])) for teacher in teachers]
+        owner_rows, starts, ends = parse_many(teachers)
+        keep = ends > starts
+        owner_rows, starts, ends = owner_rows[keep], starts[keep], ends[keep]
+
+        # Sort by (start, end, owner id) and drop duplicates, all in NumPy
+        rank_of = {owner: rank for rank, owner in enumerate(sorted(set(owner_ids)))}
+        ranks = np.array([rank_of[owner] for owner in owner_ids], dtype=np.int64)[owner_rows]
+        order = np.lexsort((ranks, ends, starts))
+        owner_rows, starts, ends, ranks = owner_rows[order], starts[order], ends[order], ranks[order]
+        if len(starts) > 1:
+            duplicate = (starts[1:] == starts[:-1]) & (ends[1:] == ends[:-1]) & (ranks[1:] == ranks[:-1])
+            unique = np.concatenate(([True], ~duplicate))
+            owner_rows, starts, ends = owner_rows[unique], starts[unique], ends[unique]
+
+        per_owner = {owner: [] for owner in owner_ids}
+        items = [(start, end, owner_ids[row]) for start, end, row in
+                 zip(starts.tolist(), ends.tolist(), owner_rows.tolist())]
+        for start, end, owner in items:
+            per_owner[owner].append((start, end))
+        for owner, raw_key in zip(owner_ids, raw_keys):
+            self._by_owner[owner] = (raw_key, per_owner[owner])
+
+        # Cartesian-tree construction: keys arrive sorted, priorities are random.
+        stack = []
+        for start, end, owner in items:
+            node = _Node(start, end, owner, self._random.random())
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        self._root = stack[0] if stack else None
+        self._fix_max_end(self._root)
+
+    @staticmethod
+    def _fix_max_end(root):
+        order, stack = [], [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        for node in reversed(order):
+            node.update()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def overlapping(self, start, end):
+        """Return (start, end, owner) for every interval overlapping [start, end)."""
+        start, end = to_epoch(start), to_epoch(end)
+        result = []
+        with self._lock:
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                if node is None or node.max_end <= start:
+                    continue
+                stack.append(node.left)
+                if node.start < end:
+                    if node.end > start:
+                        result.append((node.start, node.end, node.owner))
+                    stack.append(node.right)
+        return result
+
+    def containing(self, start, end):
+        """Return (start, end, owner) for every interval that fully covers [start, end)."""
+        start, end = to_epoch(start), to_epoch(end)
+        result = []
+        with self._lock:
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                if node is None or node.max_end < end:
+                    continue
+                stack.append(node.left)
+                if node.start <= start:
+                    if node.end >= end:
+                        result.append((node.start, node.end, node.owner))
+                    stack.append(node.right)
+        return result
+
+    def teachers_free_between(self, start, end):
+        """Ids of teachers with one availability interval covering the whole window."""
+        return {owner for _, _, owner in self.containing(start, end)}
+
+    def teachers_available_during(self, start, end):
+        """Ids of teachers with any availability overlapping the window."""
+        return {owner for _, _, owner in self.overlapping(start, end)}
+
+
+def _raw_key(available):
+    return tuple((i.get("start"), i.get("end")) for i in available if isinstance(i, dict))
+
+
+def _parse(available):
+    return sorted({(start, end) for start, end in ParsedAvailability.parse(available).intervals() if end > start})
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def shared_index():
+    """Process-wide index shared by every session."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = AvailabilityIndex()
+        return _shared_index
+
+
+def sync_shared_index(snapshot):
+    """Bring the shared index in line with a directory snapshot (runs as a SharedDirectory preparer)."""
+    shared_index().sync(snapshot.teachers)
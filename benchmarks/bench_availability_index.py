@@ -0,0 +1,88 @@
+"""
+Interval index vs. linear scan for "who is free between X and Y".
+
+    python benchmarks/bench_availability_index.py --teachers 50000 --intervals 20
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from availability_index import AvailabilityIndex  # noqa: E402
+
+
+def make_teachers(count, intervals, rng, base):
+    teachers = []
+    for i in range(count):
+        available = []
+        for _ in range(intervals):
+            start = base + timedelta(minutes=15 * rng.randrange(4 * 24 * 90))
+            end = start + timedelta(minutes=15 * rng.randint(2, 16))
+            available.append({"start": start.isoformat(), "end": end.isoformat()})
+        teachers.append({"id": f"t{i:08d}", "available": available})
+    return teachers
+
+
+def linear_free_between(teachers, start, end):
+    """What the dashboard had to do before: parse and scan every interval."""
+    free = set()
+    for teacher in teachers:
+        for interval in teacher["available"]:
+            if (datetime.fromisoformat(interval["start"]) <= start
+                    and datetime.fromisoformat(interval["end"]) >= end):
+                free.add(teacher["id"])
+                break
+    return free
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=50000)
+    parser.add_argument("--intervals", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    base = datetime(2030, 1, 1)
+    teachers = make_teachers(args.teachers, args.intervals, rng, base)
+    queries = []
+    for _ in range(args.queries):
+        start = base + timedelta(minutes=15 * rng.randrange(4 * 24 * 90))
+        queries.append((start, start + timedelta(hours=1)))
+
+    start = time.perf_counter()
+    index = AvailabilityIndex.from_teachers(teachers, seed=1)
+    print(f"build          {len(index):>9} intervals  {time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    hits = sum(len(index.teachers_free_between(qs, qe)) for qs, qe in queries)
+    per_query = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"contain query  {per_query:8.3f} ms/query  (avg {hits / len(queries):.1f} teachers)")
+
+    start = time.perf_counter()
+    hits = sum(len(index.teachers_available_during(qs, qe)) for qs, qe in queries)
+    per_query = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"overlap query  {per_query:8.3f} ms/query  (avg {hits / len(queries):.1f} teachers)")
+
+    saves = [(teachers[rng.randrange(len(teachers))]["id"], make_teachers(1, args.intervals, rng, base)[0]["available"])
+             for _ in range(1000)]
+    start = time.perf_counter()
+    for teacher_id, available in saves:
+        index.replace_teacher(teacher_id, available)
+    per_save = (time.perf_counter() - start) * 1000 / len(saves)
+    print(f"replace        {per_save:8.3f} ms/teacher save")
+
+    sample = queries[:5]
+    start = time.perf_counter()
+    for qs, qe in sample:
+        linear_free_between(teachers, qs, qe)
+    per_query = (time.perf_counter() - start) * 1000 / len(sample)
+    print(f"linear scan    {per_query:8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Paginated teacher directory against a stub backend, in both modes.
+
+Runs the same filtered walk through every directory page against a backend
+that filters and paginates server-side and one that ignores the query
+parameters, checks both return identical pages, and reports backend calls,
+bytes transferred and wall time for each.
+
+    python benchmarks/bench_directory.py --teachers 5000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_backend import StubBackend  # noqa: E402
+
+FILTER_SETS = [
+    {},
+    {"subject": "Math"},
+    {"subject": "Physics", "max_rate": 60},
+    {"min_rating": 4.0},
+    {"available_from": datetime(2030, 1, 8, 9, 0), "available_to": datetime(2030, 1, 8, 10, 0)},
+]
+
+
+def walk(directory, st, filters):
+    st.session_state.clear()
+    pages, page = [], 0
+    while True:
+        teachers, has_next = directory.fetch_teacher_page(filters, page)
+        pages.append([t["id"] for t in teachers])
+        if not has_next:
+            return pages, st.session_state.get("directory_server_side", True)
+        page += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=2000)
+    args = parser.parse_args()
+
+    stub = StubBackend(honor_params=True).seed(teachers=args.teachers, students=0, meetings=0)
+    os.environ["BASE_URL"] = stub.start()
+    # Per-session paths only; the shared snapshot is measured by bench_directory_snapshot.py
+    os.environ["DIRECTORY_SNAPSHOT"] = "0"
+
+    import streamlit as st
+    import teacher_directory
+
+    for filters in FILTER_SETS:
+        results = {}
+        for honor in (True, False):
+            stub.honor_params = honor
+            stub.reset_stats()
+            start = time.perf_counter()
+            pages, server_side = walk(teacher_directory, st, filters)
+            elapsed = (time.perf_counter() - start) * 1000
+            results[honor] = pages
+            mode = "server-side" if server_side else "client-side"
+            print(f"{str(filters):<90} {mode:<12} pages {len(pages):4d}  calls {stub.request_count:4d}  "
+                  f"bytes {stub.bytes_sent:10d}  {elapsed:8.1f} ms")
+        assert results[True] == results[False], f"Modes disagree for {filters}"
+    stub.stop()
+    print("Server-side and client-side modes returned identical pages.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Many sessions opening the teacher directory at once: per-session listings vs. the shared snapshot.
+
+Every simulated session asks for the full listing at the same moment (behind
+a barrier), against a stub backend with injected latency. Per-session mode is
+what each session did before: its own request and its own decoded copy.
+Shared mode goes through one SharedDirectory. Reports backend calls, wall
+time and the memory retained by all sessions together.
+
+    python benchmarks/bench_directory_snapshot.py --sessions 200 --teachers 500 --latency 0.05
+"""
+import argparse
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from directory_snapshot import SharedDirectory  # noqa: E402
+from http_client import ApiClient  # noqa: E402
+from models import Teacher  # noqa: E402
+from stub_backend import StubBackend  # noqa: E402
+
+
+def run(sessions, open_directory):
+    """Open the directory from `sessions` threads at once; return (listings held, wall seconds)."""
+    barrier = threading.Barrier(sessions)
+
+    def session(_):
+        barrier.wait()
+        return open_directory()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        held = list(pool.map(session, range(sessions)))
+    return held, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--teachers", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="injected backend seconds per request")
+    args = parser.parse_args()
+
+    stub = StubBackend(latency=args.latency).seed(args.teachers, 0, 0)
+    client = ApiClient(stub.start(), pool_size=args.sessions)
+
+    def load():
+        response = client.get("/teachers/")
+        response.raise_for_status()
+        return Teacher.decode_many(response.json())
+
+    modes = {
+        "per-session": load,
+        "shared": SharedDirectory(load).get,
+    }
+    print(f"{args.sessions} sessions, {args.teachers} teachers, {args.latency * 1000:.0f} ms backend latency")
+    print(f"{'mode':<12} {'calls':>6} {'wall ms':>9} {'retained MiB':>13}")
+    for name, open_directory in modes.items():
+        stub.reset_stats()
+        gc.collect()
+        tracemalloc.start()
+        held, wall = run(args.sessions, open_directory)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert all(len(listing) == args.teachers for listing in held)
+        print(f"{name:<12} {stub.request_count:>6} {wall * 1000:>9.0f} {retained / 2 ** 20:>13.1f}")
+        del held
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
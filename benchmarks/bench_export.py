@@ -0,0 +1,119 @@
+"""
+Meeting exports: streamed CSV / iCalendar vs. building the file in memory.
+
+Serves `--meetings` synthetic meetings (1M by default) as raw JSON pages
+from a paged `fetch_page(skip, limit)`, decodes them page by page in
+`iter_paged` the way the dashboards' export buttons do, and streams them
+through `meetings_csv` and `meetings_ics` into a temporary file. Reports
+throughput and the process's peak RSS growth, and fails if the streamed
+exports grow RSS by more than `--max-rss-mb`. Last,
+for comparison, builds a `--materialized` meeting export the naive way
+(every record in a list, the whole file in one string); it runs last because
+peak RSS only ever goes up.
+
+    python benchmarks/bench_export.py --meetings 1000000 --max-rss-mb 64
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from meeting_export import iter_paged, meetings_csv, meetings_ics, write_export  # noqa: E402
+from models import Meeting  # noqa: E402
+
+SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "History", "Spanish", "Piano"]
+STATUSES = ["Approved", "Pending", "Rejected", "Canceled"]
+START = datetime(2030, 1, 1, 8)
+
+
+def make_meeting(i, rng):
+    start = START + timedelta(minutes=15 * rng.randrange(4 * 24 * 365))
+    meeting = {
+        "id": f"m{i:022d}",
+        "subject": rng.choice(SUBJECTS),
+        "status": rng.choice(STATUSES),
+        "start_time": start.isoformat(),
+        "finish_time": (start + timedelta(hours=rng.randint(1, 3))).isoformat(),
+        "location": f"Room {rng.randint(1, 40)}, Building {rng.choice('ABC')}",
+        "people": [{"id": f"t{rng.randrange(5000):022d}", "role": "Teacher", "name": f"Teacher {i % 5000}"},
+                   {"id": f"s{rng.randrange(50000):022d}", "role": "Student", "name": f"Student {i % 50000}"}],
+    }
+    if i % 97 == 0:  # legacy time-only meetings
+        meeting["start_time"], meeting["finish_time"] = "10:00", "11:00"
+    elif i % 13 == 0:  # meetings stored with an offset
+        meeting["start_time"] += "+02:00"
+        meeting["finish_time"] += "+02:00"
+    return meeting
+
+
+def synthetic_pages(count, seed=25):
+    """A fetch_page(skip, limit) over `count` raw meetings, generated per page and never held together."""
+    def fetch_page(skip, limit):
+        rng = random.Random(seed * 1_000_003 + skip)
+        return [make_meeting(i, rng) for i in range(skip, min(skip + limit, count))]
+    return fetch_page
+
+
+def paged_meetings(count, page_size):
+    return iter_paged(synthetic_pages(count), page_size, decode=Meeting.decode_many)
+
+
+def peak_rss_mb():
+    """The process's peak resident set size so far (VmHWM)."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def streamed(name, exporter, count, page_size):
+    with tempfile.TemporaryFile(buffering=0) as file:
+        started = time.perf_counter()
+        size = write_export(exporter(paged_meetings(count, page_size)), file)
+        seconds = time.perf_counter() - started
+    print(f"  streamed {name:4} {size / 2**20:8.1f} MB in {seconds:6.1f} s "
+          f"({count / seconds:8.0f} meetings/s), peak RSS {peak_rss_mb():6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=1000000)
+    parser.add_argument("--page-size", type=int, default=500, help="meetings per backend page")
+    parser.add_argument("--max-rss-mb", type=float, default=64, help="allowed peak RSS growth while streaming")
+    parser.add_argument("--materialized", type=int, default=200000,
+                        help="meetings for the in-memory comparison (0 to skip)")
+    args = parser.parse_args()
+
+    # Warm up imports and the allocator before taking the baseline
+    write_export(meetings_ics(paged_meetings(args.page_size, args.page_size)), open(os.devnull, "wb"))
+    baseline = peak_rss_mb()
+    print(f"{args.meetings} meetings, pages of {args.page_size}; baseline peak RSS {baseline:.1f} MB")
+    streamed("csv", meetings_csv, args.meetings, args.page_size)
+    streamed("ics", meetings_ics, args.meetings, args.page_size)
+    growth = peak_rss_mb() - baseline
+    print(f"  peak RSS growth while streaming: {growth:.1f} MB (limit {args.max_rss_mb:.0f} MB)")
+
+    if args.materialized:
+        started = time.perf_counter()
+        fetch_page = synthetic_pages(args.materialized)
+        meetings = [m for skip in range(0, args.materialized, args.page_size)
+                    for m in Meeting.decode_many(fetch_page(skip, args.page_size))]
+        data = "".join(meetings_ics(meetings)).encode()
+        seconds = time.perf_counter() - started
+        print(f"  in memory, {args.materialized} meetings: {len(data) / 2**20:.1f} MB in {seconds:.1f} s, "
+              f"peak RSS {peak_rss_mb():.1f} MB (+{peak_rss_mb() - baseline:.0f} MB)")
+
+    if growth > args.max_rss_mb:
+        sys.exit(f"streamed exports grew peak RSS by {growth:.1f} MB, over the {args.max_rss_mb:.0f} MB limit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-request latency with and without connection pooling.
+
+Compares bare ``requests.get`` (a new TCP connection per call, which is what
+``fetch_data`` used to do) against the shared keep-alive ``ApiClient``.
+
+    python benchmarks/bench_http_pool.py --requests 500
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_client import ApiClient  # noqa: E402
+from stub_backend import StubBackend  # noqa: E402
+
+
+def measure(call, n):
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = call()
+        response.content  # make sure the body is fully read
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(timings):7.3f} ms   "
+          f"p50 {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--teachers", type=int, default=20)
+    args = parser.parse_args()
+
+    with StubBackend().seed(teachers=args.teachers, students=1, meetings=0) as stub:
+        endpoint = "/teachers/"
+        teacher_id = next(iter(stub.data["teachers"]))
+
+        unpooled = measure(lambda: requests.get(f"{stub.base_url}{endpoint}{teacher_id}"), args.requests)
+        client = ApiClient(stub.base_url)
+        pooled = measure(lambda: client.get(f"{endpoint}{teacher_id}"), args.requests)
+        client.close()
+
+        print(f"{args.requests} GET {endpoint}{{id}} requests against {stub.base_url}")
+        report("requests.get (no pool)", unpooled)
+        report("ApiClient (pooled)", pooled)
+
+
+if __name__ == "__main__":
+    main()
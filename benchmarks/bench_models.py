@@ -0,0 +1,75 @@
+"""
+Decode time and memory of a teacher listing: raw dicts vs. typed models.
+
+The dict path is what fetch_data used to cache (``response.json()``); the
+model path also decodes the listing into Teacher records (validated, subjects
+interned). "retained" is what stays alive in the session cache afterwards,
+"peak" includes the intermediate parse.
+
+    python benchmarks/bench_models.py --teachers 10000
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from models import Teacher  # noqa: E402
+from stub_backend import StubBackend  # noqa: E402
+
+
+def decode_dicts(body):
+    return json.loads(body)
+
+
+def decode_models(body):
+    return Teacher.decode_many(json.loads(body))
+
+
+def best_ms(fn, body, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(body)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def memory_kb(fn, body):
+    """(retained, peak) KiB allocated by one decode."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn(body)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained / 1024, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=10000)
+    parser.add_argument("--intervals", type=int, default=5, help="availability slots per teacher")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stub = StubBackend().seed(args.teachers, 0, 0, intervals=args.intervals)
+    body = json.dumps(list(stub.data["teachers"].values())).encode()
+    print(f"{args.teachers} teachers, {len(body) / 1024:.0f} KiB of JSON")
+    print(f"{'path':<8} {'decode ms':>10} {'retained KiB':>13} {'peak KiB':>10}")
+    for name, fn in (("dicts", decode_dicts), ("models", decode_models)):
+        elapsed = best_ms(fn, body, args.repeat)
+        retained, peak = memory_kb(fn, body)
+        print(f"{name:<8} {elapsed:>10.1f} {retained:>13.0f} {peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Availability normalization on large messy lists: vectorized vs. a pure-Python sweep.
+
+Generates `--intervals` intervals with duplicates, overlaps, expired and
+unparseable entries, normalizes them with `normalize_availability` and with
+a straightforward fromisoformat + sorted() + sweep implementation, and
+checks both produce the same list.
+
+    python benchmarks/bench_normalize.py --intervals 10000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from availability import normalize_availability  # noqa: E402
+
+
+def messy_intervals(count, rng, now):
+    available = []
+    span = 8 * count  # quarter hours, about two hours per interval: plenty of overlaps, not one big blob
+    while len(available) < count:
+        start = now + timedelta(minutes=15 * rng.randrange(-span // 4, span))
+        interval = {"start": start.isoformat(), "end": (start + timedelta(minutes=15 * rng.randint(1, 16))).isoformat()}
+        roll = rng.random()
+        if roll < 0.2 and available:
+            interval = dict(rng.choice(available))  # duplicate
+        elif roll < 0.22:
+            interval = {"start": "not a date", "end": interval["end"]}
+        available.append(interval)
+    return available
+
+
+def python_normalize(available, now):
+    pairs = []
+    for interval in available:
+        try:
+            start, end = datetime.fromisoformat(interval["start"]), datetime.fromisoformat(interval["end"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if end > now:
+            pairs.append((max(start, now), end))
+    merged = []
+    for start, end in sorted(set(pairs)):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [{"start": start.isoformat(), "end": end.isoformat()} for start, end in merged]
+
+
+def best_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime(2030, 1, 1, 12, 0)
+    available = messy_intervals(args.intervals, random.Random(5), now)
+
+    vector_ms, (normalized, report) = best_ms(lambda: normalize_availability(available, now=now), args.repeat)
+    python_ms, expected = best_ms(lambda: python_normalize(available, now), args.repeat)
+    assert normalized == expected, "vectorized and pure-Python normalization disagree"
+
+    print(f"{args.intervals} intervals -> {report.kept} ({report.summary()})")
+    print(f"  normalize_availability  {vector_ms:8.1f} ms")
+    print(f"  pure-Python sweep       {python_ms:8.1f} ms")
+    print(f"  payload size            {len(str(available)) / 1024:8.0f} KiB -> {len(str(normalized)) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
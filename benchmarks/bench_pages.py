@@ -0,0 +1,182 @@
+"""
+Headless page benchmarks: run time, backend calls and bytes per page.
+
+Starts the stub backend, drives the real app (website.main, student_view and
+teacher_view) through Streamlit's app-testing harness and measures every page
+twice: cold (fresh session, empty session cache) and warm (an immediate rerun).
+Results are written as JSON named after the current commit, so two commits can
+be compared:
+
+    python benchmarks/bench_pages.py --teachers 500 --repeat 5
+    python benchmarks/bench_pages.py --compare benchmarks/results/<older>.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_backend import StubBackend  # noqa: E402
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+STUDENT_PAGES = ["My Profile", "Available Teachers", "Edit Profile", "My Meetings"]
+TEACHER_PAGES = ["My Profile", "Edit Availability", "Edit Profile", "Manage Meetings"]
+
+
+def new_app():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(str(ROOT / "website.py"), default_timeout=120)
+
+
+def logged_in(profile_type, user_id):
+    at = new_app()
+    at.session_state["user_id"] = user_id
+    at.session_state["user_authenticated"] = True
+    at.session_state["profile_type"] = profile_type
+    at.session_state["navigation"] = "main_app"
+    return at
+
+
+def scenarios():
+    """
+    Yield (page name, fresh-session factory, prepare).
+
+    `prepare(at)` performs the unmeasured steps leading to the page and returns
+    the measured step. Dashboard pages other than the landing page are measured
+    as the sidebar switch from the landing page, as a user would reach them.
+    """
+    def landing(at):
+        return at.run
+
+    def login(at):
+        at.run()
+        at.text_input[0].input("s1@example.com")
+        at.text_input[1].input("password")
+        return at.button[0].click().run
+
+    def select(page):
+        def prepare(at):
+            at.run()
+            return at.sidebar.radio[0].set_value(page).run
+        return prepare
+
+    yield "auth", new_app, landing
+    yield "login -> profile selection", new_app, login
+    for user_type, user_id, pages in (("Student", f"s{1:022d}", STUDENT_PAGES),
+                                      ("Teacher", f"t{1:022d}", TEACHER_PAGES)):
+        def factory(user_type=user_type, user_id=user_id):
+            return logged_in(user_type, user_id)
+        for i, page in enumerate(pages):
+            yield f"{user_type.lower()}: {page}", factory, landing if i == 0 else select(page)
+
+
+def measure(stub, at, step):
+    stub.reset_stats()
+    started = time.perf_counter()
+    step()
+    elapsed = (time.perf_counter() - started) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    # Pages catch their own exceptions and show st.error, so count those as well
+    return {"run_ms": elapsed, "calls": stub.request_count,
+            "bytes_out": stub.bytes_received, "bytes_in": stub.bytes_sent, "errors": len(at.error)}
+
+
+def run_page(stub, factory, prepare, repeat):
+    cold, warm = [], []
+    for _ in range(repeat):
+        at = factory()
+        cold.append(measure(stub, at, prepare(at)))
+        warm.append(measure(stub, at, at.run))
+    return {"cold": summarize(cold), "warm": summarize(warm)}
+
+
+def summarize(samples):
+    return {key: round(statistics.median(sample[key] for sample in samples), 2) for key in samples[0]}
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nvs. {baseline['commit']} (cold run ms / calls / bytes in)")
+    for page, result in current["pages"].items():
+        before = baseline["pages"].get(page)
+        if before is None:
+            continue
+        now, then = result["cold"], before["cold"]
+        change = (now["run_ms"] - then["run_ms"]) / then["run_ms"] if then["run_ms"] else 0
+        print(f"{page:<32} {then['run_ms']:>9.1f} -> {now['run_ms']:>9.1f} ({change:+.0%})"
+              f"  {then['calls']:>4.0f} -> {now['calls']:<4.0f}  {then['bytes_in']:>9.0f} -> {now['bytes_in']:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=200)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--meetings", type=int, default=1000)
+    parser.add_argument("--intervals", type=int, default=5, help="availability slots per profile")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the app's INFO logs")
+    args = parser.parse_args()
+
+    # Configured before the app is imported, so its basicConfig call is a no-op
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+
+    stub = StubBackend().seed(args.teachers, args.students, args.meetings, intervals=args.intervals)
+    os.environ["BASE_URL"] = stub.start()
+
+    import streamlit
+    import streamlit.logger
+    # Streamlit configures its own loggers; its bare-mode context warnings are noise here
+    streamlit.logger.set_log_level("error")
+    results = {
+        "commit": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "data": {"teachers": args.teachers, "students": args.students, "meetings": args.meetings,
+                 "intervals": args.intervals},
+        "repeat": args.repeat,
+        "pages": {},
+    }
+    print(f"{'page':<32} {'cold ms':>9} {'calls':>6} {'bytes in':>9} {'warm ms':>9} {'calls':>6} {'errors':>6}")
+    for page, factory, prepare in scenarios():
+        result = run_page(stub, factory, prepare, args.repeat)
+        results["pages"][page] = result
+        cold, warm = result["cold"], result["warm"]
+        print(f"{page:<32} {cold['run_ms']:>9.1f} {cold['calls']:>6.0f} {cold['bytes_in']:>9.0f}"
+              f" {warm['run_ms']:>9.1f} {warm['calls']:>6.0f} {cold['errors']:>6.0f}")
+    stub.stop()
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nwrote {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Recommendation ranking over a large directory.
+
+Builds `--teachers` synthetic teachers (subjects, rates, ratings, dated
+availability and, for some, a weekly schedule), then times building the
+feature arrays once and scoring and ranking the whole directory for a
+number of different students, against a per-teacher Python loop computing
+the same scores.
+
+    python benchmarks/bench_recommendations.py --teachers 100000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, time as clock, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from models import Student, Teacher  # noqa: E402
+from recommendations import RECOMMENDATION_WEIGHTS, TeacherFeatures  # noqa: E402
+from scheduling import merge_intervals  # noqa: E402
+from weekly_template import WeeklyTemplate  # noqa: E402
+
+SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "Computer Science", "History", "Economics"]
+BASE = datetime(2030, 1, 6, 8, 0)
+
+
+def make_intervals(rng, count):
+    result = []
+    for _ in range(count):
+        start = BASE + timedelta(days=rng.randrange(28), hours=rng.randrange(10))
+        result.append({"start": start.isoformat(), "end": (start + timedelta(hours=rng.randint(1, 3))).isoformat()})
+    return result
+
+
+def make_weekly(rng):
+    template = WeeklyTemplate()
+    for _ in range(rng.randint(1, 4)):
+        start = rng.randrange(8, 18)
+        template.add(rng.randrange(7), clock(start), clock(start + rng.randint(1, 4)))
+    return template.to_json()
+
+
+def make_teachers(count, rng):
+    raw = []
+    for i in range(count):
+        teacher = {"id": f"t{i:022d}", "name": f"Teacher {i}",
+                   "subjects_to_teach": rng.sample(SUBJECTS, rng.randint(1, 3)),
+                   "hourly_rate": rng.randrange(10, 150, 5), "rating": round(rng.uniform(0, 5), 1),
+                   "available": make_intervals(rng, 5)}
+        if rng.random() < 0.3:
+            teacher["weekly_availability"] = make_weekly(rng)
+        raw.append(teacher)
+    return Teacher.decode_many(raw)
+
+
+def python_scores(teachers, student):
+    """The same score, one teacher at a time."""
+    weights = RECOMMENDATION_WEIGHTS
+    wanted = set(student.get("subjects_interested_in_learning") or ())
+    starts, ends = merge_intervals(student.availability.intervals())
+    total = sum(e - s for s, e in zip(starts, ends))
+    student_weekly = student.weekly
+    rates = [t.get("hourly_rate") for t in teachers if t.get("hourly_rate") is not None]
+    low, high = min(rates), max(rates)
+    scores = []
+    for teacher in teachers:
+        subjects = len(wanted & set(teacher.get("subjects_to_teach") or ())) / len(wanted)
+        overlap = sum(max(0, min(e, te) - max(s, ts)) for ts, te in teacher.availability.intervals()
+                      for s, e in zip(starts, ends))
+        availability = overlap / total if total else 0.0
+        weekly = teacher.weekly
+        if student_weekly and weekly:
+            availability = max(availability, (weekly.bits & student_weekly.bits).bit_count()
+                               / student_weekly.bits.bit_count())
+        rate = teacher.get("hourly_rate")
+        scores.append(weights["subjects"] * subjects + weights["availability"] * min(availability, 1.0)
+                      + weights["rate"] * ((high - rate) / ((high - low) or 1.0) if rate is not None else 0.0)
+                      + weights["rating"] * min((teacher.get("rating") or 0) / 5, 1.0))
+    return np.array(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=100000)
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--check", type=int, default=2000, help="teachers compared against the Python loop")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    teachers = make_teachers(args.teachers, rng)
+    students = [Student.decode({"id": f"s{i}", "name": f"Student {i}",
+                                "subjects_interested_in_learning": rng.sample(SUBJECTS, rng.randint(1, 3)),
+                                "available": make_intervals(rng, 8), "weekly_availability": make_weekly(rng)})
+                for i in range(args.students)]
+
+    started = time.perf_counter()
+    features = TeacherFeatures.build(teachers)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    score_ms, rank_ms, top_ms = [], [], []
+    for student in students:
+        started = time.perf_counter()
+        scores = features.score(student)
+        score_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        features.order(scores)
+        rank_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        features.rank(student, limit=20)
+        top_ms.append((time.perf_counter() - started) * 1000)
+
+    sample = teachers[:args.check]
+    started = time.perf_counter()
+    expected = python_scores(sample, students[0])
+    python_ms = (time.perf_counter() - started) * 1000 * len(teachers) / len(sample)
+    assert np.allclose(TeacherFeatures.build(sample).score(students[0]), expected), "vectorized and loop scores differ"
+
+    print(f"{args.teachers} teachers, {args.students} students")
+    print(f"  build features (once per snapshot)  {build_ms:8.1f} ms")
+    print(f"  score all teachers                  {statistics.median(score_ms):8.1f} ms  (median)")
+    print(f"  score + full ranking                {statistics.median(score_ms) + statistics.median(rank_ms):8.1f} ms")
+    print(f"  score + top 20                      {statistics.median(top_ms):8.1f} ms")
+    print(f"  per-teacher Python loop (est.)      {python_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Meeting slot validation: binary-searched timelines vs. a linear scan.
+
+Builds a teacher with `--intervals` availability slots and `--meetings`
+booked meetings, then checks `--requests` random one-hour requests both ways
+(and checks they agree), times suggestions for rejected requests, and
+validates a batch of requests spread over many teachers and students.
+
+    python benchmarks/bench_scheduling.py --intervals 2000 --meetings 2000 --requests 10000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scheduling import Timeline, check_slot, suggest_slots, validate_batch  # noqa: E402
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def random_intervals(rng, count, span, min_hours, max_hours):
+    result = []
+    for _ in range(count):
+        start = rng.randrange(0, span, 15 * 60)
+        result.append((start, start + rng.randint(min_hours, max_hours) * HOUR))
+    return result
+
+
+def covered(start, end, available):
+    """Whether the union of the intervals covers [start, end), by repeated scans."""
+    cursor = start
+    while cursor < end:
+        reach = max((e for s, e in available if s <= cursor < e), default=None)
+        if reach is None:
+            return False
+        cursor = reach
+    return True
+
+
+def linear_ok(start, end, available, busy, student_busy):
+    """The naive check: scan every interval (overlapping availability slots count as one)."""
+    return (covered(start, end, available)
+            and not any(s < end and start < e for s, e in busy)
+            and not any(s < end and start < e for s, e in student_busy))
+
+
+def timed_ms(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=2000, help="teacher availability slots")
+    parser.add_argument("--meetings", type=int, default=2000, help="teacher meetings")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--teachers", type=int, default=200, help="teachers in the batch test")
+    parser.add_argument("--students", type=int, default=2000, help="students in the batch test")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    span = 365 * DAY
+    available = random_intervals(rng, args.intervals, span, 2, 8)
+    busy = random_intervals(rng, args.meetings, span, 1, 1)
+    student_busy = random_intervals(rng, 200, span, 1, 1)
+    requests = [(start, start + HOUR) for start in (rng.randrange(0, span, 15 * 60) for _ in range(args.requests))]
+
+    build_ms, (teacher, student) = timed_ms(lambda: (Timeline(available, busy), Timeline(None, student_busy)))
+    engine_ms, checks = timed_ms(lambda: [check_slot(s, e, teacher, student, suggest=0) for s, e in requests])
+    linear_ms, expected = timed_ms(lambda: [linear_ok(s, e, available, busy, student_busy) for s, e in requests])
+    assert [check.ok for check in checks] == expected, "engine and linear scan disagree"
+    rejected = [(s, e) for (s, e), ok in zip(requests, expected) if not ok]
+    suggest_ms, _ = timed_ms(lambda: [suggest_slots(e - s, teacher, (student,), near=s) for s, e in rejected[:1000]])
+
+    print(f"teacher: {args.intervals} availability slots, {args.meetings} meetings; {args.requests} requests "
+          f"({len(rejected)} rejected)")
+    print(f"  build timelines      {build_ms:9.1f} ms")
+    print(f"  check (engine)       {engine_ms:9.1f} ms  {engine_ms * 1000 / len(requests):7.2f} µs/request")
+    print(f"  check (linear scan)  {linear_ms:9.1f} ms  {linear_ms * 1000 / len(requests):7.2f} µs/request")
+    print(f"  suggest 3 slots      {suggest_ms * 1000 / max(1, min(1000, len(rejected))):9.1f} µs/rejected request")
+
+    timelines = {f"t{i}": Timeline(random_intervals(rng, 50, span, 2, 8), random_intervals(rng, 50, span, 1, 1))
+                 for i in range(args.teachers)}
+    batch = [(f"t{rng.randrange(args.teachers)}", f"s{rng.randrange(args.students)}", start, start + HOUR)
+             for start in (rng.randrange(0, span, 15 * 60) for _ in range(args.requests))]
+    batch_ms, results = timed_ms(lambda: validate_batch(batch, timelines))
+    print(f"batch: {len(batch)} requests over {args.teachers} teachers / {args.students} students: "
+          f"{batch_ms:.1f} ms, {sum(r.ok for r in results)} accepted")
+
+
+if __name__ == "__main__":
+    main()
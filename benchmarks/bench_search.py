@@ -0,0 +1,127 @@
+"""
+Full-text teacher search: inverted index vs. a linear scan.
+
+Builds `--teachers` synthetic teachers (names, subjects and a short about
+section drawn from a word list), indexes them, then times a mix of queries
+(exact words, prefixes, typos, several words) through the index and through
+a scan that lowercases and substring-matches every teacher, as a page
+without an index would. Also times single-teacher updates and the queries
+right after them, and re-syncing an unchanged listing.
+
+    python benchmarks/bench_search.py --teachers 100000
+"""
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from teacher_search import TeacherSearchIndex  # noqa: E402
+
+FIRST = ["Anna", "José", "Maria", "John", "Li", "Ahmed", "Sofia", "Mathis", "Petra", "Chloé", "Omar", "Yuki",
+         "Lars", "Ines", "Kwame", "Priya", "Tomás", "Elena", "Noah", "Zara"]
+LAST = ["Smith", "García", "Müller", "Chen", "Khan", "Rossi", "Novak", "Okafor", "Silva", "Dubois", "Kowalski",
+        "Tanaka", "Nguyen", "Haddad", "Larsen", "Moreau"]
+SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "Computer Science", "History", "Economics"]
+WORDS = ["patient", "tutor", "exam", "calculus", "algebra", "geometry", "statistics", "piano", "guitar", "spanish",
+         "french", "essay", "writing", "coding", "python", "java", "experienced", "friendly", "university", "school",
+         "olympiad", "preparation", "homework", "beginners", "advanced", "online", "years", "teaching", "students",
+         "chemistry", "physics", "mathematics", "literature", "grammar", "conversation", "biology", "medicine",
+         "engineering", "economics", "accounting", "history", "philosophy", "research", "thesis", "robotics"]
+QUERIES = ["math", "calculus", "garcia", "kowalski", "mat", "geom", "phys", "olymp", "physcs", "calculsu",
+           "kowalsky", "algebra exam", "python robotics", "maria garcia", "computer science", "piano beginners",
+           "experienced math tutor", "thesis research", "yuki tanaka", "zzz"]
+
+
+def make_teachers(count, rng, rare_words=None):
+    # Uncommon words (one per 20 teachers) make some searches selective, as real about sections do
+    rare = max(1, rare_words or count // 20)
+    teachers = []
+    for i in range(count):
+        about = [rng.choice(WORDS) for _ in range(rng.randint(5, 25))] + [f"{rng.choice(WORDS)}{rng.randrange(rare)}"]
+        teachers.append({"id": f"t{i:022d}", "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                         "subjects_to_teach": rng.sample(SUBJECTS, rng.randint(1, 3)),
+                         "about_section": " ".join(about)})
+    return teachers
+
+
+def linear_search(teachers, query):
+    words = query.lower().split()
+    result = []
+    for teacher in teachers:
+        text = " ".join((teacher["name"], " ".join(teacher["subjects_to_teach"]), teacher["about_section"])).lower()
+        if all(word in text for word in words):
+            result.append(teacher["id"])
+    return result
+
+
+def timed_ms(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def latencies_ms(fn, queries, repeat):
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            elapsed, _ = timed_ms(lambda: fn(query))
+            samples.append(elapsed)
+    return samples
+
+
+def describe(samples):
+    samples = sorted(samples)
+    return (f"p50 {statistics.median(samples) * 1000:8.1f} µs  p95 {samples[int(len(samples) * 0.95)] * 1000:8.1f} µs  "
+            f"max {samples[-1] * 1000:8.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20, help="results per query")
+    parser.add_argument("--updates", type=int, default=1000, help="single-teacher updates to time")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the query mix")
+    args = parser.parse_args()
+
+    rng = random.Random(24)
+    teachers = make_teachers(args.teachers, rng)
+    index = TeacherSearchIndex()
+    build_ms, _ = timed_ms(lambda: index.sync(teachers))
+    gc.collect()  # the bulk load defers collection; don't bill it to the first query
+    first_ms, _ = timed_ms(lambda: [index.search(query, limit=args.limit) for query in QUERIES])
+    print(f"{args.teachers} teachers, {len(index._postings)} terms; build {build_ms:.0f} ms, "
+          f"first pass over {len(QUERIES)} queries (scores computed) {first_ms:.0f} ms")
+
+    indexed = latencies_ms(lambda q: index.search(q, limit=args.limit), QUERIES, args.repeat)
+    everything = latencies_ms(lambda q: index.search(q, limit=None), QUERIES, 1)
+    scan = latencies_ms(lambda q: linear_search(teachers, q), QUERIES[:5], 1)
+    print(f"  index, top {args.limit:<4}    {describe(indexed)}")
+    print(f"  index, all matches {describe(everything)}")
+    print(f"  linear scan        {describe(scan)}")
+    for query in ("math", "mat", "physcs", "experienced math tutor", "kowalsky"):
+        print(f"    {query!r:26} {len(index.search(query, limit=None)):6} matches  top: "
+              f"{[teacher_id[-5:] for teacher_id, _ in index.search(query, limit=3)]}")
+
+    updated = []
+    for _ in range(args.updates):
+        i = rng.randrange(len(teachers))
+        teacher = dict(make_teachers(1, rng, rare_words=args.teachers // 20)[0], id=teachers[i]["id"])
+        teachers[i] = teacher
+        updated.append(teacher)
+    update_ms, _ = timed_ms(lambda: [index.replace_teacher(teacher) for teacher in updated])
+    first_after_ms, _ = timed_ms(lambda: [index.search(query, limit=args.limit) for query in QUERIES])
+    after = latencies_ms(lambda q: index.search(q, limit=args.limit), QUERIES, args.repeat)
+    print(f"  {args.updates} single-teacher updates: {update_ms * 1000 / args.updates:.0f} µs each; "
+          f"first pass over the queries afterwards (pending updates applied) {first_after_ms:.1f} ms")
+    print(f"  index after updates {describe(after)}")
+    resync_ms, _ = timed_ms(lambda: index.sync(list(teachers)))
+    print(f"  sync of an unchanged listing copy: {resync_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Render time and payload of the teacher directory: legacy vs. virtualized window.
+
+The legacy path is what student_view used to do: one st.markdown blob and one
+hidden st.button per teacher, with availability concatenated for every card.
+The virtualized path renders the visible window as one batched HTML element.
+
+    python benchmarks/bench_teacher_cards.py --sizes 100 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from teacher_cards import cards_html  # noqa: E402
+
+PER_CARD_ELEMENTS_LEGACY = 2  # markdown + hidden button
+DIRECTORY_PAGE_SIZE = int(os.getenv("DIRECTORY_PAGE_SIZE", "20"))
+
+
+def make_teachers(count, rng):
+    base = datetime(2030, 1, 6, 8)
+    teachers = []
+    for i in range(count):
+        available = []
+        for _ in range(10):
+            start = base + timedelta(days=rng.randrange(28), hours=rng.randrange(10))
+            available.append({"start": start.isoformat(), "end": (start + timedelta(hours=2)).isoformat()})
+        teachers.append({"id": f"t{i:08d}", "name": f"Teacher {i}", "email": f"t{i}@example.com",
+                         "phone": "555-0000", "hourly_rate": 40, "rating": 4.5,
+                         "subjects_to_teach": ["Math", "Physics"], "available": available})
+    return teachers
+
+
+def legacy_card(teacher):
+    availability_str = ""
+    for interval in teacher.get("available", []):
+        try:
+            start = datetime.fromisoformat(interval["start"]).strftime("%A, %B %d, %Y at %I:%M %p")
+            end = datetime.fromisoformat(interval["end"]).strftime("%I:%M %p")
+            availability_str += f"📅 {start} → {end}<br>"
+        except Exception:
+            availability_str += f"{interval.get('start', '')} → {interval.get('end', '')}<br>"
+    return f"""
+        <div style='background-color:#2c2f33; padding:15px; border-radius:10px; margin-bottom:20px; color:#f0f0f0'>
+            <h4>👤 <strong>{teacher['name']}</strong></h4>
+            <p>📧 <strong>Email:</strong> {teacher['email']}<br>
+               ⏱️ <strong>Availability:</strong><br>{availability_str}</p>
+        </div>"""
+
+
+def bench(label, fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--window", type=int, default=DIRECTORY_PAGE_SIZE)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'teachers':>9} {'mode':<12} {'render ms':>10} {'payload KB':>11} {'elements':>9}")
+    for size in args.sizes:
+        teachers = make_teachers(size, rng)
+
+        elapsed, blobs = bench("legacy", lambda: [legacy_card(t) for t in teachers])
+        payload = sum(len(b.encode()) for b in blobs) / 1024
+        print(f"{size:>9} {'legacy':<12} {elapsed:>10.2f} {payload:>11.1f} {size * PER_CARD_ELEMENTS_LEGACY:>9}")
+
+        window = teachers[:args.window]
+        expanded = {window[0]["id"]}
+        elapsed, blob = bench("window", lambda: cards_html(window, expanded))
+        payload = len(blob.encode()) / 1024
+        print(f"{size:>9} {'virtualized':<12} {elapsed:>10.2f} {payload:>11.1f} {1:>9}")
+
+
+if __name__ == "__main__":
+    main()
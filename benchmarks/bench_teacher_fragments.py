@@ -0,0 +1,82 @@
+"""
+Per-interaction cost of the teacher dashboard sections: full script rerun vs. fragment rerun.
+
+Before the sections were fragments, every Add/Remove click in Edit Availability
+(and every widget change in the other sections) re-executed the whole script:
+header, sidebar and the section. Now only the section's fragment re-executes.
+This drives the real app headlessly against the stub backend and reports, per
+interaction, the `script_run` probe (what a click used to cost; Remove paid it
+twice because of the follow-up `st.rerun()`) next to the fragment probe (what
+a click costs now).
+
+    python benchmarks/bench_teacher_fragments.py --intervals 50 --clicks 10
+"""
+import argparse
+import os
+import statistics
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_backend import StubBackend  # noqa: E402
+
+
+def teacher_session(at, user_id):
+    at.session_state["user_id"] = user_id
+    at.session_state["user_authenticated"] = True
+    at.session_state["profile_type"] = "Teacher"
+    at.session_state["navigation"] = "main_app"
+    return at
+
+
+def timings(at):
+    return dict(at.session_state["timings"]) if "timings" in at.session_state else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=50, help="saved availability slots for the teacher")
+    parser.add_argument("--clicks", type=int, default=10, help="interactions measured per section")
+    args = parser.parse_args()
+
+    stub = StubBackend().seed(teachers=5, students=5, meetings=40, intervals=args.intervals)
+    os.environ["BASE_URL"] = stub.start()
+    from streamlit.testing.v1 import AppTest
+
+    at = teacher_session(AppTest.from_file(str(ROOT / "website.py"), default_timeout=60), f"t{0:022d}").run()
+    at.sidebar.radio[0].set_value("Edit Availability").run()
+
+    rows = {"add interval": ([], []), "remove interval": ([], []), "meeting filter": ([], [])}
+    for _ in range(args.clicks):
+        next(b for b in at.button if b.label.startswith("➕")).click().run()
+        t = timings(at)
+        rows["add interval"][0].append(t["script_run"])
+        rows["add interval"][1].append(t["fragment.availability_editor"])
+
+        at.button(key="remove_0").click().run()
+        t = timings(at)
+        rows["remove interval"][0].append(2 * t["script_run"])  # click + st.rerun() of the whole script
+        rows["remove interval"][1].append(t["fragment.availability_editor"])
+
+    at.sidebar.radio[0].set_value("Manage Meetings").run()
+    for i in range(args.clicks):
+        at.selectbox(key="meeting_status_filter").set_value(["Pending", "All"][i % 2]).run()
+        t = timings(at)
+        rows["meeting filter"][0].append(t["script_run"])
+        rows["meeting filter"][1].append(t["fragment.meeting_list"])
+
+    if at.exception:
+        raise SystemExit(f"app raised: {at.exception}")
+
+    print(f"{'interaction':<18} {'full rerun ms':>14} {'fragment ms':>12} {'saved':>7}")
+    for name, (full, fragment) in rows.items():
+        full_ms, fragment_ms = statistics.median(full), statistics.median(fragment)
+        print(f"{name:<18} {full_ms:>14.2f} {fragment_ms:>12.2f} {1 - fragment_ms / full_ms:>6.0%}")
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
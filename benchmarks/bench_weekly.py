@@ -0,0 +1,87 @@
+"""
+Weekly bitmap templates vs. expanded interval lists.
+
+Builds `--teachers` random weekly schedules and one student schedule, then
+compares: finding the teachers whose week overlaps the student's (one AND
+per teacher vs. a sweep over a week of expanded intervals), the stored size
+of a template vs. the `available` list it replaces for `--weeks` weeks, and
+the cost of expanding one viewed week lazily.
+
+    python benchmarks/bench_weekly.py --teachers 10000 --weeks 52
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, time as clock, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weekly_template import WeeklyTemplate  # noqa: E402
+
+MONDAY = date(2030, 1, 7)
+
+
+def random_template(rng):
+    template = WeeklyTemplate()
+    for _ in range(rng.randint(1, 6)):
+        start = rng.randrange(6, 20)
+        end = min(start + rng.randint(1, 4), 23)
+        template.add(rng.randrange(7), clock(start, rng.choice((0, 15, 30, 45))), clock(end))
+    return template
+
+
+def intervals_overlap(a, b):
+    """Sweep two sorted (start, end) lists for any overlap."""
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i][0] < b[j][1] and b[j][0] < a[i][1]:
+            return True
+        if a[i][1] <= b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return False
+
+
+def timed_ms(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=10000)
+    parser.add_argument("--weeks", type=int, default=52, help="weeks an expanded `available` list would cover")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    teachers = [random_template(rng) for _ in range(args.teachers)]
+    student = random_template(rng)
+    week = (MONDAY, MONDAY + timedelta(days=7))
+    teacher_weeks = [list(t.expand(*week)) for t in teachers]
+    student_week = list(student.expand(*week))
+
+    bits_ms, by_bits = timed_ms(lambda: [t for t in teachers if t.bits & student.bits])
+    sweep_ms, by_sweep = timed_ms(
+        lambda: [t for t, w in zip(teachers, teacher_weeks) if intervals_overlap(w, student_week)])
+    assert len(by_bits) == len(by_sweep), "bitmap and interval overlap disagree"
+
+    sample = teachers[:200]
+    template_bytes = sum(len(json.dumps(t.to_json())) for t in sample) / len(sample)
+    horizon = (MONDAY, MONDAY + timedelta(weeks=args.weeks))
+    list_bytes = sum(len(json.dumps(t.to_available(*horizon))) for t in sample) / len(sample)
+    expand_ms, _ = timed_ms(lambda: [list(t.expand(*week)) for t in sample])
+
+    print(f"{args.teachers} teachers, {len(by_bits)} overlap the student's week")
+    print(f"  overlap (bitmap AND)       {bits_ms:8.2f} ms  {bits_ms * 1e6 / args.teachers:7.0f} ns/teacher")
+    print(f"  overlap (interval sweep)   {sweep_ms:8.2f} ms  {sweep_ms * 1e6 / args.teachers:7.0f} ns/teacher")
+    print(f"  stored size                {template_bytes:8.0f} B template vs {list_bytes:.0f} B for {args.weeks} weeks")
+    print(f"  expand one viewed week     {expand_ms * 1000 / len(sample):8.1f} µs/teacher")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Multi-session load generator for the Streamlit front end.
+
+Simulates concurrent students and tutors going through the real flows against
+the stub backend (with optional injected latency):
+
+    student: open app -> login -> profile selection -> dashboard -> request a meeting
+    teacher: open app -> login -> profile selection -> dashboard -> approve a meeting
+
+Each worker process plays one Streamlit app process: it imports the app once
+and runs its share of the sessions concurrently, on threads, through
+Streamlit's AppTest harness. Reports throughput, per-step and per-flow latency
+percentiles and the peak RSS of the app processes.
+
+    python benchmarks/load_test.py --sessions 200 --processes 4 --latency 0.02 --jitter 0.03
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import time as clock_time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_backend import StubBackend  # noqa: E402
+
+STEPS = {
+    "student": ["open app", "login", "profile selection", "dashboard", "request meeting"],
+    "teacher": ["open app", "login", "profile selection", "dashboard", "approve meeting"],
+}
+
+
+# Custom component registry shared by the sessions of a worker process (see _share_server_state)
+_component_manager = None
+
+
+class FlowFailed(Exception):
+    pass
+
+
+def _button(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise FlowFailed(f"no {label!r} button")
+
+
+def _check(at, step):
+    if at.exception:
+        raise FlowFailed(f"{step}: {at.exception[0].value}")
+    if at.error:
+        raise FlowFailed(f"{step}: {at.error[0].value}")
+
+
+def run_flow(role, index):
+    """Run one session's flow; return (per-step ms, error or None)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "website.py"), default_timeout=120)
+    at._bidi_component_manager = _component_manager
+    email = f"{role[0]}{index}@example.com"
+    timings = {}
+
+    def step(name, action):
+        started = time.perf_counter()
+        action()
+        timings[name] = (time.perf_counter() - started) * 1000
+        _check(at, name)
+
+    def open_app():
+        at.run()
+
+    def login():
+        at.text_input[0].input(email)
+        at.text_input[1].input("password")
+        at.button[0].click().run()
+
+    def profile_selection():
+        # The radio is preselected from the profiles found at login
+        _button(at, "Continue").click().run()
+        at.run()
+
+    def student_dashboard():
+        at.sidebar.radio[0].set_value("Available Teachers").run()
+
+    def request_meeting():
+        # Requests go to the teacher preselected on the first directory page
+        at.button(key="request_meeting_open").click().run()
+        inputs = {t.label: t for t in at.text_input}
+        inputs["Meeting Subject"].input("Math")
+        inputs["Meeting Location"].input("Online")
+        times = {t.label: t for t in at.time_input}
+        times["Start Time"].set_value(clock_time(10, 0))
+        times["Finish Time"].set_value(clock_time(11, 0))
+        _button(at, "Request Meeting").click().run()
+        if not at.success:
+            # The slot was rejected (e.g. outside the teacher's availability): take the nearest suggestion
+            suggestion = next((b for b in at.button if b.label.startswith("Use ")), None)
+            if suggestion is None:
+                raise FlowFailed("meeting rejected without suggestions")
+            suggestion.click().run()
+            _button(at, "Request Meeting").click().run()
+        if not at.success:
+            raise FlowFailed("meeting request not confirmed")
+
+    def teacher_dashboard():
+        at.sidebar.radio[0].set_value("Manage Meetings").run()
+
+    def approve_meeting():
+        approve = next((b for b in at.button if b.label.startswith("Approve Meeting")), None)
+        if approve is None:
+            raise FlowFailed("no meeting to approve")
+        approve.click().run()
+        if not at.success:
+            raise FlowFailed("approval not confirmed")
+
+    actions = {
+        "student": [open_app, login, profile_selection, student_dashboard, request_meeting],
+        "teacher": [open_app, login, profile_selection, teacher_dashboard, approve_meeting],
+    }[role]
+    try:
+        for name, action in zip(STEPS[role], actions):
+            step(name, action)
+    except Exception as e:
+        return role, timings, f"{type(e).__name__}: {e}"
+    return role, timings, None
+
+
+def _share_server_state():
+    """
+    Let AppTest sessions run concurrently in one process, sharing what a server process shares.
+
+    AppTest installs a mock Runtime singleton for the duration of each run and
+    clears it afterwards, which breaks any other session running at that
+    moment; keep serving the last installed mock instead. Each run likewise
+    patches and restores the global config, so set its test options once for
+    the whole process. It also compiles the script afresh per session, and
+    concurrent compiles are not thread-safe on every Python version; share one
+    compiled script, as the server's ScriptCache does, and one component
+    registry instead of rediscovering components per session.
+    """
+    global _component_manager
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, util
+
+    config.get_option = util.build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+    last = []
+    real_instance = Runtime.instance.__func__
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+            return cls._instance
+        return last[0] if last else real_instance(cls)
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+
+    compiled, compile_lock = {}, threading.Lock()
+    real_get_bytecode = ScriptCache.get_bytecode
+
+    def get_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in compiled:
+                compiled[script_path] = real_get_bytecode(self, script_path)
+            return compiled[script_path]
+
+    ScriptCache.get_bytecode = get_bytecode
+
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    _component_manager = BidiComponentManager()
+    _component_manager.discover_and_register_components(start_file_watching=False)
+
+
+def run_worker(base_url, sessions, concurrency):
+    """Worker process: run `sessions` [(role, index)] with `concurrency` threads; return results and peak RSS."""
+    os.environ["BASE_URL"] = base_url
+    logging.basicConfig(level=logging.ERROR)
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    import website  # noqa: F401  (warm the module cache once per process, like a server would)
+    _share_server_state()
+
+    results = []
+    lock = threading.Lock()
+
+    def one(session):
+        started = time.perf_counter()
+        role, timings, error = run_flow(*session)
+        with lock:
+            results.append({"role": role, "steps": timings, "flow_ms": (time.perf_counter() - started) * 1000,
+                            "error": error})
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, sessions))
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # kilobytes on Linux
+    return results, peak_rss_kb
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def pick(q):
+        return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(values[-1], 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100, help="total simulated user sessions")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2, help="app processes")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="concurrent sessions per process (default: all of its sessions at once)")
+    parser.add_argument("--teacher-share", type=float, default=0.5, help="fraction of sessions that are tutors")
+    parser.add_argument("--teachers", type=int, default=200)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--meetings", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0, help="injected backend seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random backend seconds")
+    parser.add_argument("--output", help="write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    stub = StubBackend(latency=args.latency, jitter=args.jitter).seed(args.teachers, args.students, args.meetings)
+    base_url = stub.start()
+
+    # Tutors approve one of their seeded meetings, so only pick tutors that have some
+    booked = sorted({int(person["id"][1:]) for meeting in stub.data["meetings"].values()
+                     for person in meeting["people"] if person["role"] == "Teacher"})
+    teacher_sessions = round(args.sessions * args.teacher_share)
+    sessions = [("teacher", booked[i % len(booked)]) for i in range(teacher_sessions)]
+    sessions += [("student", i % args.students) for i in range(args.sessions - teacher_sessions)]
+    shards = [sessions[i::args.processes] for i in range(args.processes)]
+    shards = [shard for shard in shards if shard]
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [pool.submit(run_worker, base_url, shard, args.concurrency or len(shard))
+                   for shard in shards]
+        outcomes = [future.result() for future in futures]
+    wall = time.perf_counter() - started
+    backend_calls = stub.request_count
+    stub.stop()
+
+    results = [result for worker_results, _ in outcomes for result in worker_results]
+    rss_mb = [rss / 1024 for _, rss in outcomes]
+    ok = [r for r in results if r["error"] is None]
+    summary = {
+        "sessions": len(results),
+        "completed": len(ok),
+        "failed": len(results) - len(ok),
+        "processes": len(shards),
+        "wall_s": round(wall, 2),
+        "throughput_flows_per_s": round(len(ok) / wall, 2),
+        "backend_calls": backend_calls,
+        "injected_latency_s": [args.latency, args.jitter],
+        "peak_rss_mb": {"max": round(max(rss_mb), 1), "mean": round(statistics.mean(rss_mb), 1)},
+        "flows": {},
+        "errors": sorted({r["error"] for r in results if r["error"]})[:10],
+    }
+    for role, steps in STEPS.items():
+        role_ok = [r for r in ok if r["role"] == role]
+        summary["flows"][role] = {
+            "completed": len(role_ok),
+            "flow_ms": percentiles([r["flow_ms"] for r in role_ok]),
+            "steps_ms": {step: percentiles([r["steps"][step] for r in role_ok]) for step in steps},
+        }
+
+    print(f"{summary['completed']}/{summary['sessions']} flows in {summary['wall_s']} s "
+          f"on {summary['processes']} processes: {summary['throughput_flows_per_s']} flows/s, "
+          f"{backend_calls} backend calls, peak RSS {summary['peak_rss_mb']['max']} MB/process")
+    for role, flow in summary["flows"].items():
+        print(f"\n{role} ({flow['completed']} completed)  flow ms {flow['flow_ms']}")
+        for step, stats in flow["steps_ms"].items():
+            print(f"  {step:<20} {stats}")
+    for error in summary["errors"]:
+        print(f"error: {error}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+In-process stand-in for the tutoring backend API, used by the benchmarks.
+
+Serves the same routes the Streamlit front end calls, from in-memory data,
+over HTTP/1.1 keep-alive with optional gzip so that client-side connection
+pooling behaves the way it does against the real server.
+"""
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+COLLECTIONS = ("users", "students", "teachers", "meetings")
+
+
+class StubBackend:
+    """Threaded HTTP server holding users, students, teachers and meetings in memory."""
+
+    def __init__(self, host="127.0.0.1", port=0, honor_params=True, allow_patch=True, latency=0.0, jitter=0.0):
+        self.data = {name: {} for name in COLLECTIONS}
+        # Injected per-request server time in seconds: latency + uniform(0, jitter)
+        self.latency = latency
+        self.jitter = jitter
+        self.allow_patch = allow_patch
+        self.honor_params = honor_params  # False mimics a backend that ignores query parameters
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.server = _Server((host, port), _make_handler(self))
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def record(self, size, received=0):
+        with self.lock:
+            self.request_count += 1
+            self.bytes_sent += size
+            self.bytes_received += received
+
+    def reset_stats(self):
+        with self.lock:
+            self.request_count = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    def handle(self, method, path, query, body):
+        """Return (status, payload) for a request."""
+        parts = [p for p in path.split("/") if p]
+        if not parts or parts[0] not in COLLECTIONS:
+            return 404, {"detail": "Not Found"}
+        name, rest = parts[0], parts[1:]
+        items = self.data[name]
+
+        if name == "users" and rest == ["login"] and method == "POST":
+            for user in self.values(name):
+                if user.get("email") == body.get("email") and user.get("password") == body.get("password"):
+                    return 200, {"user_id": user["id"], "name": user.get("name"), "token": "stub-token"}
+            return 401, {"detail": "Invalid email or password"}
+        if name == "users" and len(rest) == 2 and rest[0] == "id":
+            rest = rest[1:]
+        if name == "meetings" and len(rest) == 2 and rest[0] == "user" and method == "GET":
+            user_id = rest[1]
+            return 200, [m for m in self.values(name)
+                         if any(p.get("id") == user_id for p in m.get("people", []))]
+
+        if not rest:
+            if method == "GET":
+                return 200, self.list_collection(name, query)
+            if method == "POST":
+                record = dict(body or {})
+                record.setdefault("id", uuid.uuid4().hex[:24])
+                with self.lock:
+                    items[record["id"]] = record
+                if name == "users":
+                    return 201, {"user_id": record["id"], "name": record.get("name")}
+                return 201, record
+            return 405, {"detail": "Method Not Allowed"}
+
+        if method == "PATCH" and not self.allow_patch:
+            return 405, {"detail": "Method Not Allowed"}
+        record = items.get(rest[0])
+        if record is None:
+            return 404, {"detail": f"{name[:-1].capitalize()} not found"}
+        if method == "GET":
+            return 200, record
+        if method in ("PUT", "PATCH"):
+            with self.lock:
+                record.update(body or {})
+            return 200, record
+        if method == "DELETE":
+            with self.lock:
+                items.pop(rest[0], None)
+            return 200, {"deleted": rest[0]}
+        return 405, {"detail": "Method Not Allowed"}
+
+    def values(self, name):
+        """Snapshot of a collection's records, safe against concurrent inserts."""
+        with self.lock:
+            return list(self.data[name].values())
+
+    def list_collection(self, name, query):
+        records = self.values(name)
+        if not self.honor_params or not query:
+            return records
+        if name == "teachers":
+            records = [t for t in records if _teacher_matches(t, query)]
+        skip = int(query.get("skip", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+        return records[skip:skip + limit] if limit is not None else records[skip:]
+
+    # ------------------------------------------------------------------
+    # Synthetic data
+    # ------------------------------------------------------------------
+    def seed(self, teachers=100, students=100, meetings=200, intervals=5, seed=0):
+        """Fill the store with deterministic synthetic records."""
+        rng = random.Random(seed)
+        subjects = ["Math", "Physics", "Chemistry", "Biology", "English", "Computer Science",
+                    "History", "Economics"]
+        base = datetime(2030, 1, 6, 8, 0)
+
+        def make_intervals():
+            result = []
+            for _ in range(intervals):
+                start = base + timedelta(days=rng.randrange(28), hours=rng.randrange(10))
+                result.append({"start": start.isoformat(),
+                               "end": (start + timedelta(hours=rng.randint(1, 3))).isoformat()})
+            return result
+
+        def make_person(prefix, i):
+            user_id = f"{prefix}{i:022d}"
+            self.data["users"][user_id] = {
+                "id": user_id, "name": f"{prefix.upper()} User {i}", "username": f"{prefix}{i}",
+                "email": f"{prefix}{i}@example.com", "password": "password", "roles": [],
+            }
+            return user_id, {
+                "id": user_id, "name": f"{prefix.upper()} User {i}", "email": f"{prefix}{i}@example.com",
+                "phone": f"555-{i:04d}", "about_section": f"About {prefix} {i}",
+                "available": make_intervals(), "rating": round(rng.uniform(0, 5), 1), "meetings": [],
+            }
+
+        teacher_ids, student_ids = [], []
+        for i in range(teachers):
+            user_id, record = make_person("t", i)
+            record["subjects_to_teach"] = rng.sample(subjects, rng.randint(1, 3))
+            record["hourly_rate"] = rng.randrange(10, 150, 5)
+            self.data["teachers"][user_id] = record
+            teacher_ids.append(user_id)
+        for i in range(students):
+            user_id, record = make_person("s", i)
+            record["subjects_interested_in_learning"] = rng.sample(subjects, rng.randint(1, 3))
+            self.data["students"][user_id] = record
+            student_ids.append(user_id)
+        for i in range(meetings if teacher_ids and student_ids else 0):
+            teacher_id, student_id = rng.choice(teacher_ids), rng.choice(student_ids)
+            start = base + timedelta(days=rng.randrange(28), hours=rng.randrange(10))
+            meeting_id = f"m{i:023d}"
+            self.data["meetings"][meeting_id] = {
+                "id": meeting_id, "location": "Online", "subject": rng.choice(subjects),
+                "start_time": start.isoformat(), "finish_time": (start + timedelta(hours=1)).isoformat(),
+                "status": "Pending", "attached_files": [],
+                "people": [{"id": teacher_id, "role": "Teacher", "name": self.data["teachers"][teacher_id]["name"]},
+                           {"id": student_id, "role": "Student", "name": self.data["students"][student_id]["name"]}],
+            }
+        return self
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 drops connections under load tests
+
+
+def _teacher_matches(teacher, query):
+    if "subject" in query and query["subject"] not in teacher.get("subjects_to_teach", []):
+        return False
+    if "max_rate" in query and teacher.get("hourly_rate", 0) > query["max_rate"]:
+        return False
+    if "min_rating" in query and teacher.get("rating", 0) < query["min_rating"]:
+        return False
+    if "available_from" in query and "available_to" in query:
+        window_start = datetime.fromisoformat(query["available_from"])
+        window_end = datetime.fromisoformat(query["available_to"])
+        return any(datetime.fromisoformat(i["start"]) <= window_start and datetime.fromisoformat(i["end"]) >= window_end
+                   for i in teacher.get("available", []))
+    return True
+
+
+_QUERY_VALUE = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+def _parse_query(raw):
+    query = {}
+    for key, values in parse_qs(raw).items():
+        value = values[-1]
+        query[key] = float(value) if _QUERY_VALUE.match(value) else value
+    return query
+
+
+def _make_handler(backend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True  # headers and body are separate writes
+
+        def log_message(self, *args):
+            pass
+
+        def _dispatch(self, method):
+            path, _, raw_query = self.path.partition("?")
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length) if length else b""
+            body = json.loads(raw_body) if raw_body else None
+            if backend.latency or backend.jitter:
+                time.sleep(backend.latency + random.uniform(0, backend.jitter))
+            status, payload = backend.handle(method, path, _parse_query(raw_query), body)
+            encoded = json.dumps(payload).encode()
+            gzipped = "gzip" in self.headers.get("Accept-Encoding", "") and len(encoded) > 1024
+            if gzipped:
+                encoded = gzip.compress(encoded, compresslevel=1)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(encoded)
+            backend.record(len(encoded), len(raw_body))
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_PATCH(self):
+            self._dispatch("PATCH")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+    return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the stub backend API.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--teachers", type=int, default=100)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="injected seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random seconds per request")
+    args = parser.parse_args()
+
+    stub = StubBackend(port=args.port, latency=args.latency, jitter=args.jitter).seed(args.teachers, args.students, args.meetings)
+    print(f"Stub backend listening on {stub.start()}  (set BASE_URL to this)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,81 @@
+from collections.abc import Mapping
+from concurrent.futures import wait
+from server_requests import *
+from availability import parsed_availability
+
+# Overall deadline (seconds) for the post-login fan-out
+BOOTSTRAP_DEADLINE = float(os.getenv("BOOTSTRAP_DEADLINE", "5"))
+
+
+def bootstrap_endpoints(user_id):
+    """Everything the dashboard needs right after login, keyed by name."""
+    return {
+        "user": f"/users/id/{user_id}",
+        "student_profile": f"/students/{user_id}",
+        "teacher_profile": f"/teachers/{user_id}",
+        "meetings": f"/meetings/user/{user_id}",
+    }
+
+
+def start_bootstrap(user_id):
+    """
+    Start fetching the user record, both profiles and the user's meetings in the background.
+
+    Every response is stored in the session cache, and profile availability is
+    parsed as soon as it arrives, so the profile page and the dashboard are
+    served without further round-trips. The futures are kept in session state
+    for `wait_for_bootstrap`.
+
+    Args:
+        user_id (str): The logged-in user's ID.
+
+    Returns:
+        dict: Future per name in `bootstrap_endpoints`.
+    """
+    futures = {name: prefetch(endpoint) for name, endpoint in bootstrap_endpoints(user_id).items()}
+    for name in ("student_profile", "teacher_profile"):
+        futures[name].add_done_callback(_parse_profile_availability)
+    st.session_state.bootstrap_futures = futures
+    return futures
+
+
+def _parse_profile_availability(future):
+    profile = future.result()
+    if isinstance(profile, Mapping):
+        parsed_availability(profile)
+
+
+def wait_for_bootstrap(names=None, deadline=BOOTSTRAP_DEADLINE):
+    """
+    Wait (at most `deadline` seconds overall) for bootstrap fetches started by `start_bootstrap`.
+
+    Fetches still running when the deadline passes are reported as None and
+    keep warming the cache in the background.
+
+    Args:
+        names (list): Which results to wait for; all of them by default.
+        deadline (float): Seconds to wait for all fetches combined.
+
+    Returns:
+        dict: Parsed response per name, or None if missing/failed/late.
+    """
+    futures = st.session_state.get("bootstrap_futures", {})
+    if names is not None:
+        futures = {name: futures[name] for name in names if name in futures}
+    done, pending = wait(futures.values(), timeout=deadline)
+    if pending:
+        late = [name for name, future in futures.items() if future in pending]
+        logger.warning("Bootstrap deadline of %ss exceeded for: %s", deadline, ', '.join(late))
+    return {name: future.result() if future in done else None for name, future in futures.items()}
+
+
+def bootstrap_pending(names=None):
+    """True while any (or any of the named) bootstrap fetches is still in flight."""
+    futures = st.session_state.get("bootstrap_futures", {})
+    return any(not future.done() for name, future in futures.items() if names is None or name in names)
+
+
+def bootstrap_session(user_id, deadline=BOOTSTRAP_DEADLINE):
+    """Start the bootstrap fan-out and block until it completes or the deadline passes."""
+    start_bootstrap(user_id)
+    return wait_for_bootstrap(deadline=deadline)
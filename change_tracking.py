@@ -0,0 +1,47 @@
+import copy
+
+# Document fields that carry an optimistic-concurrency version, in order of preference
+VERSION_FIELDS = ("version", "_version", "etag")
+
+
+class TrackedDocument:
+    """
+    Snapshot of a fetched document, used to send only the fields a user changed.
+
+    Args:
+        endpoint (str): The resource endpoint, e.g. "/teachers/42".
+        document (dict or models.Model): The document as originally fetched.
+    """
+
+    def __init__(self, endpoint, document):
+        self.endpoint = endpoint
+        self.original = copy.deepcopy(dict(document))
+
+    @property
+    def version(self):
+        for field in VERSION_FIELDS:
+            if self.original.get(field) is not None:
+                return str(self.original[field])
+        return None
+
+    def diff(self, **fields):
+        """Return the subset of `fields` whose values differ from the original document."""
+        return {key: value for key, value in fields.items() if self.original.get(key) != value}
+
+    def merged(self, changes):
+        """The full document with `changes` applied (for backends that only accept PUT)."""
+        document = copy.deepcopy(self.original)
+        document.update(changes)
+        return document
+
+    def rebase(self, document):
+        """Take a freshly fetched copy of the document as the original that `merged` builds on."""
+        self.original = copy.deepcopy(dict(document))
+
+    def commit(self, changes, saved=None):
+        """Record a successful save so the next diff is taken against the new state."""
+        self.original.update(copy.deepcopy(changes))
+        if isinstance(saved, dict):
+            for field in VERSION_FIELDS:
+                if field in saved:
+                    self.original[field] = saved[field]
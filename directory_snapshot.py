@@ -0,0 +1,202 @@
+"""
+Process-wide teacher directory shared by every session.
+
+One immutable snapshot of the full `/teachers/` listing is held per process.
+Sessions keep only a reference to it plus their own filters. Refreshes are
+copy-on-write: a new snapshot is loaded on a background thread and swapped
+in atomically, so readers never see a half-built listing. Concurrent loads
+are coalesced (single flight): however many sessions ask at once, the
+backend sees one request.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# Filter results remembered per snapshot
+MATCH_MEMO_SIZE = 64
+
+
+class DirectorySnapshot:
+    """
+    An immutable teacher listing.
+
+    Attributes:
+        teachers (tuple): The teachers, in listing order.
+        by_id (Mapping): Teacher id -> teacher.
+        version (int): Increases with every load.
+        loaded_at (float): Monotonic time the listing was loaded.
+    """
+
+    __slots__ = ("teachers", "by_id", "version", "loaded_at", "_matches", "_derived", "_lock")
+
+    def __init__(self, teachers, version, loaded_at):
+        self.teachers = tuple(teachers)
+        self.by_id = MappingProxyType({teacher.get("id"): teacher for teacher in self.teachers})
+        self.version = version
+        self.loaded_at = loaded_at
+        self._matches = OrderedDict()
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.teachers)
+
+    def matching(self, key, compute):
+        """
+        Memoized derived result, e.g. the teachers matching one set of filters.
+
+        The snapshot never changes, so results stay valid for its lifetime and
+        are shared by every session asking with the same `key`.
+
+        Args:
+            key: Hashable description of the result.
+            compute (callable): compute(teachers) -> result, called on a miss.
+        """
+        with self._lock:
+            if key in self._matches:
+                self._matches.move_to_end(key)
+                return self._matches[key]
+        result = compute(self.teachers)
+        with self._lock:
+            self._matches[key] = result
+            while len(self._matches) > MATCH_MEMO_SIZE:
+                self._matches.popitem(last=False)
+        return result
+
+    def derived(self, key, compute):
+        """
+        Like `matching`, but the result is kept for the snapshot's whole lifetime.
+
+        For structures built over the full listing that are costly to rebuild
+        (e.g. the recommendation features), which the `matching` memo would
+        evict once enough distinct filters and queries have been asked.
+        """
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        result = compute(self.teachers)
+        with self._lock:
+            return self._derived.setdefault(key, result)
+
+
+class SharedDirectory:
+    """
+    Holder of the current `DirectorySnapshot`, with single-flight background refreshes.
+
+    A snapshot older than `refresh_interval` seconds is still served while a
+    newer one loads in the background; `invalidate` (called after teacher
+    writes) marks it stale and starts a reload at once.
+
+    Args:
+        loader (callable): Returns the full teacher listing; runs on the refresh thread.
+        refresh_interval (float): Maximum snapshot age in seconds before a background reload.
+        prepare: Callables taking a new snapshot, run on the refresh thread
+            before it is published (e.g. to build derived data into its memo).
+    """
+
+    def __init__(self, loader, refresh_interval=60.0, clock=time.monotonic, prepare=()):
+        self._loader = loader
+        self._prepare = tuple(prepare)
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._inflight = None
+        self._generation = 0  # bumped by invalidate()
+        self._loaded_generation = -1
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="directory")
+        self.loads = 0
+        self.coalesced = 0
+
+    def get(self, timeout=None):
+        """
+        The current snapshot, starting a background refresh if it is stale.
+
+        Only blocks when no snapshot was loaded yet; callers arriving during
+        that first load wait on the same request.
+
+        Returns:
+            DirectorySnapshot or None: None if the first load failed or timed out.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            future = self._refresh_locked() if self._needs_refresh() else self._inflight
+        if snapshot is not None or future is None:
+            return snapshot
+        try:
+            return future.result(timeout)
+        except Exception:
+            return None
+
+    def current(self):
+        """The snapshot if it reflects every write made through this process, else None; never loads."""
+        with self._lock:
+            if self._snapshot is not None and self._loaded_generation == self._generation:
+                return self._snapshot
+            return None
+
+    def invalidate(self):
+        """Mark the snapshot stale after a teacher write and reload it in the background."""
+        with self._lock:
+            self._generation += 1
+            return self._refresh_locked()
+
+    def refresh(self):
+        """Start (or join) a background reload. Returns its Future."""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _needs_refresh(self):
+        snapshot = self._snapshot
+        return (snapshot is None or self._loaded_generation != self._generation
+                or self._clock() - snapshot.loaded_at >= self.refresh_interval)
+
+    def _refresh_locked(self):
+        if self._inflight is not None:
+            self.coalesced += 1
+            return self._inflight
+        self._inflight = self._executor.submit(self._load, self._generation)
+        return self._inflight
+
+    def _load(self, generation):
+        try:
+            started = self._clock()
+            teachers = self._loader()
+            # Only this thread bumps `loads`, so the version can be taken before publishing
+            snapshot = DirectorySnapshot(teachers, self.loads + 1, started)
+            for prepare in self._prepare:
+                try:
+                    prepare(snapshot)
+                except Exception:
+                    logger.exception("Preparing teacher directory snapshot v%s failed", snapshot.version)
+            with self._lock:
+                self._snapshot = snapshot
+                # A write that happened while loading may not be in this listing; keep it stale then
+                self._loaded_generation = generation
+                self.loads += 1
+            logger.info("Loaded teacher directory snapshot v%s (%s teachers) in %.0f ms", snapshot.version,
+                        len(snapshot), (self._clock() - started) * 1000)
+            return snapshot
+        except Exception as e:
+            logger.warning("Teacher directory refresh failed: %s", e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight = None
+
+    def stats(self):
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                "version": snapshot.version if snapshot else None,
+                "teachers": len(snapshot) if snapshot else 0,
+                "age_s": round(self._clock() - snapshot.loaded_at, 1) if snapshot else None,
+                "stale": self._loaded_generation != self._generation,
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool and timeout defaults (overridable from the .env file)
+DEFAULT_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+# Transport-level retries of idempotent requests on connection errors and 502/503/504
+DEFAULT_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "0"))
+
+# (connect, read) timeouts per endpoint, matched on the longest path prefix.
+ENDPOINT_TIMEOUTS = {
+    "/users/login": (DEFAULT_CONNECT_TIMEOUT, 10),
+    "/teachers": (DEFAULT_CONNECT_TIMEOUT, 30),  # full listings can be large
+    "/students": (DEFAULT_CONNECT_TIMEOUT, 30),
+    "/meetings": (DEFAULT_CONNECT_TIMEOUT, 20),
+}
+
+
+class ApiClient:
+    """
+    Pooled, keep-alive HTTP client for the backend API.
+
+    All threads share a single connection pool (the mounted HTTPAdapter is
+    thread-safe), while each thread gets its own lightweight Session so that
+    cookie and header state is never mutated concurrently. Every request is
+    reported to `metrics` (an `api_metrics.ApiMetrics`), if given.
+    """
+
+    def __init__(self, base_url, pool_size=DEFAULT_POOL_SIZE, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, endpoint_timeouts=None, max_retries=DEFAULT_MAX_RETRIES,
+                 metrics=None):
+        self.base_url = base_url.rstrip("/")
+        self.default_timeout = (connect_timeout, read_timeout)
+        timeouts = ENDPOINT_TIMEOUTS if endpoint_timeouts is None else endpoint_timeouts
+        # Longest prefix first so "/users/login" wins over "/users"
+        self.endpoint_timeouts = sorted(timeouts.items(), key=lambda item: len(item[0]), reverse=True)
+        retry = Retry(total=max_retries, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                      raise_on_status=False)
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.metrics = metrics
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            session.headers.update({
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            })
+            self._local.session = session
+        return session
+
+    def timeout_for(self, endpoint):
+        """Return the (connect, read) timeout tuple for an endpoint path."""
+        for prefix, timeout in self.endpoint_timeouts:
+            if endpoint.startswith(prefix):
+                return timeout
+        return self.default_timeout
+
+    def request(self, method, endpoint, **kwargs):
+        kwargs.setdefault("timeout", self.timeout_for(endpoint))
+        if self.metrics is None:
+            return self._session().request(method, f"{self.base_url}{endpoint}", **kwargs)
+        started = time.perf_counter()
+        try:
+            response = self._session().request(method, f"{self.base_url}{endpoint}", **kwargs)
+        except requests.RequestException as e:
+            self.metrics.observe(method, endpoint, time.perf_counter() - started, type(e).__name__)
+            raise
+        body = response.request.body or b""
+        retries = getattr(response.raw, "retries", None)
+        self.metrics.observe(method, endpoint, time.perf_counter() - started, response.status_code,
+                             request_bytes=len(body), response_bytes=len(response.content),
+                             retries=len(retries.history) if retries is not None else 0)
+        return response
+
+    def get(self, endpoint, **kwargs):
+        return self.request("GET", endpoint, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.adapter.close()
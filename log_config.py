@@ -0,0 +1,223 @@
+"""
+Application logging: queue-backed, structured and redacting.
+
+Log calls on the script thread only filter, redact and enqueue the record; a
+background listener thread formats it (JSON by default) and does the I/O.
+Messages use lazy %-style arguments, and structured data goes in
+``extra={"fields": {...}}``. Secrets are always removed, and personal data is
+masked, in both the fields and the message arguments.
+"""
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener
+
+# Defaults for configure_logging, read when it is called so that the .env file applies:
+# LOG_LEVEL (INFO), LOG_FORMAT ("json" or "text") and LOG_SAMPLE_RATE, the fraction
+# of high-volume records (logged with extra=HIGH_VOLUME) that are kept (0.1).
+
+# Field names whose values are never logged
+SECRET_KEYS = frozenset({"password", "token", "access_token", "refresh_token", "authorization", "secret",
+                         "api_key"})
+# Field names whose values are personal data and are masked
+PII_KEYS = frozenset({"email", "phone", "name", "username", "about_section", "user_name", "user_email"})
+REDACTED = "[REDACTED]"
+
+_EMAIL = re.compile(r"([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})")
+_BEARER = re.compile(r"(Bearer\s+)\S+", re.IGNORECASE)
+
+# Pass as `extra=` to mark a record as high-volume, i.e. subject to sampling
+HIGH_VOLUME = {"sample": True}
+
+
+def mask(value):
+    """Mask personal data, keeping just enough to correlate log lines."""
+    if value is None:
+        return None
+    text = str(value)
+    if "@" in text:
+        return _EMAIL.sub(r"\1***@\2", text)
+    return f"{text[:1]}***" if text else text
+
+
+def redact(value, key=None):
+    """Return a copy of `value` with secret fields removed and personal data masked."""
+    if key is not None:
+        lowered = key.lower()
+        if lowered in SECRET_KEYS:
+            return REDACTED
+        if lowered in PII_KEYS and not isinstance(value, (Mapping, list, tuple)):
+            return mask(value)
+    if isinstance(value, Mapping):
+        return {k: redact(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    if isinstance(value, str):
+        return scrub(value)
+    return value
+
+
+def scrub(text):
+    """Mask e-mail addresses and bearer tokens in free text."""
+    if "@" in text:
+        text = _EMAIL.sub(r"\1***@\2", text)
+    if "Bearer" in text or "bearer" in text:
+        text = _BEARER.sub(r"\1" + REDACTED, text)
+    return text
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every 1/`rate` high-volume records per message template.
+
+    Only records logged with ``extra=HIGH_VOLUME`` below WARNING are sampled;
+    counting (rather than random draws) keeps the output evenly spread.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, "sample", False) or record.levelno >= logging.WARNING or self.every == 1:
+            return True
+        if self.every == 0:
+            return False
+        with self._lock:
+            counter = self._counters.get(record.msg)
+            if counter is None:
+                counter = self._counters[record.msg] = itertools.count()
+            keep = next(counter) % self.every == 0
+        if keep:
+            record.sampled = self.every
+        return keep
+
+
+class RedactingQueueHandler(QueueHandler):
+    """
+    Queue handler that redacts records instead of formatting them.
+
+    The stock QueueHandler formats every record on the calling thread; here the
+    message stays lazy (it is formatted by the listener thread) and only the
+    arguments and structured fields are replaced by redacted copies, which
+    also makes them safe from later mutation by the caller.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        if record.args:
+            if isinstance(record.args, dict):
+                record.args = redact(record.args)
+            else:
+                record.args = tuple(redact(arg) for arg in record.args)
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = redact(fields)
+        if record.exc_info:
+            # Tracebacks can't cross threads lazily; render them here
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, structured fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": scrub(record.getMessage()),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if getattr(record, "sampled", None):
+            entry["sampled_1_in"] = record.sampled
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The previous plain-text layout, with structured fields appended as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(levelname)s - %(message)s")
+
+    def format(self, record):
+        line = scrub(super().format(record))
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+_listener = None
+
+
+def configure_logging(level=None, fmt=None, sample_rate=None, stream=None, force=False):
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Like ``logging.basicConfig``, this does nothing if the root logger already
+    has handlers (e.g. configured by a host process) unless `force` is set.
+
+    Args:
+        level (str or int): Root log level (default: LOG_LEVEL).
+        fmt (str): "json" for one JSON object per line, "text" for the plain layout (default: LOG_FORMAT).
+        sample_rate (float): Fraction of high-volume records kept (default: LOG_SAMPLE_RATE).
+        stream: Where the listener writes (stderr by default).
+        force (bool): Replace existing root handlers.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return
+    level = level or os.getenv("LOG_LEVEL", "INFO").upper()
+    fmt = fmt or os.getenv("LOG_FORMAT", "json")
+    sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "0.1")) if sample_rate is None else sample_rate
+    if _listener is None:
+        atexit.register(_stop_listener)  # flush queued records on exit
+    else:
+        _stop_listener()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    records = queue.SimpleQueue()
+    handler = RedactingQueueHandler(records)
+    handler.addFilter(SamplingFilter(sample_rate))
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def fields(high_volume=False, **values):
+    """
+    Build the `extra` argument for a structured record.
+
+    Example:
+        logger.info("Fetched %s", endpoint, extra=fields(status=200, high_volume=True))
+    """
+    extra = {"fields": values}
+    if high_volume:
+        extra.update(HIGH_VOLUME)
+    return extra
@@ -19,11 +19,11 @@ def login(email, password):
         #st.write("Login response:", result)  # 🔍 Debug output
 
         if result and "user_id" in result:
-            logger.info(f"Login successful for user {email}")
+            logger.info("Login successful for user %s", result["user_id"])
             st.session_state.user_id = result["user_id"]
             return result
         elif result and "detail" in result:
-            logger.error(f"Login failed: {result['detail']}")
+            logger.error("Login failed: %s", result['detail'])
             st.error(result["detail"])
             return None
         else:
@@ -31,7 +31,7 @@ def login(email, password):
             st.error("Login failed. Please try again.")
             return None
     except Exception as e:
-        logger.exception(f"Login failed due to an unexpected error: {e}")
+        logger.exception("Login failed due to an unexpected error: %s", e)
         st.error("An unexpected error occurred. Please try again later.")
         return None
 
@@ -0,0 +1,201 @@
+"""
+Streaming meeting exports to CSV and iCalendar (.ics).
+
+Everything here is a generator: `iter_paged` pulls meetings from the API a
+page at a time, and `meetings_csv` / `meetings_ics` turn any iterable of
+meetings into the file's text, one row or event at a time. Chained
+together, an export of any size holds a single page of meetings and a
+single write buffer in memory:
+
+    meetings = iter_paged(fetch_page, decode=Meeting.decode_many)  # fetch_page(skip, limit) -> JSON list
+    write_export(meetings_ics(meetings), file)
+
+Nothing here talks to Streamlit or the API directly; the dashboards supply
+`fetch_page` and the file (see `meeting_export_buttons` in server_requests.py).
+"""
+import csv
+import io
+import logging
+import os
+from datetime import datetime, timezone
+
+from meeting_store import participant_names
+
+logger = logging.getLogger(__name__)
+
+# Meetings requested per page while exporting
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+# Bytes of export text gathered before each write
+EXPORT_WRITE_BYTES = 256 * 1024
+
+CSV_COLUMNS = ("id", "subject", "status", "start_time", "finish_time", "location", "teacher", "student")
+# iCalendar STATUS for each meeting status; others are left out
+ICS_STATUSES = {
+    "Approved": "CONFIRMED",
+    "Pending": "TENTATIVE",
+    "Canceled": "CANCELLED",
+    "Cancelled": "CANCELLED",
+    "Rejected": "CANCELLED",
+}
+ICS_PRODID = "-//Private Tutor Website//Meetings//EN"
+# Right-hand side of every event UID
+ICS_UID_DOMAIN = os.getenv("ICS_UID_DOMAIN", "privatetutor")
+
+# Spreadsheet apps run cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def iter_paged(fetch_page, page_size=EXPORT_PAGE_SIZE, decode=None):
+    """
+    Yield records from a paged endpoint, one page in memory at a time.
+
+    Args:
+        fetch_page (callable): fetch_page(skip, limit) -> list of raw records (parsed JSON).
+        page_size (int): Records per request.
+        decode (callable): decode(page) -> records, e.g. `Meeting.decode_many`. It
+            runs after paging, since dropping invalid records must not make a
+            full page look like the last one.
+
+    A short page ends the export. A backend that ignores the paging
+    parameters returns everything at once (more rows than asked for), or the
+    same first page again; either way each record is yielded once.
+    """
+    skip, first_id = 0, None
+    while True:
+        page = fetch_page(skip, page_size)
+        if not page:
+            return
+        if skip and page[0].get("id") == first_id:
+            logger.warning("Backend ignored the export's paging parameters; stopping after one page.")
+            return
+        yield from decode(page) if decode else page
+        if len(page) != page_size:
+            return
+        first_id = page[0].get("id")
+        skip += page_size
+
+
+def _cell(value):
+    """A CSV cell; text that a spreadsheet would evaluate as a formula is quoted with a leading apostrophe."""
+    if value is None:
+        return ""
+    value = str(value)
+    return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def meetings_csv(meetings):
+    """
+    Yield a CSV export line by line: the CSV_COLUMNS header, then one row per meeting.
+
+    Teacher and student columns list participants' names by role, separated by "; ".
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(row):
+        writer.writerow(row)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield line(CSV_COLUMNS)
+    for meeting in meetings:
+        yield line([_cell(meeting.get("id")), _cell(meeting.get("subject")), _cell(meeting.get("status")),
+                    _cell(meeting.get("start_time")), _cell(meeting.get("finish_time")),
+                    _cell(meeting.get("location")), _cell(participant_names(meeting, "Teacher")),
+                    _cell(participant_names(meeting, "Student"))])
+
+
+def _ics_text(value):
+    """Escape a TEXT value (RFC 5545 section 3.3.11)."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n"))
+
+
+def _ics_time(value):
+    """DATE-TIME value: aware datetimes in UTC, naive ones as floating local time like the rest of the app."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _parse(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fold(line):
+    """Fold a content line to 75 octets per line, without splitting UTF-8 characters."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:  # continuation byte
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def meetings_ics(meetings, calendar_name="Tutoring meetings", now=None):
+    """
+    Yield an iCalendar export: the calendar header, one VEVENT per meeting, then the footer.
+
+    Meetings without a full start and finish datetime (legacy time-only
+    values) can't be placed on a calendar and are skipped.
+
+    Args:
+        meetings: Iterable of meeting records.
+        calendar_name (str): Shown by calendar apps as the calendar's name.
+        now (datetime): DTSTAMP of every event; defaults to the current time.
+    """
+    stamp = _ics_time((now or datetime.now(timezone.utc)).astimezone(timezone.utc))
+    yield ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + _fold(f"PRODID:{ICS_PRODID}") + "CALSCALE:GREGORIAN\r\n"
+           "METHOD:PUBLISH\r\n" + _fold(f"X-WR-CALNAME:{_ics_text(calendar_name)}"))
+    skipped = 0
+    for meeting in meetings:
+        start, finish = _parse(meeting.get("start_time")), _parse(meeting.get("finish_time"))
+        if start is None or finish is None:
+            skipped += 1
+            continue
+        lines = ["BEGIN:VEVENT", f"UID:{_ics_text(str(meeting.get('id')))}@{ICS_UID_DOMAIN}", f"DTSTAMP:{stamp}",
+                 f"DTSTART:{_ics_time(start)}", f"DTEND:{_ics_time(finish)}",
+                 f"SUMMARY:{_ics_text(meeting.get('subject') or 'Tutoring session')}"]
+        if meeting.get("location"):
+            lines.append(f"LOCATION:{_ics_text(meeting['location'])}")
+        status = ICS_STATUSES.get(meeting.get("status"))
+        if status:
+            lines.append(f"STATUS:{status}")
+        people = [f"{person.get('name') or person.get('id')} ({person.get('role')})"
+                  for person in meeting.get("people") or () if isinstance(person, dict)]
+        if people:
+            lines.append(f"DESCRIPTION:{_ics_text('With: ' + ', '.join(people))}")
+        lines.append("END:VEVENT")
+        yield "".join(_fold(line) for line in lines)
+    if skipped:
+        logger.info("Calendar export skipped %s meetings without a full start and finish time", skipped)
+    yield "END:VCALENDAR\r\n"
+
+
+def write_export(chunks, file, buffer_bytes=EXPORT_WRITE_BYTES):
+    """
+    Write streamed export text to a binary file as UTF-8, in writes of about `buffer_bytes`.
+
+    Returns:
+        int: Bytes written.
+    """
+    pending, size, total = [], 0, 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= buffer_bytes:
+            total += file.write("".join(pending).encode())
+            pending, size = [], 0
+    if pending:
+        total += file.write("".join(pending).encode())
+    return total
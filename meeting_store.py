@@ -0,0 +1,126 @@
+"""
+Local meeting store indexed by participant, status and start time.
+
+Loaded once per session and then kept current by the writes the app itself
+makes, so the meeting views never have to scan the full collection.
+"""
+import bisect
+import threading
+from collections import defaultdict
+
+from availability import to_epoch
+
+
+def participant_ids(meeting):
+    """Ids of everyone in a meeting's `people` list (entries are {"id", "role", "name"} dicts)."""
+    ids = set()
+    for person in meeting.get("people", []):
+        if isinstance(person, dict):
+            if person.get("id") is not None:
+                ids.add(person["id"])
+        elif person is not None:
+            ids.add(person)
+    return ids
+
+
+def participant_names(meeting, role):
+    """Names of a meeting's participants with `role` ("Teacher" or "Student"), separated by "; "."""
+    return "; ".join(person.get("name") or str(person.get("id", ""))
+                     for person in meeting.get("people") or ()
+                     if isinstance(person, dict) and person.get("role") == role)
+
+
+def start_key(meeting):
+    """Sort key for a meeting's start: full datetimes by epoch, anything else after them by raw value."""
+    raw = meeting.get("start_time") or meeting.get("scheduled_time") or ""
+    try:
+        return 0, to_epoch(raw), ""
+    except (TypeError, ValueError):
+        return 1, 0, str(raw)
+
+
+class MeetingStore:
+    """In-memory `Meeting` records with per-participant start-ordered lists and a status index."""
+
+    def __init__(self, meetings=()):
+        self._by_id = {}
+        self._by_participant = defaultdict(list)  # person id -> sorted [(start key, meeting id)]
+        self._by_status = defaultdict(set)  # status -> meeting ids
+        self._lock = threading.RLock()
+        for meeting in meetings:
+            self.upsert(meeting)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, meeting_id):
+        return meeting_id in self._by_id
+
+    def get(self, meeting_id):
+        return self._by_id.get(meeting_id)
+
+    def upsert(self, meeting):
+        """Add a meeting, or replace the stored copy with the same id."""
+        meeting_id = meeting.get("id")
+        if meeting_id is None:
+            return
+        with self._lock:
+            self.remove(meeting_id)
+            self._by_id[meeting_id] = meeting
+            entry = (start_key(meeting), meeting_id)
+            for person_id in participant_ids(meeting):
+                bisect.insort(self._by_participant[person_id], entry)
+            self._by_status[meeting.get("status", "Pending")].add(meeting_id)
+
+    def remove(self, meeting_id):
+        with self._lock:
+            meeting = self._by_id.pop(meeting_id, None)
+            if meeting is None:
+                return None
+            entry = (start_key(meeting), meeting_id)
+            for person_id in participant_ids(meeting):
+                entries = self._by_participant[person_id]
+                position = bisect.bisect_left(entries, entry)
+                if position < len(entries) and entries[position] == entry:
+                    entries.pop(position)
+            self._by_status[meeting.get("status", "Pending")].discard(meeting_id)
+            return meeting
+
+    def update_status(self, meeting_id, status):
+        """Record a status change made through the app (Approve/Cancel)."""
+        with self._lock:
+            meeting = self._by_id.get(meeting_id)
+            if meeting is None:
+                return
+            self._by_status[meeting.get("status", "Pending")].discard(meeting_id)
+            self._by_id[meeting_id] = meeting.replace(status=status)
+            self._by_status[status].add(meeting_id)
+
+    def for_participant(self, person_id, status=None, start=None, end=None):
+        """
+        Meetings a person takes part in, ordered by start time.
+
+        Args:
+            person_id (str): Participant id.
+            status (str): Only meetings with this status.
+            start, end: Only meetings starting in [start, end) (ISO strings or datetimes).
+
+        Returns:
+            list: Meeting records.
+        """
+        with self._lock:
+            entries = self._by_participant.get(person_id, [])
+            low, high = 0, len(entries)
+            if start is not None:
+                low = bisect.bisect_left(entries, ((0, to_epoch(start), ""),))
+            if end is not None:
+                high = bisect.bisect_left(entries, ((0, to_epoch(end), ""),))
+            ids = [meeting_id for _, meeting_id in entries[low:high]]
+            if status is not None:
+                wanted = self._by_status.get(status, set())
+                ids = [meeting_id for meeting_id in ids if meeting_id in wanted]
+            return [self._by_id[meeting_id] for meeting_id in ids]
+
+    def with_status(self, status):
+        with self._lock:
+            return [self._by_id[meeting_id] for meeting_id in self._by_status.get(status, ())]
@@ -0,0 +1,57 @@
+import os
+
+import streamlit as st
+
+from api_metrics import api_metrics
+from session_memory import memory_report
+
+# The admin panel is opt-in: set SHOW_API_METRICS=1 in the .env file (it is only shown to users with ADMIN_ROLE)
+SHOW_API_METRICS = os.getenv("SHOW_API_METRICS", "0").lower() in ("1", "true", "yes")
+
+
+def metrics_rows():
+    """One flat row per (method, endpoint template), for display."""
+    rows = []
+    for (method, template), summary in api_metrics.snapshot().items():
+        statuses = summary.pop("statuses")
+        rows.append({"method": method, "endpoint": template, **summary,
+                     "statuses": ", ".join(f"{status}×{count}" for status, count in sorted(statuses.items()))})
+    return rows
+
+
+def memory_rows(report):
+    """One row per session, largest first."""
+    rows = []
+    for session_id, usage in report["sessions"].items():
+        largest = next(iter(usage["keys"]), None)
+        rows.append({"session": session_id[:8], "total_kb": round(usage["total"] / 1024, 1),
+                     "cache_kb": round(usage["cache"] / 1024, 1), "largest_key": largest})
+    return sorted(rows, key=lambda row: row["total_kb"], reverse=True)
+
+
+def render_metrics_panel():
+    """
+    Sidebar panels with per-endpoint API metrics and session memory (process-wide, all sessions).
+
+    Only call this for admins (see server_requests.is_admin).
+    """
+    with st.sidebar.expander("📈 API metrics"):
+        rows = metrics_rows()
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.caption("No API requests recorded yet.")
+        st.download_button("Download Prometheus metrics", api_metrics.prometheus_text(),
+                           file_name="api_metrics.prom", mime="text/plain")
+        if st.button("Reset metrics", key="reset_api_metrics"):
+            api_metrics.reset()
+
+    with st.sidebar.expander("🧠 Session memory"):
+        report = memory_report()
+        budget = report["cache_budget_bytes"]
+        st.caption(f"Sessions: {report['session_bytes'] / 2 ** 20:.1f} MiB "
+                   f"(response caches {report['cache_bytes'] / 2 ** 20:.1f} MiB of "
+                   f"{f'{budget / 2 ** 20:.0f} MiB' if budget else 'unlimited'}, "
+                   f"{report['cache_budget_evictions']} budget evictions), "
+                   f"availability memo {report['availability_memo_bytes'] / 2 ** 20:.1f} MiB")
+        st.dataframe(memory_rows(report), hide_index=True)
@@ -0,0 +1,332 @@
+"""
+Typed records for the API's teachers, students, meetings and users.
+
+Responses are decoded once, when they arrive, into ``__slots__`` classes:
+every field's type is validated in a single pass over the class's field spec,
+subject names are interned (a listing repeats the same few subjects thousands
+of times) and datetime fields are only parsed when read. Records stay read-only mappings, so code written against the raw dicts
+(``record.get("name")``, ``record["id"]``, ``dict(record)``) keeps working;
+a field the payload did not have (or had as null) is simply absent.
+"""
+import logging
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+
+from availability import parsed_availability
+from weekly_template import WeeklyTemplate
+
+logger = logging.getLogger(__name__)
+
+# Field kinds: name -> (accepted types, or None for any, description for errors)
+_CHECKS = {
+    "str": ((str,), "a string"),
+    "number": ((int, float), "a number"),
+    "list": ((list,), "a list"),
+    "dict": ((dict,), "an object"),
+    "any": (None, "anything"),
+}
+
+
+class ValidationError(ValueError):
+    """A payload that does not match its model's schema."""
+
+
+def _subjects(cls, name, value):
+    """A list of subject names, interned so equal subjects share one string."""
+    if type(value) is not list:
+        raise ValidationError(f"{cls.__name__}.{name} must be a list, got {type(value).__name__}")
+    intern = sys.intern
+    try:
+        return [intern(subject) for subject in value]
+    except TypeError:
+        raise ValidationError(f"{cls.__name__}.{name} must only contain strings") from None
+
+
+def _str_list(cls, name, value):
+    if type(value) is not list or any(type(item) is not str for item in value):
+        raise ValidationError(f"{cls.__name__}.{name} must be a list of strings")
+    return value
+
+
+def _intervals(cls, name, value):
+    """A list of {"start", "end"} dicts; the timestamps themselves are parsed lazily."""
+    if type(value) is not list:
+        raise ValidationError(f"{cls.__name__}.{name} must be a list, got {type(value).__name__}")
+    for interval in value:
+        if type(interval) is not dict or "start" not in interval or "end" not in interval:
+            raise ValidationError(f"{cls.__name__}.{name} entries must have a start and an end")
+    return value
+
+
+def _parse_datetime(value):
+    """Parse an ISO 8601 string, or None if it is missing or not a full datetime."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _weekly(record):
+    data = record.weekly_availability
+    if data is None:
+        return None
+    try:
+        return WeeklyTemplate.from_json(data)
+    except ValueError as e:
+        logger.warning("Ignoring weekly availability of %r: %s", record, e)
+        return None
+
+
+# Kinds whose values are checked and converted by a helper instead of a type check
+_CONVERTERS = {
+    "subjects": _subjects,
+    "str_list": _str_list,
+    "intervals": _intervals,
+}
+
+
+def _field_spec(cls):
+    """`cls.FIELDS` resolved once: (name, accepted types, converter, required, description) per field."""
+    spec = []
+    for name, kind, required in cls.FIELDS:
+        types, description = _CHECKS.get(kind, (None, None))
+        spec.append((name, types, _CONVERTERS.get(kind), required, description))
+    return tuple(spec)
+
+
+class Model(Mapping):
+    """
+    Base class for API records.
+
+    Subclasses list their fields as ``FIELDS = ((name, kind, required), ...)``
+    with a matching ``__slots__``; keys listed in ``DROPPED`` (e.g. password
+    hashes) are discarded, and any other unknown keys are kept as extras.
+    """
+
+    __slots__ = ("_extra",)
+    FIELDS = ()
+    DROPPED = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NAMES = tuple(name for name, _, _ in cls.FIELDS)
+        cls._KNOWN = frozenset(cls._NAMES) | cls.DROPPED
+        cls._SPEC = _field_spec(cls)
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Validate one parsed JSON object and build the record.
+
+        Raises:
+            ValidationError: If a required field is missing or a field has the wrong type.
+        """
+        if type(data) is not dict:
+            raise ValidationError(f"{cls.__name__} must be an object, got {type(data).__name__}")
+        get = data.get
+        record = object.__new__(cls)
+        present = 0
+        for name, types, convert, required, description in cls._SPEC:
+            value = get(name)
+            if value is None:
+                if required:
+                    raise ValidationError(f"{cls.__name__}.{name} is required")
+            else:
+                if convert is not None:
+                    value = convert(cls, name, value)
+                elif types is not None and type(value) not in types:
+                    raise ValidationError(f"{cls.__name__}.{name} must be {description}, got {type(value).__name__}")
+                present += 1
+            setattr(record, name, value)
+        record._extra = None
+        if len(data) > present:
+            extra = {key: value for key, value in data.items() if key not in cls._KNOWN}
+            if extra:
+                record._extra = extra
+        return record
+
+    @classmethod
+    def decode_many(cls, items):
+        """Decode a JSON array of objects, skipping (and logging) records that fail validation."""
+        if type(items) is not list:
+            raise ValidationError(f"expected a list of {cls.__name__} records, got {type(items).__name__}")
+        decode = cls.decode
+        records = []
+        for item in items:
+            try:
+                records.append(decode(item))
+            except ValidationError as e:
+                logger.warning("Skipping invalid record: %s", e)
+        return records
+
+    def get(self, key, default=None):
+        if key in self._KNOWN:
+            value = getattr(self, key, None)
+            return default if value is None else value
+        extra = self._extra
+        return default if extra is None else extra.get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        for name in self._NAMES:
+            if getattr(self, name) is not None:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """A plain dict copy of the record, as the API sent it (minus dropped fields)."""
+        return dict(self.items())
+
+    def replace(self, **changes):
+        """
+        A copy of the record with some fields changed, validated like a decoded one.
+
+        Raises:
+            ValidationError: If a changed field has the wrong type.
+        """
+        return self.decode(dict(self.items(), **changes))
+
+    def __repr__(self):
+        # Records carry personal data; identify them by id only
+        return f"{type(self).__name__}(id={self.get('id')!r})"
+
+
+class Teacher(Model):
+    __slots__ = ("id", "name", "email", "phone", "about_section", "subjects_to_teach", "hourly_rate",
+                 "rating", "available", "weekly_availability", "meetings")
+    FIELDS = (
+        ("id", "str", True),
+        ("name", "str", True),
+        ("email", "str", False),
+        ("phone", "str", False),
+        ("about_section", "str", False),
+        ("subjects_to_teach", "subjects", False),
+        ("hourly_rate", "number", False),
+        ("rating", "number", False),
+        ("available", "intervals", False),
+        ("weekly_availability", "dict", False),
+        ("meetings", "list", False),
+    )
+
+    @property
+    def availability(self):
+        """The parsed availability (see availability.ParsedAvailability), computed on first use."""
+        return parsed_availability(self)
+
+    @property
+    def weekly(self):
+        """The recurring weekly availability, or None if there is none (or it is malformed)."""
+        return _weekly(self)
+
+
+class Student(Model):
+    __slots__ = ("id", "name", "email", "phone", "about_section", "subjects_interested_in_learning", "rating",
+                 "available", "weekly_availability", "meetings")
+    FIELDS = (
+        ("id", "str", True),
+        ("name", "str", True),
+        ("email", "str", False),
+        ("phone", "str", False),
+        ("about_section", "str", False),
+        ("subjects_interested_in_learning", "subjects", False),
+        ("rating", "number", False),
+        ("available", "intervals", False),
+        ("weekly_availability", "dict", False),
+        ("meetings", "list", False),
+    )
+
+    @property
+    def availability(self):
+        return parsed_availability(self)
+
+    @property
+    def weekly(self):
+        return _weekly(self)
+
+
+class Meeting(Model):
+    __slots__ = ("id", "subject", "location", "start_time", "finish_time", "status", "people", "attached_files",
+                 "_start", "_finish")
+    FIELDS = (
+        ("id", "str", True),
+        ("subject", "str", False),
+        ("location", "str", False),
+        ("start_time", "str", False),
+        ("finish_time", "str", False),
+        ("status", "str", False),
+        ("people", "list", False),
+        ("attached_files", "list", False),
+    )
+
+    @property
+    def start(self):
+        """`start_time` as a datetime, parsed on first access (None if it is not a full datetime)."""
+        try:
+            return self._start
+        except AttributeError:
+            self._start = _parse_datetime(self.start_time)
+            return self._start
+
+    @property
+    def finish(self):
+        try:
+            return self._finish
+        except AttributeError:
+            self._finish = _parse_datetime(self.finish_time)
+            return self._finish
+
+
+class User(Model):
+    __slots__ = ("id", "name", "username", "email", "roles")
+    FIELDS = (
+        ("id", "str", True),
+        ("name", "str", False),
+        ("username", "str", False),
+        ("email", "str", False),
+        ("roles", "str_list", False),
+    )
+    DROPPED = frozenset({"password"})
+
+
+# Model for each top-level API resource
+MODELS_BY_RESOURCE = {
+    "teachers": Teacher,
+    "students": Student,
+    "meetings": Meeting,
+    "users": User,
+}
+
+
+def model_for(endpoint):
+    """The model an endpoint's records decode into ("/meetings/user/42" -> Meeting), or None."""
+    return MODELS_BY_RESOURCE.get(endpoint.strip("/").split("/", 1)[0])
+
+
+def decode_response(endpoint, payload):
+    """
+    Decode a parsed response into the model for its endpoint's resource.
+
+    Objects become one record and arrays a list of records; payloads of other
+    endpoints are returned unchanged.
+
+    Raises:
+        ValidationError: If a single-record payload fails validation.
+    """
+    model = model_for(endpoint)
+    if model is None or payload is None:
+        return payload
+    if isinstance(payload, list):
+        return model.decode_many(payload)
+    return model.decode(payload)
@@ -0,0 +1,254 @@
+"""
+Teacher recommendations for a student, scored over the whole directory at once.
+
+`TeacherFeatures` turns a teacher listing into flat NumPy arrays once (per
+directory snapshot): subject codes, hourly rates, ratings, availability
+intervals and weekly-schedule bitmaps. Scoring a student against it is then a
+handful of vectorized operations with no per-teacher Python code:
+
+    score = w_subjects     * share of the student's subjects the teacher teaches
+          + w_availability * share of the student's time the teacher is also free
+          + w_rate         * how cheap the teacher is relative to the directory
+          + w_rating       * rating / 5
+
+Every term is in [0, 1], so the weights read as relative importance.
+"""
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+from availability import ParsedAvailability, parse_many
+from scheduling import merge_intervals
+from weekly_template import SLOTS_PER_WEEK
+
+DEFAULT_WEIGHTS = {"subjects": 3.0, "availability": 2.0, "rate": 1.0, "rating": 1.0}
+MAX_RATING = 5.0
+
+_WEEK_WORDS = -(-SLOTS_PER_WEEK // 64)
+
+
+def parse_weights(spec):
+    """
+    Parse weights like "subjects=3,availability=2" on top of the defaults.
+
+    Raises:
+        ValueError: For unknown names or values that are not numbers.
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"unknown recommendation weight {name!r}")
+        weights[name] = float(value)
+    return weights
+
+
+# Override with e.g. RECOMMENDATION_WEIGHTS="subjects=4,rate=0.5"
+RECOMMENDATION_WEIGHTS = parse_weights(os.getenv("RECOMMENDATION_WEIGHTS"))
+# Key of the features among a directory snapshot's derived data
+FEATURES_KEY = ("recommendation_features",)
+
+
+def _week_words(template):
+    """A weekly template's bitmap as little-endian uint64 words."""
+    bits = template.bits if template else 0
+    return np.frombuffer(bits.to_bytes(_WEEK_WORDS * 8, "little"), dtype=np.uint64)
+
+
+def _rate_scores(rates):
+    """1 for the cheapest teacher down to 0 for the most expensive; teachers without a rate get 0."""
+    known = ~np.isnan(rates)
+    if not known.any():
+        return np.zeros(len(rates))
+    low, high = rates[known].min(), rates[known].max()
+    return np.where(known, (high - np.where(known, rates, high)) / (high - low or 1.0), 0.0)
+
+
+def _popcount(words):
+    """Set bits per row of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+class TeacherFeatures:
+    """
+    Column arrays describing every teacher in a listing, aligned by row.
+
+    Build once per listing with `build`; `score` and `rank` are then cheap.
+    """
+
+    __slots__ = ("teachers", "rows", "subject_codes", "subject_owner", "rate_scores", "rating_scores",
+                 "interval_owner", "interval_starts", "interval_ends", "weekly_rows", "weekly", "_vocabulary")
+
+    def __init__(self, teachers):
+        self.teachers = tuple(teachers)
+        self.rows = {teacher.get("id"): row for row, teacher in enumerate(self.teachers)}
+
+    @classmethod
+    def build(cls, teachers):
+        features = cls(teachers)
+        teachers = features.teachers
+
+        vocabulary, owners, codes = {}, [], []
+        for row, teacher in enumerate(teachers):
+            for subject in set(teacher.get("subjects_to_teach") or ()):
+                owners.append(row)
+                codes.append(vocabulary.setdefault(subject, len(vocabulary)))
+        features._vocabulary = vocabulary
+        features.subject_owner = np.asarray(owners, dtype=np.int64)
+        features.subject_codes = np.asarray(codes, dtype=np.int64)
+
+        # The rate and rating terms don't depend on the student; missing values become NaN here
+        rates = np.array([teacher.get("hourly_rate") for teacher in teachers], dtype=float)
+        ratings = np.array([teacher.get("rating") for teacher in teachers], dtype=float)
+        features.rate_scores = _rate_scores(rates)
+        features.rating_scores = np.clip(np.nan_to_num(ratings) / MAX_RATING, 0.0, 1.0)
+
+        owner, starts, ends = parse_many(teachers)
+        # Sorted by start, np.interp walks the points in order instead of searching for each;
+        # float seconds are exact for epoch values
+        by_start = np.argsort(starts, kind="stable")
+        features.interval_owner = owner[by_start]
+        features.interval_starts = starts[by_start].astype(float)
+        features.interval_ends = ends[by_start].astype(float)
+
+        # Only the teachers with a weekly schedule get a bitmap row
+        weekly_rows, weekly = [], []
+        for row, teacher in enumerate(teachers):
+            template = getattr(teacher, "weekly", None)
+            if template:
+                weekly_rows.append(row)
+                weekly.append(_week_words(template))
+        features.weekly_rows = np.asarray(weekly_rows, dtype=np.int64)
+        features.weekly = np.array(weekly, dtype=np.uint64).reshape(len(weekly), _WEEK_WORDS)
+        return features
+
+    def __len__(self):
+        return len(self.teachers)
+
+    # ------------------------------------------------------------------
+    # Score terms, each a float array with one value in [0, 1] per teacher
+    # ------------------------------------------------------------------
+    def subject_match(self, subjects):
+        """Share of `subjects` each teacher teaches."""
+        wanted = [self._vocabulary[s] for s in set(subjects or ()) if s in self._vocabulary]
+        if not wanted:
+            return np.zeros(len(self))
+        table = np.zeros(len(self._vocabulary), dtype=bool)
+        table[wanted] = True
+        counts = np.bincount(self.subject_owner[table[self.subject_codes]], minlength=len(self))
+        return counts / len(set(subjects))
+
+    def availability_match(self, intervals=(), weekly=None):
+        """
+        Share of the student's free time each teacher is also free.
+
+        Dated intervals and the weekly schedule are compared separately and
+        the better of the two counts.
+        """
+        result = np.zeros(len(self))
+        starts, ends = merge_intervals(intervals)
+        if starts and len(self.interval_starts):
+            # covered(x), the seconds of the student's time before x, is piecewise linear:
+            # rising inside the student's intervals and flat between them. A teacher
+            # interval [a, b) overlaps the student's time by covered(b) - covered(a).
+            points = np.column_stack((starts, ends)).ravel().astype(float)
+            lengths = np.asarray(ends, dtype=float) - np.asarray(starts, dtype=float)
+            before = np.concatenate(([0.0], np.cumsum(lengths)))
+            values = np.column_stack((before[:-1], before[1:])).ravel()
+            overlap = np.interp(self.interval_ends, points, values) - np.interp(self.interval_starts, points, values)
+            result = np.bincount(self.interval_owner, weights=overlap, minlength=len(self)) / before[-1]
+        if weekly and len(self.weekly_rows):
+            student_words = _week_words(weekly)
+            shared = _popcount(self.weekly & student_words) / _popcount(student_words)
+            result[self.weekly_rows] = np.maximum(result[self.weekly_rows], shared)
+        return np.minimum(result, 1.0)
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+    def score(self, student, weights=None):
+        """
+        Recommendation score of every teacher for `student`.
+
+        Args:
+            student (Mapping): The student record (subjects, `available`, optional weekly schedule).
+            weights (dict): Term -> weight; missing terms use RECOMMENDATION_WEIGHTS.
+
+        Returns:
+            numpy.ndarray: One float per teacher, in listing order.
+        """
+        weights = {**RECOMMENDATION_WEIGHTS, **(weights or {})}
+        score = np.zeros(len(self))
+        if weights["subjects"]:
+            score += weights["subjects"] * self.subject_match(student.get("subjects_interested_in_learning"))
+        if weights["availability"]:
+            intervals = ParsedAvailability.parse(student.get("available") or []).intervals()
+            score += weights["availability"] * self.availability_match(intervals, getattr(student, "weekly", None))
+        if weights["rate"]:
+            score += weights["rate"] * self.rate_scores
+        if weights["rating"]:
+            score += weights["rating"] * self.rating_scores
+        return score
+
+    def rank(self, student, weights=None, limit=None):
+        """The teachers best first (ties keep listing order); `limit` picks the top ones without a full sort."""
+        return self.order(self.score(student, weights), limit=limit)
+
+    def order(self, scores, teachers=None, limit=None):
+        """
+        Sort teachers by precomputed `scores`, best first.
+
+        Args:
+            scores (numpy.ndarray): From `score`.
+            teachers (list): A subset of this listing to sort (e.g. a filtered
+                directory); defaults to every teacher.
+            limit (int): Only return this many.
+
+        Returns:
+            Ranking: A read-only sequence; records are only looked up as they are read.
+        """
+        source = self.teachers if teachers is None else teachers
+        if teachers is None:
+            subset = scores
+        else:
+            rows = np.fromiter((self.rows.get(t.get("id"), -1) for t in teachers), dtype=np.int64,
+                               count=len(teachers))
+            subset = np.where(rows >= 0, scores[np.maximum(rows, 0)], -np.inf)
+        if limit is not None and limit < len(subset):
+            top = np.argpartition(-subset, limit)[:limit]
+            order = top[np.lexsort((top, -subset[top]))]
+        else:
+            order = np.argsort(-subset, kind="stable")
+        return Ranking(source, order)
+
+
+class Ranking(Sequence):
+    """Teachers in ranked order, as positions into the listing they came from."""
+
+    __slots__ = ("_source", "_order")
+
+    def __init__(self, source, order):
+        self._source = source
+        self._order = order
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            source = self._source
+            return [source[i] for i in self._order[index].tolist()]
+        return self._source[int(self._order[index])]
+
+    def __iter__(self):
+        source = self._source
+        return (source[i] for i in self._order.tolist())
+
+
+def snapshot_features(snapshot):
+    """The TeacherFeatures of a directory snapshot, built once and shared by every session."""
+    return snapshot.derived(FEATURES_KEY, TeacherFeatures.build)
@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import OrderedDict
+
+from session_memory import approx_size
+
+
+class _NotFound:
+    """Cached marker for a resource the backend reported as missing (negative caching)."""
+
+    def __repr__(self):
+        return "NOT_FOUND"
+
+
+NOT_FOUND = _NotFound()
+
+
+def make_key(endpoint, params=None, token=None):
+    """Build a hashable cache key from an endpoint, its query parameters and the auth token."""
+    params_key = tuple(sorted((str(k), str(v)) for k, v in params.items())) if params else ()
+    return endpoint, params_key, token
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache for parsed API responses.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``max_entries`` or ``max_bytes`` is reached. Each entry's
+    approximate size is kept, and a shared ``budget`` (see session_memory.py)
+    can evict entries when all caches together grow too large. Cached
+    payloads are shared, so callers must copy them before mutating.
+    """
+
+    def __init__(self, max_entries=128, ttl=30.0, clock=time.monotonic, max_bytes=0, budget=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value, size, last_used)
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if budget is not None:
+            budget.register(self)
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, size, _ = entry
+                now = self._clock()
+                if expires_at > now:
+                    self._entries[key] = (expires_at, value, size, now)
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                self._drop(key)
+            self.misses += 1
+            return False, None
+
+    def peek(self, key):
+        """Like `get`, but without touching recency or the hit/miss counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                return True, entry[1]
+            return False, None
+
+    def set(self, key, value, ttl=None, size=None):
+        """
+        Store a value.
+
+        Args:
+            size (int): Approximate bytes held by `value`, if known; measured
+                with `approx_size` otherwise. Pass it for derived values that
+                share most of their memory with another entry.
+        """
+        if size is None:
+            size = approx_size(value)
+        if self.max_bytes and size > self.max_bytes:
+            # Caching it would evict everything else and still not fit
+            with self._lock:
+                self._drop(key)
+            return
+        with self._lock:
+            now = self._clock()
+            self._drop(key)
+            self._entries[key] = (now + (self.ttl if ttl is None else ttl), value, size, now)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes):
+                self.evict_oldest()
+        if self.budget is not None:
+            # Outside our lock: the budget locks other sessions' caches
+            self.budget.enforce()
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def oldest_use(self):
+        """When the least recently used entry was last used, or None if the cache is empty."""
+        with self._lock:
+            if not self._entries:
+                return None
+            return next(iter(self._entries.values()))[3]
+
+    def evict_oldest(self):
+        """Evict the least recently used entry. Returns its size (0 if the cache was empty)."""
+        with self._lock:
+            if not self._entries:
+                return 0
+            _, entry = self._entries.popitem(last=False)
+            self.bytes -= entry[2]
+            self.evictions += 1
+            return entry[2]
+
+    def invalidate_prefix(self, prefix):
+        """Drop every entry whose endpoint starts with ``prefix``. Returns the number removed."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0].startswith(prefix)]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return hit/miss/eviction counters; ``hits`` is the number of backend calls saved."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
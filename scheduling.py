@@ -0,0 +1,294 @@
+"""
+Meeting slot validation and suggestions.
+
+A `Timeline` holds one person's availability and existing meetings as merged,
+sorted epoch-second intervals. Checking a requested slot against it is a pair
+of binary searches, and the nearest free slots are found by walking outward
+from the requested time. Nothing here talks to Streamlit or the API: callers
+build timelines from fetched records with `timeline_for`.
+"""
+import bisect
+from itertools import islice
+
+from availability import from_epoch, to_epoch
+
+# Suggested slots start on multiples of this many seconds
+SLOT_ALIGNMENT = 15 * 60
+# Meetings with these statuses no longer block their participants' time
+INACTIVE_STATUSES = frozenset({"Canceled", "Cancelled", "Rejected"})
+
+
+def _epoch(value):
+    return value if isinstance(value, int) else to_epoch(value)
+
+
+def merge_intervals(pairs):
+    """
+    Sort (start, end) pairs and merge the ones that overlap or touch.
+
+    Returns:
+        tuple: (starts, ends) lists; both are sorted and the intervals are disjoint.
+    """
+    starts, ends = [], []
+    for start, end in sorted(pairs):
+        if end <= start:
+            continue
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+class Timeline:
+    """
+    One person's availability and busy time, as merged sorted intervals in epoch seconds.
+
+    Args:
+        available: (start, end) pairs the person can meet in, or None for no
+            constraint (students are only limited by their meetings).
+        busy: (start, end) pairs already taken by meetings.
+    """
+
+    __slots__ = ("free_starts", "free_ends", "busy_starts", "busy_ends")
+
+    def __init__(self, available=None, busy=()):
+        if available is None:
+            self.free_starts = self.free_ends = None
+        else:
+            self.free_starts, self.free_ends = merge_intervals(available)
+        self.busy_starts, self.busy_ends = merge_intervals(busy)
+
+    def copy(self):
+        timeline = Timeline.__new__(Timeline)
+        timeline.free_starts, timeline.free_ends = self.free_starts, self.free_ends  # never mutated
+        timeline.busy_starts, timeline.busy_ends = list(self.busy_starts), list(self.busy_ends)
+        return timeline
+
+    def is_available(self, start, end):
+        """True if one availability interval covers all of [start, end)."""
+        if self.free_starts is None:
+            return True
+        i = bisect.bisect_right(self.free_starts, start) - 1
+        return i >= 0 and self.free_ends[i] >= end
+
+    def conflicts(self, start, end):
+        """Busy intervals overlapping [start, end)."""
+        # Busy intervals are disjoint, so their ends are sorted as well
+        i = bisect.bisect_right(self.busy_ends, start)
+        result = []
+        while i < len(self.busy_starts) and self.busy_starts[i] < end:
+            result.append((self.busy_starts[i], self.busy_ends[i]))
+            i += 1
+        return result
+
+    def add_busy(self, start, end):
+        """Mark [start, end) as taken, merging it with the busy intervals it touches."""
+        low = bisect.bisect_left(self.busy_ends, start)
+        high = bisect.bisect_right(self.busy_starts, end)
+        if low < high:
+            start = min(start, self.busy_starts[low])
+            end = max(end, self.busy_ends[high - 1])
+        self.busy_starts[low:high] = [start]
+        self.busy_ends[low:high] = [end]
+
+
+def timeline_for(available=None, meetings=(), person_id=None):
+    """
+    Build a Timeline from fetched data.
+
+    Args:
+        available: (start, end) epoch pairs (e.g. ``parsed_availability(record).intervals()``),
+            or None for no availability constraint.
+        meetings: Meeting records; only active ones with full start and finish datetimes count.
+        person_id: If given, only meetings this person takes part in are counted.
+    """
+    busy = []
+    for meeting in meetings:
+        if meeting.get("status") in INACTIVE_STATUSES:
+            continue
+        if person_id is not None and not any(
+                (person.get("id") if isinstance(person, dict) else person) == person_id
+                for person in meeting.get("people") or []):
+            continue
+        try:
+            busy.append((to_epoch(meeting.get("start_time")), to_epoch(meeting.get("finish_time"))))
+        except (AttributeError, TypeError, ValueError):
+            continue  # legacy time-only or missing values can't be placed on the calendar
+    return Timeline(available, busy)
+
+
+def _free_in(teacher, others, i):
+    """Free parts of the teacher's i-th availability interval, once everyone's meetings are removed."""
+    start, end = teacher.free_starts[i], teacher.free_ends[i]
+    busy_starts, busy_ends = merge_intervals(
+        pair for timeline in (teacher, *others) for pair in timeline.conflicts(start, end))
+    windows, cursor = [], start
+    for busy_start, busy_end in zip(busy_starts, busy_ends):
+        if busy_start > cursor:
+            windows.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if cursor < end:
+        windows.append((cursor, end))
+    return windows
+
+
+def free_windows(teacher, others=()):
+    """
+    The teacher's availability minus the busy time of the teacher and everyone in `others`.
+
+    Returns:
+        list: Disjoint (start, end) pairs in order.
+    """
+    return [window for i in range(len(teacher.free_starts or ())) for window in _free_in(teacher, others, i)]
+
+
+def _nearest_start(window, duration, near, alignment):
+    """The aligned start closest to `near` for a slot of `duration` inside `window`, or None."""
+    first = -(-window[0] // alignment) * alignment
+    last = (window[1] - duration) // alignment * alignment
+    if last < first:
+        return None
+    target = round(near / alignment) * alignment
+    return min(max(target, first), last)
+
+
+def suggest_slots(duration, teacher, others=(), near=0, limit=3, alignment=SLOT_ALIGNMENT, not_before=None):
+    """
+    The free slots of `duration` seconds nearest to `near`, at most one per free window.
+
+    Only the availability intervals around `near` are examined: the search
+    walks outward in both directions and stops once each side has produced
+    `limit` candidates.
+
+    Args:
+        duration (int): Slot length in seconds.
+        teacher (Timeline): Whose availability the slot must fall in.
+        others: Timelines of the other participants, whose meetings must be avoided.
+        near: Epoch seconds (or datetime / ISO string) to search around.
+        limit (int): Maximum number of suggestions.
+        alignment (int): Suggested starts are multiples of this many seconds.
+        not_before: Earliest allowed start (e.g. now).
+
+    Returns:
+        list: (start, end) epoch pairs, nearest first.
+    """
+    near = _epoch(near)
+    not_before = None if not_before is None else _epoch(not_before)
+    count = len(teacher.free_starts or ())
+
+    def candidates(indices, reverse=False):
+        for i in indices:
+            windows = _free_in(teacher, others, i)
+            for window in reversed(windows) if reverse else windows:
+                if not_before is not None:
+                    window = (max(window[0], not_before), window[1])
+                start = _nearest_start(window, duration, near, alignment)
+                if start is not None:
+                    yield abs(start - near), start
+
+    # Interval `pivot` starts at or before `near`. Later intervals yield candidates
+    # in increasing distance, as do earlier ones walked backwards, so `limit` from
+    # each side (plus everything in the pivot itself) contains the nearest overall.
+    pivot = bisect.bisect_right(teacher.free_starts or [], near) - 1
+    found = list(candidates([pivot])) if pivot >= 0 else []
+    found += islice(candidates(range(pivot + 1, count)), limit)
+    found += islice(candidates(range(pivot - 1, -1, -1), reverse=True), limit)
+    return [(start, start + duration) for _, start in sorted(found)[:limit]]
+
+
+class SlotCheck:
+    """Outcome of checking one requested slot."""
+
+    __slots__ = ("start", "end", "problems", "suggestions")
+
+    def __init__(self, start, end, problems, suggestions=()):
+        self.start = start
+        self.end = end
+        self.problems = problems
+        self.suggestions = list(suggestions)
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    def __repr__(self):
+        return f"SlotCheck({from_epoch(self.start)}, {from_epoch(self.end)}, problems={self.problems})"
+
+
+def check_slot(start, end, teacher, student=None, suggest=3, alignment=SLOT_ALIGNMENT, not_before=None):
+    """
+    Validate a requested meeting slot.
+
+    Args:
+        start, end: The requested slot (datetimes, ISO strings or epoch seconds).
+        teacher (Timeline): The teacher's availability and meetings.
+        student (Timeline): The student's meetings, if known.
+        suggest (int): How many alternative slots to suggest when the request is rejected.
+        alignment (int): Alignment of suggested starts, in seconds.
+        not_before: Earliest allowed start (e.g. now).
+
+    Returns:
+        SlotCheck: `problems` lists why the slot was rejected (empty if it is
+        valid); `suggestions` holds the nearest valid slots of the same length.
+    """
+    start, end = _epoch(start), _epoch(end)
+    others = () if student is None else (student,)
+    problems = []
+    if end <= start:
+        problems.append("The meeting must end after it starts.")
+        return SlotCheck(start, end, problems)
+    if not_before is not None and start < _epoch(not_before):
+        problems.append("The requested time is in the past.")
+    if not teacher.is_available(start, end):
+        problems.append("The teacher is not available at that time.")
+    if teacher.conflicts(start, end):
+        problems.append("The teacher already has a meeting at that time.")
+    if student is not None and student.conflicts(start, end):
+        problems.append("You already have a meeting at that time.")
+    suggestions = []
+    if problems and suggest:
+        suggestions = suggest_slots(end - start, teacher, others, near=start, limit=suggest,
+                                    alignment=alignment, not_before=not_before)
+    return SlotCheck(start, end, problems, suggestions)
+
+
+def validate_batch(requests, timelines, suggest=0, not_before=None):
+    """
+    Validate many meeting requests at once, in order.
+
+    Each accepted request books its slot for both participants, so later
+    requests in the batch that clash with it are rejected too. The timelines
+    passed in are not modified.
+
+    Args:
+        requests: (teacher_id, student_id, start, end) tuples.
+        timelines (dict): Person id -> Timeline; teachers need one with
+            availability, students without one are only checked against the batch.
+        suggest (int): Alternative slots to suggest per rejected request.
+        not_before: Earliest allowed start.
+
+    Returns:
+        list: One SlotCheck per request.
+    """
+    working = {}
+
+    def timeline(person_id):
+        if person_id not in working:
+            original = timelines.get(person_id)
+            working[person_id] = original.copy() if original is not None else Timeline()
+        return working[person_id]
+
+    results = []
+    for teacher_id, student_id, start, end in requests:
+        teacher, student = timeline(teacher_id), timeline(student_id)
+        if teacher.free_starts is None:
+            teacher.free_starts, teacher.free_ends = [], []  # unknown teachers have no availability
+        check = check_slot(start, end, teacher, student, suggest=suggest, not_before=not_before)
+        if check.ok:
+            teacher.add_busy(check.start, check.end)
+            student.add_busy(check.start, check.end)
+        results.append(check)
+    return results
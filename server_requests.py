@@ -1,9 +1,30 @@
+from collections.abc import Mapping
 from typing import Optional
 import streamlit as st
 import requests
 import logging
 from dotenv import load_dotenv
 import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from http_client import ApiClient
+from api_metrics import api_metrics
+from log_config import configure_logging, fields
+from response_cache import NOT_FOUND, ResponseCache, make_key
+from session_memory import cache_budget
+from meeting_store import MeetingStore, participant_names
+from change_tracking import TrackedDocument
+from directory_snapshot import SharedDirectory
+from models import Meeting, Student, Teacher, ValidationError, decode_response
+from availability import format_epoch, from_epoch, parsed_availability, to_epoch
+from scheduling import check_slot, timeline_for
+from weekly_template import WEEKDAYS
+from recommendations import snapshot_features
+from teacher_search import index_snapshot
+from availability_index import sync_shared_index
+from meeting_export import iter_paged, meetings_csv, meetings_ics, write_export
+from datetime import datetime, time, timedelta
 
 # Load environment variables
 load_dotenv()
@@ -16,10 +37,39 @@ if not BASE_URL:
     st.error("BASE_URL not found in the environment variables. Please configure it in your .env file.")
     raise ValueError("BASE_URL is not set in the .env file.")
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Queue-backed, structured, redacting logging (see log_config.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive client used by every API helper; every request is recorded in api_metrics
+api_client = ApiClient(BASE_URL, metrics=api_metrics)
+
+# Per-session response cache settings
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "128"))
+# Per-session cap on cached bytes (0 = none); all sessions together are capped by RESPONSE_CACHE_BUDGET_MB
+RESPONSE_CACHE_MAX_BYTES = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", "64")) * 2 ** 20)
+# How long a 404 ("no such profile") is remembered
+NOT_FOUND_TTL = float(os.getenv("NOT_FOUND_TTL", "10"))
+
+# Background workers for prefetching; they never touch Streamlit APIs
+prefetch_executor = ThreadPoolExecutor(max_workers=int(os.getenv("PREFETCH_WORKERS", "4")),
+                                       thread_name_prefix="prefetch")
+
+# Seconds before the shared teacher directory is reloaded in the background
+DIRECTORY_REFRESH_SECONDS = float(os.getenv("DIRECTORY_REFRESH_SECONDS", "60"))
+
+# Users with this role can export every meeting, not just their own
+ADMIN_ROLE = os.getenv("ADMIN_ROLE", "admin")
+
+# Resources whose backend rejected PATCH (405/501); later saves go straight to PUT
+patch_unsupported = set()
+
+# Writes to a resource also make these other resources stale
+RELATED_RESOURCES = {
+    "/meetings": ["/teachers", "/students"],
+}
+
 
 def handle_response(response, success_message=None):
     try:
@@ -30,44 +80,169 @@ def handle_response(response, success_message=None):
         else:
             # Handle error responses
             error_message = response.json().get("message", response.text)
-            logger.error(f"API Error: {response.status_code} - {response.text}")
+            logger.error("API Error: %s - %s", response.status_code, response.text)
             st.error(f"Error: {error_message}")
             return None
     except Exception as e:
-        logger.exception(f"Failed to handle API response: {e}")
+        logger.exception("Failed to handle API response: %s", e)
         st.error("An unexpected error occurred while processing the server response.")
         return None
 
 
+def decode_payload(endpoint, payload):
+    """Decode a parsed response into its typed records (see models.py); None if it fails validation."""
+    try:
+        return decode_response(endpoint, payload)
+    except ValidationError as e:
+        logger.error("Invalid response from %s: %s", endpoint, e)
+        return None
+
+
+def load_directory():
+    """Fetch the full teacher listing for the shared directory snapshot (runs on its refresh thread)."""
+    response = api_client.get("/teachers/")
+    response.raise_for_status()
+    return Teacher.decode_many(response.json())
+
+
+# One teacher directory snapshot for the whole process, shared by every session. The
+# recommendation features, the search index and the availability index are updated
+# before each snapshot is published, off the request path.
+shared_directory = SharedDirectory(load_directory, refresh_interval=DIRECTORY_REFRESH_SECONDS,
+                                   prepare=[snapshot_features, index_snapshot, sync_shared_index])
+
+
+def get_response_cache():
+    """Return this session's response cache, creating it on first use."""
+    if "response_cache" not in st.session_state:
+        st.session_state.response_cache = ResponseCache(max_entries=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL,
+                                                        max_bytes=RESPONSE_CACHE_MAX_BYTES, budget=cache_budget)
+    return st.session_state.response_cache
+
+
+def invalidate_cached(endpoint):
+    """Drop cached responses for the resource an endpoint belongs to (e.g. "/teachers/42" -> "/teachers")."""
+    resource = "/" + endpoint.strip("/").split("/", 1)[0]
+    cache = get_response_cache()
+    removed = cache.invalidate_prefix(resource)
+    if resource == "/teachers":
+        shared_directory.invalidate()
+    for related in RELATED_RESOURCES.get(resource, []):
+        removed += cache.invalidate_prefix(related)
+    logger.debug("Invalidated %s cached responses after write to %s", removed, endpoint)
+
+
 # API Interactions
 def fetch_data(endpoint, params=None):
-    """Fetch data from an endpoint with optional query parameters."""
+    """Fetch data from an endpoint with optional query parameters, served from the session cache when fresh."""
     try:
-        headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
-        logger.info(f"Fetching data from endpoint: {endpoint}")
-        response = requests.get(f"{BASE_URL}{endpoint}", headers=headers, params=params)
-        return handle_response(response)
+        token = st.session_state.get('token', '')
+        cache = get_response_cache()
+        key = make_key(endpoint, params, token)
+        hit, cached = cache.get(key)
+        if hit:
+            logger.debug("Cache hit for endpoint: %s", endpoint)
+            return None if cached is NOT_FOUND else cached
+
+        headers = {"Authorization": f"Bearer {token}"}
+        logger.info("Fetching data from endpoint: %s", endpoint, extra=fields(high_volume=True))
+        response = api_client.get(endpoint, headers=headers, params=params)
+        result = decode_payload(endpoint, handle_response(response))
+        if result is not None:
+            cache.set(key, result)
+        return result
     except Exception as e:
-        logger.exception(f"Exception occurred while fetching data from {endpoint}: {e}")
+        logger.exception("Exception occurred while fetching data from %s: %s", endpoint, e)
         st.error("An unexpected error occurred while fetching data.")
         return []
 
 
+def prefetch(endpoint, params=None):
+    """
+    Warm the session cache for an endpoint in a background thread.
+
+    Args:
+        endpoint (str): The endpoint to fetch.
+        params (dict): Optional query parameters.
+
+    Returns:
+        Future: Resolves to the parsed response, or None if the request failed.
+    """
+    token = st.session_state.get('token', '')
+    cache = get_response_cache()
+    key = make_key(endpoint, params, token)
+    hit, cached = cache.get(key)
+    if hit:
+        return prefetch_executor.submit(lambda: None if cached is NOT_FOUND else cached)
+
+    def worker():
+        try:
+            response = api_client.get(endpoint, headers={"Authorization": f"Bearer {token}"}, params=params)
+            if response.status_code == 404:
+                cache.set(key, NOT_FOUND, ttl=NOT_FOUND_TTL)
+                return None
+            if response.status_code != 200:
+                return None
+            result = decode_payload(endpoint, response.json())
+            if result is not None:
+                cache.set(key, result)
+            return result
+        except Exception as e:
+            logger.warning("Prefetch of %s failed: %s", endpoint, e)
+            return None
+
+    return prefetch_executor.submit(worker)
+
+
+def fetch_if_exists(endpoint):
+    """
+    Fetch a single resource, treating 404 as "does not exist" rather than an error.
+
+    Both outcomes are cached; a miss is remembered for NOT_FOUND_TTL seconds.
+
+    Returns:
+        dict or None: The resource, or None if it does not exist or the request failed.
+    """
+    token = st.session_state.get('token', '')
+    cache = get_response_cache()
+    key = make_key(endpoint, None, token)
+    hit, cached = cache.get(key)
+    if hit:
+        return None if cached is NOT_FOUND else cached
+
+    try:
+        response = api_client.get(endpoint, headers={"Authorization": f"Bearer {token}"})
+    except Exception as e:
+        logger.exception("Exception occurred while fetching data from %s: %s", endpoint, e)
+        st.error("An unexpected error occurred while fetching data.")
+        return None
+    if response.status_code == 404:
+        cache.set(key, NOT_FOUND, ttl=NOT_FOUND_TTL)
+        return None
+    result = decode_payload(endpoint, handle_response(response))
+    if result is not None:
+        cache.set(key, result)
+    return result
+
+
 def send_data(endpoint, data=None, method="POST"):
     try:
         headers = {
             "Authorization": f"Bearer {st.session_state.get('token', '')}",
             "Content-Type": "application/json"
         }
-        url = f"{BASE_URL}{endpoint}"
-        logger.info(f"Sending {method} request to {url} with data: {data}")
+        # Only the field names: bodies carry passwords and personal data
+        logger.info("Sending %s request to %s", method, endpoint,
+                    extra=fields(body_fields=sorted(data) if isinstance(data, dict) else None))
 
-        response = requests.request(method, url, headers=headers, json=data)
-        logger.debug(f"API Response: {response.status_code} - {response.text}")
+        response = api_client.request(method, endpoint, headers=headers, json=data)
+        logger.debug("API Response: %s (%s bytes)", response.status_code, len(response.content))
+        if method != "GET" and endpoint != "/users/login":
+            invalidate_cached(endpoint)
 
         return handle_response(response)
     except requests.exceptions.RequestException as e:
-        logger.exception(f"Request to {endpoint} failed: {e}")
+        logger.exception("Request to %s failed: %s", endpoint, e)
         st.error("A network error occurred. Please check your connection and try again.")
         return None
 
@@ -83,16 +258,95 @@ def get_my_meetings(user_id):
         list: List of meetings involving the user.
     """
     try:
-        logger.info(f"Fetching meetings for user {user_id}")
+        logger.info("Fetching meetings for user %s", user_id)
         my_meetings = fetch_data(f"/meetings/user/{user_id}")
         if not my_meetings:
             logger.info("No meetings found for the user.")
         return my_meetings or []
     except Exception as e:
-        logger.exception(f"Error fetching meetings for user {user_id}: {e}")
+        logger.exception("Error fetching meetings for user %s: %s", user_id, e)
         return []
 
 
+def put_document(tracked, changes):
+    """
+    Save `changes` with a full PUT, for backends without PATCH.
+
+    A PUT overwrites every field, so the document is re-fetched first and the
+    changes applied to the current copy: fields saved elsewhere since
+    `tracked` was loaded (e.g. the profile while the availability editor was
+    open) are kept instead of being reverted to the stale snapshot.
+    """
+    endpoint = tracked.endpoint
+    get_response_cache().invalidate_prefix(endpoint)
+    current = fetch_data(endpoint)
+    # Anything but a document (None when missing, [] when the request failed) means no reload
+    if not isinstance(current, Mapping):
+        logger.error("Could not reload %s before saving; not overwriting it.", endpoint)
+        st.error("Could not load the latest version of this record. Please try again.")
+        return None
+    tracked.rebase(current)
+    return send_data(endpoint, tracked.merged(changes), method="PUT")
+
+
+def save_changes(tracked, changes, success_message=None):
+    """
+    Persist only the changed fields of a tracked document.
+
+    Sends a PATCH with just `changes` (and an If-Match precondition when the
+    document carries a version). Falls back to a full PUT of the re-fetched
+    document if the backend does not support PATCH for that resource.
+
+    Args:
+        tracked (TrackedDocument): The originally fetched document.
+        changes (dict): Field -> new value, usually from `tracked.diff(...)`.
+        success_message (str): Optional message shown on success.
+
+    Returns:
+        dict or None: The parsed response, `tracked.original` if nothing changed, or None on failure.
+    """
+    if not changes:
+        if success_message:
+            st.success(success_message)
+        return tracked.original
+
+    endpoint = tracked.endpoint
+    resource = "/" + endpoint.strip("/").split("/", 1)[0]
+    if resource in patch_unsupported:
+        result = put_document(tracked, changes)
+    else:
+        headers = {
+            "Authorization": f"Bearer {st.session_state.get('token', '')}",
+            "Content-Type": "application/json",
+        }
+        if tracked.version:
+            headers["If-Match"] = tracked.version
+        try:
+            logger.info("Sending PATCH request to %s with fields: %s", endpoint, sorted(changes))
+            response = api_client.request("PATCH", endpoint, headers=headers, json=changes)
+        except requests.exceptions.RequestException as e:
+            logger.exception("Request to %s failed: %s", endpoint, e)
+            st.error("A network error occurred. Please check your connection and try again.")
+            return None
+        invalidate_cached(endpoint)
+
+        if response.status_code in (405, 501):
+            logger.info("PATCH not supported for %s; falling back to PUT.", resource)
+            patch_unsupported.add(resource)
+            result = put_document(tracked, changes)
+        elif response.status_code == 412:
+            st.error("This record was changed elsewhere since you opened it. Please reload and try again.")
+            return None
+        else:
+            result = handle_response(response)
+
+    if result:
+        tracked.commit(changes, result)
+        if success_message:
+            st.success(success_message)
+    return result
+
+
 # Meeting Management
 def request_meeting_with_teacher(teacher):
     """
@@ -103,14 +357,20 @@ def request_meeting_with_teacher(teacher):
     """
     try:
         st.subheader(f"Request Meeting with {teacher.get('name', 'N/A')}")
+        # The slot inputs and suggestions belong to this teacher's form, not to the next teacher's
+        teacher_id = teacher['id']
 
         # Allow the student to input meeting details
         meeting_subject = st.text_input("Meeting Subject", help="Enter the subject of the meeting.")
         meeting_location = st.text_input("Meeting Location", help="Enter the meeting location.")
-        start_time = st.time_input("Start Time", help="Set the meeting's start time.")
-        finish_time = st.time_input("Finish Time", help="Set the meeting's end time.")
+        meeting_date = st.date_input("Meeting Date", key=f"meeting_date_{teacher_id}", help="Set the meeting's day.")
+        start_time = st.time_input("Start Time", key=f"meeting_start_{teacher_id}",
+                                   help="Set the meeting's start time.")
+        finish_time = st.time_input("Finish Time", key=f"meeting_finish_{teacher_id}",
+                                    help="Set the meeting's end time.")
 
         if st.button("Request Meeting"):
+            st.session_state.pop("meeting_suggestions", None)
             if not meeting_subject or not meeting_location:
                 st.warning("Please provide both subject and location for the meeting.")
                 return
@@ -119,56 +379,263 @@ def request_meeting_with_teacher(teacher):
                 st.warning("Finish time must be after start time.")
                 return
 
-            # Build the meeting payload
-            meeting_data = {
-                "location": meeting_location,
-                "start_time": start_time.isoformat(),
-                "finish_time": finish_time.isoformat(),
-                "subject": meeting_subject,
-                "people": [
-                    {"id": teacher['id'], "role": "Teacher", "name": teacher.get('name', 'N/A')},
-                    {"id": st.session_state.get("user_id"), "role": "Student",
-                     "name": st.session_state.get("user_name")}
-                ],
-                "attached_files": []  # Optional, leave empty for now
-            }
-
-            # Send the meeting request to the `/meetings/` endpoint
-            response = send_data("/meetings/", meeting_data)
-            if response:
-                logger.info(f"Meeting created successfully: {response}")
-                st.success("Meeting successfully created!")
+            # Check the slot against the teacher's availability and both participants' meetings
+            start_dt = datetime.combine(meeting_date, start_time)
+            finish_dt = datetime.combine(meeting_date, finish_time)
+            check = check_meeting_slot(teacher, start_dt, finish_dt)
+            if not check.ok:
+                for problem in check.problems:
+                    st.error(problem)
+                st.session_state.meeting_suggestions = (teacher_id, check.suggestions)
+                if not check.suggestions:
+                    st.info("No free slot of that length was found in the teacher's availability.")
             else:
-                logger.error(f"Failed to create meeting: {meeting_data}")
-                st.error("Failed to create the meeting. Please try again.")
+                # Build the meeting payload
+                meeting_data = {
+                    "location": meeting_location,
+                    "start_time": start_dt.isoformat(),
+                    "finish_time": finish_dt.isoformat(),
+                    "subject": meeting_subject,
+                    "people": [
+                        {"id": teacher['id'], "role": "Teacher", "name": teacher.get('name', 'N/A')},
+                        {"id": st.session_state.get("user_id"), "role": "Student",
+                         "name": st.session_state.get("user_name")}
+                    ],
+                    "attached_files": []  # Optional, leave empty for now
+                }
+
+                # Send the meeting request to the `/meetings/` endpoint
+                response = send_data("/meetings/", meeting_data)
+                if response:
+                    created = decode_payload("/meetings/", response) if isinstance(response, dict) else None
+                    if created is not None:
+                        get_meeting_store(st.session_state.get("user_id")).upsert(created)
+                    logger.info("Meeting created successfully: %s",
+                                response.get("id") if isinstance(response, dict) else response)
+                    st.success("Meeting successfully created!")
+                else:
+                    logger.error("Failed to create meeting with teacher %s", teacher.get("id"),
+                                 extra=fields(meeting=meeting_data))
+                    st.error("Failed to create the meeting. Please try again.")
+
+        for_teacher, suggestions = st.session_state.get("meeting_suggestions") or (None, None)
+        if suggestions and for_teacher == teacher_id:
+            st.markdown("**Nearest free slots:**")
+            for i, (start, end) in enumerate(suggestions):
+                st.button(f"Use {format_epoch(start, '%A, %B %d, %Y %I:%M %p')} → {format_epoch(end, '%I:%M %p')}",
+                          key=f"use_slot_{teacher_id}_{i}", on_click=use_suggested_slot, args=(teacher_id, start, end))
     except Exception as e:
-        logger.exception(f"Error requesting meeting with teacher {teacher.get('id')}: {e}")
+        logger.exception("Error requesting meeting with teacher %s: %s", teacher.get('id'), e)
         st.error("An unexpected error occurred. Please try again.")
 
 
-def get_my_meetings(user_id):  #
+def check_meeting_slot(teacher, start, finish):
+    """
+    Validate a requested slot with the scheduling engine.
+
+    Uses the teacher's availability and meetings and the student's own
+    meetings (from this session's meeting store).
+
+    Returns:
+        scheduling.SlotCheck: Problems with the slot, and the nearest valid slots if any.
+    """
+    user_id = st.session_state.get("user_id")
+    teacher_meetings = fetch_data(f"/meetings/user/{teacher['id']}")
+    available = parsed_availability(teacher).intervals()
+    weekly = getattr(teacher, "weekly", None)
+    if weekly:
+        # Expand the recurring schedule only for the weeks around the request (suggestions come from there too)
+        window = timedelta(days=14)
+        available += [(to_epoch(s), to_epoch(e)) for s, e in weekly.expand(start - window, start + 2 * window)]
+    teacher_timeline = timeline_for(available,
+                                    teacher_meetings if isinstance(teacher_meetings, list) else [],
+                                    person_id=teacher['id'])
+    student_timeline = timeline_for(None, get_meeting_store(user_id).for_participant(user_id))
+    return check_slot(start, finish, teacher_timeline, student_timeline, not_before=datetime.now())
+
+
+def use_suggested_slot(teacher_id, start, end):
+    """Button callback: put a suggested slot into the inputs of the meeting request with `teacher_id`."""
+    st.session_state[f"meeting_date_{teacher_id}"] = from_epoch(start).date()
+    st.session_state[f"meeting_start_{teacher_id}"] = from_epoch(start).time()
+    st.session_state[f"meeting_finish_{teacher_id}"] = from_epoch(end).time()
+    st.session_state.pop("meeting_suggestions", None)
+
+
+def weekly_schedule_editor(template, key):
+    """
+    Render controls for a recurring weekly schedule and apply the edits to `template` in place.
+
+    Args:
+        template (weekly_template.WeeklyTemplate): The schedule being edited.
+        key (str): Prefix for the widget keys, so several editors can coexist.
+    """
+    days = st.multiselect("Days", WEEKDAYS, key=f"{key}_days")
+    col_from, col_to = st.columns(2)
+    with col_from:
+        start = st.time_input("From", value=time(9), key=f"{key}_from")
+    with col_to:
+        end = st.time_input("To", value=time(17), key=f"{key}_to", help="A time before 'From' runs past midnight.")
+    if st.button("➕ Add Weekly Slot", key=f"{key}_add"):
+        if not days:
+            st.warning("Pick at least one day.")
+        elif start == end:
+            st.warning("The slot must not start and end at the same time.")
+        else:
+            for day in days:
+                template.add(WEEKDAYS.index(day), start, end)
+
+    # Removals run as callbacks, before the list below is drawn
+    for weekday, day_name in enumerate(WEEKDAYS):
+        for i, (slot_start, slot_end) in enumerate(template.weekly_ranges(weekday)):
+            col_slot, col_remove = st.columns([5, 1])
+            with col_slot:
+                st.write(f"**{day_name}** {slot_start:%H:%M} → {slot_end:%H:%M}")
+            with col_remove:
+                st.button("❌", key=f"{key}_remove_{weekday}_{i}", on_click=template.remove,
+                          args=(weekday, slot_start, slot_end))
+
+    day_off = st.date_input("Day off", key=f"{key}_day_off", help="Not available on this date, whatever the week says.")
+    if st.button("🚫 Mark Day Off", key=f"{key}_add_day_off"):
+        template.set_exception(day_off)
+    for day, bits in sorted(template.exceptions.items()):
+        col_day, col_remove = st.columns([5, 1])
+        with col_day:
+            st.write(f"**{day:%A, %d %B %Y}**: {'day off' if not bits else 'custom hours'}")
+        with col_remove:
+            st.button("❌", key=f"{key}_remove_{day.isoformat()}", on_click=template.clear_exception, args=(day,))
+
+
+def get_meeting_store(user_id):
+    """
+    Return this session's meeting store, loading the user's meetings on first use.
+
+    After the initial load the store is kept current by the app's own writes
+    (meeting requests and Approve/Cancel actions) instead of being re-fetched.
+    If the load fails, an empty store is returned for this run only and the
+    next run tries again.
+    """
+    store = st.session_state.get("meeting_store")
+    if store is None or st.session_state.get("meeting_store_user") != user_id:
+        endpoint = f"/meetings/user/{user_id}"
+        meetings = fetch_data(endpoint)
+        # fetch_data answers [] on errors as well; only a listing it cached came from the backend
+        loaded, cached = get_response_cache().peek(make_key(endpoint, None, st.session_state.get('token', '')))
+        if not isinstance(meetings, list) or not loaded or cached is not meetings:
+            return MeetingStore([])
+        store = MeetingStore(meetings)
+        st.session_state.meeting_store = store
+        st.session_state.meeting_store_user = user_id
+    return store
+
+
+def get_my_meetings(user_id, status=None):  #
     try:
-        logger.info(f"Fetching meetings for user ID: {user_id}")
+        logger.info("Fetching meetings for user ID: %s", user_id)
         if not user_id:
             logger.error("User ID is None. Cannot fetch meetings.")
             st.error("Please log in to view your meetings.")
             return []
 
-        endpoint = f"/meetings/user/{user_id}"  # we dont have the endpoint we want to get all meeting and go over
-        # them and append the relevant meetings.
-        meetings = fetch_data(endpoint)
+        meetings = get_meeting_store(user_id).for_participant(user_id, status=status)
         if meetings:
-            logger.info(f"Retrieved {len(meetings)} meetings for user {user_id}")
+            logger.info("Retrieved %s meetings for user %s", len(meetings), user_id)
             return meetings
         else:
-            logger.info(f"No meetings found for user {user_id}")
+            logger.info("No meetings found for user %s", user_id)
             return []
     except Exception as e:
-        logger.exception(f"Error fetching meetings for user {user_id}: {e}")
+        logger.exception("Error fetching meetings for user %s: %s", user_id, e)
         st.error("Failed to load meetings. Please try again later.")
         return []
 
 
+def meeting_time(meeting):
+    """A meeting's time for display, e.g. "2030-01-06 08:00 – 09:00"; legacy time-only values as stored."""
+    start, finish = meeting.start, meeting.finish
+    if start is None or finish is None:
+        return " – ".join(filter(None, (meeting.get("start_time"), meeting.get("finish_time")))) or "N/A"
+    end_format = "%H:%M" if finish.date() == start.date() else "%Y-%m-%d %H:%M"
+    return f"{start:%Y-%m-%d %H:%M} – {finish.strftime(end_format)}"
+
+
+def meeting_pages(endpoint, token):
+    """
+    A `fetch_page(skip, limit)` for meeting_export.iter_paged over `endpoint`.
+
+    Pages go straight to the API and are not cached: exports can be far
+    larger than the session cache, and it runs off the script thread. They
+    are returned undecoded, so iter_paged sees how many rows the backend
+    sent; pass `decode=Meeting.decode_many` to it.
+    """
+    def fetch_page(skip, limit):
+        response = api_client.get(endpoint, headers={"Authorization": f"Bearer {token}"},
+                                  params={"skip": skip, "limit": limit})
+        response.raise_for_status()
+        page = response.json()
+        if type(page) is not list:
+            raise ValidationError(f"expected a list of meetings from {endpoint}, got {type(page).__name__}")
+        return page
+
+    return fetch_page
+
+
+def export_file(chunks):
+    """
+    Stream export text into an anonymous temporary file for st.download_button.
+
+    Runs when the button is clicked, on Streamlit's download thread, so it
+    must not call Streamlit.
+    """
+    file = tempfile.TemporaryFile(buffering=0)  # unbuffered: a raw file st.download_button accepts
+    try:
+        size = write_export(chunks, file)
+    except Exception:
+        logger.exception("Meeting export failed")
+        file.close()
+        raise
+    logger.info("Exported %s bytes of meetings", size)
+    file.seek(0)
+    return file
+
+
+def is_admin(user_id):
+    """Whether the user has ADMIN_ROLE; False when logged out or the user can't be loaded."""
+    if not user_id:
+        return False
+    user = get_user_data(user_id)
+    return ADMIN_ROLE in ((user.get("roles") if user else None) or [])
+
+
+def meeting_export_buttons(user_id, key):
+    """
+    CSV and iCalendar downloads of the user's meetings; users with ADMIN_ROLE can export everyone's.
+
+    The file is only generated when a button is clicked, paging through the API.
+    """
+    everyone = is_admin(user_id) and st.checkbox("Export all meetings", key=f"{key}_all")
+    endpoint = "/meetings/" if everyone else f"/meetings/user/{user_id}"
+    name = "all_meetings" if everyone else "my_meetings"
+    token = st.session_state.get("token", "")
+
+    def meetings():
+        return iter_paged(meeting_pages(endpoint, token), decode=Meeting.decode_many)
+
+    def csv_file():
+        return export_file(meetings_csv(meetings()))
+
+    def ics_file():
+        return export_file(meetings_ics(meetings()))
+
+    col_csv, col_ics = st.columns(2)
+    with col_csv:
+        st.download_button("⬇️ Download CSV", data=csv_file, file_name=f"{name}.csv", mime="text/csv",
+                           key=f"{key}_csv", on_click="ignore")
+    with col_ics:
+        st.download_button("📅 Add to calendar (.ics)", data=ics_file, file_name=f"{name}.ics",
+                           mime="text/calendar", key=f"{key}_ics", on_click="ignore")
+
+
 def update_profile(about_section):
     """Updates the user's profile."""
     user_id = st.session_state.get("user_id")
@@ -181,24 +648,17 @@ def update_profile(about_section):
     endpoint = f"/users/{user_id}"
     response = send_data(endpoint, payload, method="PUT")
     if response:
-        logger.info(f"Profile updated successfully for user {user_id}")
+        logger.info("Profile updated successfully for user %s", user_id)
         st.success("Profile updated successfully!")
     else:
-        logger.error(f"Failed to update profile for user {user_id}")
+        logger.error("Failed to update profile for user %s", user_id)
         st.error("Failed to update profilee. Please try again.")
 
 
 def fetch_user_meetings(user_id):
-    """Fetch and filter meetings where the user is a participant."""
+    """Return meetings where the user is a participant, served from the participant index."""
     try:
-        response = fetch_data("/meetings/")  # Fetch all meetings
-        if not response or not isinstance(response, list):
-            st.error("Failed to fetch meetings or no meetings found.")
-            return []
-
-        # Filter meetings where user_id is in the 'people' list
-        user_meetings = [meeting for meeting in response if user_id in meeting.get("people", [])]
-        return user_meetings
+        return get_meeting_store(user_id).for_participant(user_id)
     except Exception as e:
         st.error(f"An error occurred while fetching meetings: {e}")
         return []
@@ -212,7 +672,7 @@ def get_user_data(user_id):
         user_id (str): The ID of the user to fetch.
 
     Returns:
-        dict: User data on successful fetch, or None on failure.
+        User: User record on successful fetch, or None on failure.
     """
     if not user_id:
         logger.error("User ID is None. Cannot fetch user data.")
@@ -222,71 +682,103 @@ def get_user_data(user_id):
     try:
         # Construct the endpoint to fetch user data
         endpoint = f"/users/id/{user_id}"
-        logger.info(f"Fetching data for user ID: {user_id}")
+        logger.info("Fetching data for user ID: %s", user_id)
 
         # Make the API call
         user_data = fetch_data(endpoint)
 
         # Optionally, process or log the user data if needed
         if user_data:
-            logger.info(f"Retrieved data for user {user_id}: {user_data}")
+            logger.debug("Retrieved data for user %s", user_id, extra=fields(user=user_data))
         else:
-            logger.info(f"No data found for user {user_id}")
+            logger.info("No data found for user %s", user_id)
 
         return user_data
     except Exception as e:
-        logger.exception(f"Error fetching data for user {user_id}: {e}")
+        logger.exception("Error fetching data for user %s: %s", user_id, e)
         st.error("Failed to fetch user data. Please try again later.")
         return None
 
 
+def profile_from_listing(collection, user_id):
+    """
+    Look a profile up in an already-loaded full listing (e.g. "/teachers/").
+
+    Teachers come from the shared directory snapshot when it is current,
+    otherwise from a listing in this session's cache.
+
+    Returns:
+        tuple: (True, profile or None) if the listing is cached, otherwise (False, None).
+    """
+    if collection == "/teachers/":
+        snapshot = shared_directory.current()
+        if snapshot is not None:
+            return True, snapshot.by_id.get(user_id)
+
+    cache = get_response_cache()
+    token = st.session_state.get('token', '')
+    hit, listing = cache.peek(make_key(collection, None, token))
+    if not hit or not isinstance(listing, list):
+        return False, None
+
+    # The id map lives in the cache next to its listing, so it is evicted and invalidated with it
+    map_key = make_key(collection, {"index": "id"}, token)
+    hit, cached_map = cache.peek(map_key)
+    if not hit or cached_map[0] is not listing:
+        by_id = {profile.get("id"): profile for profile in listing}
+        cached_map = (listing, by_id)
+        cache.set(map_key, cached_map, size=sys.getsizeof(by_id))  # the profiles belong to the listing
+    return True, cached_map[1].get(user_id)
+
+
 def check_existing_profile(profile_type):
-    """Check if a profile already exists for the user by fetching all profiles of the given type and checking for user ID."""
+    """Check if a profile already exists for the user with a keyed lookup (misses are cached briefly)."""
     if profile_type == "Student":
-        endpoint = "/students/"
+        collection = "/students/"
     elif profile_type == "Teacher":
-        endpoint = "/teachers/"
+        collection = "/teachers/"
     else:
         raise ValueError("Invalid profile type specified")
 
-    all_profiles = fetch_data(endpoint)
-    print("Fetched profiles:", all_profiles)  # Debug output to see what is fetched
-
-    if not all_profiles:  # Checks if list is empty or None
-        st.error("No profiles found or failed to fetch profiles.")
-        return None
-
     user_id = st.session_state.get('user_id')  # Safely get the user_id with a fallback
     if user_id is None:
         st.error("User ID not set in session state.")
         return None
 
-    for profile in all_profiles:
-        if profile.get("id") == user_id:
-            return profile  # Profile exists
-
-    return None  # No profile found
+    found, profile = profile_from_listing(collection, user_id)
+    if found:
+        return profile
+    return fetch_if_exists(f"{collection}{user_id}")
 
 
-def fetch_teacher(teacher_id: str) -> Optional[dict]:
+def fetch_teacher(teacher_id: str) -> Optional[Teacher]:
     data = fetch_data(f"/teachers/{teacher_id}")
-    return data if isinstance(data, dict) else None
+    return data if isinstance(data, Teacher) else None
+
+
+def fetch_student(student_id: str) -> Optional[Student]:
+    data = fetch_data(f"/students/{student_id}")
+    return data if isinstance(data, Student) else None
 
 
 def validate_teacher_dict(data: dict) -> Optional[dict]:
     """
     Lightweight frontend validation for teacher data.
 
+    Checks the field types against the Teacher model, and that the fields a
+    full teacher profile needs are present.
+
     Returns:
         dict if valid, otherwise None
     """
     required_keys = [
         "name", "email", "available", "subjects_to_teach", "meetings"
     ]
-    if not isinstance(data, dict):
+    try:
+        teacher = data if isinstance(data, Teacher) else Teacher.decode(data)
+    except ValidationError:
         return None
     for key in required_keys:
-        if key not in data:
+        if key not in teacher:
             return None
     return data
-
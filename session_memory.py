@@ -0,0 +1,206 @@
+"""
+Approximate memory accounting for session state and the API response caches.
+
+Each session's response cache keeps a running byte count of its entries, and
+every cache registers with a process-wide `CacheBudget`. When all caches
+together exceed the budget, the least recently used entries are evicted
+across sessions. Only cached API payloads are ever evicted; a session's own
+state (unsaved edits, widget values, tracked documents) is reported but never
+touched.
+"""
+import os
+import sys
+import threading
+import weakref
+
+# Process-wide cap on the bytes held by all sessions' response caches (0 = unlimited)
+RESPONSE_CACHE_BUDGET = int(float(os.getenv("RESPONSE_CACHE_BUDGET_MB", "512")) * 2 ** 20)
+# Collections longer than this are sized from an evenly spaced sample of their items
+SIZE_SAMPLE = 32
+
+_SCALARS = (str, bytes, int, float, bool, type(None))
+
+
+def _slot_names(cls):
+    slots = cls.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else slots
+
+
+def _children(item):
+    if isinstance(item, dict):
+        return [*item.keys(), *item.values()]
+    values = [getattr(item, name, None) for cls in type(item).__mro__ for name in _slot_names(cls)
+              if name not in ("__weakref__", "__dict__")]
+    if hasattr(item, "__dict__"):
+        values.append(vars(item))
+    return values
+
+
+def approx_size(obj, sample=SIZE_SAMPLE):
+    """
+    Approximate deep size of `obj` in bytes.
+
+    Objects reachable more than once are counted once. Long lists, tuples and
+    sets are sized from a sample of `sample` items, scaled to their length,
+    so sizing a large listing costs about as much as sizing a small one.
+    """
+    seen = set()
+    total = 0.0
+    stack = [(obj, 1.0)]
+    while stack:
+        item, weight = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += weight * sys.getsizeof(item)
+        if isinstance(item, _SCALARS):
+            continue
+        if isinstance(item, (list, tuple, set, frozenset)):
+            items = item if isinstance(item, (list, tuple)) else list(item)
+            if len(items) > sample:
+                step = len(items) / sample
+                weight *= step
+                items = [items[int(i * step)] for i in range(sample)]
+            stack.extend((child, weight) for child in items)
+        elif not callable(item) and not isinstance(item, type):
+            stack.extend((child, weight) for child in _children(item))
+    return int(total)
+
+
+class CacheBudget:
+    """
+    Shared byte budget for many `ResponseCache` instances.
+
+    Caches register on creation and are dropped automatically once their
+    session is gone. `enforce` evicts the globally least recently used
+    entries until the registered caches fit in `max_bytes` again.
+    """
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_BUDGET):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._caches = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def register(self, cache):
+        with self._lock:
+            self._caches.add(cache)
+
+    def caches(self):
+        with self._lock:
+            return list(self._caches)
+
+    def total_bytes(self):
+        return sum(cache.bytes for cache in self.caches())
+
+    def enforce(self):
+        """Evict least recently used entries (across all caches) while over budget. Returns bytes freed."""
+        if not self.max_bytes:
+            return 0
+        freed = 0
+        with self._lock:
+            caches = list(self._caches)
+            total = sum(cache.bytes for cache in caches)
+            while total > self.max_bytes:
+                candidates = [(cache.oldest_use(), i) for i, cache in enumerate(caches)]
+                candidates = [(used, i) for used, i in candidates if used is not None]
+                if not candidates:
+                    break
+                _, i = min(candidates)
+                released = caches[i].evict_oldest()
+                freed += released
+                total -= released
+                self.evictions += 1
+        return freed
+
+
+# Budget shared by every session's response cache in this process
+cache_budget = CacheBudget()
+
+# Session id -> that session's SessionState, for process-wide reports. Streamlit wraps it in a
+# new SafeSessionState for every script run and drops the wrapper afterwards, so the state
+# itself is kept; sessions that have ended are pruned against the runtime.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _prune_sessions():
+    """Forget sessions the Streamlit runtime no longer has active (closed or disconnected)."""
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return
+    runtime = Runtime.instance()
+    with _sessions_lock:
+        for session_id in [s for s in _sessions if not runtime.is_active_session(s)]:
+            del _sessions[session_id]
+
+
+def track_session():
+    """Register the current session for `memory_report`; call once per script run."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with _sessions_lock:
+        _sessions[ctx.session_id] = getattr(ctx.session_state, "_state", ctx.session_state)
+    _prune_sessions()
+
+
+def session_usage(state):
+    """
+    Approximate bytes per session-state key.
+
+    Response caches report their own running count instead of being walked.
+
+    Args:
+        state: A session's state (st.session_state, or one registered by track_session).
+
+    Returns:
+        dict: {"total": bytes, "cache": bytes, "keys": {key: bytes}}, keys largest first.
+    """
+    items = state.filtered_state.items() if hasattr(state, "filtered_state") else state.items()
+    sizes, cache_bytes = {}, 0
+    for key, value in items:
+        if hasattr(value, "oldest_use"):
+            size = value.bytes
+            cache_bytes += size
+        else:
+            size = approx_size(value)
+        sizes[key] = size
+    keys = dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+    return {"total": sum(sizes.values()), "cache": cache_bytes, "keys": keys}
+
+
+def memory_report():
+    """
+    Approximate memory held by sessions and caches across the whole process.
+
+    Returns:
+        dict: Per-session usage (see `session_usage`), the response-cache total
+        and budget, the shared availability memo (whose records may also sit in
+        a cache) and the overall total.
+    """
+    from availability import memo_entries
+
+    _prune_sessions()
+    with _sessions_lock:
+        tracked = list(_sessions.items())
+    sessions = {}
+    for session_id, state in tracked:
+        try:
+            sessions[session_id] = session_usage(state)
+        except Exception:  # session torn down while being measured
+            continue
+    memo_bytes = approx_size(memo_entries())
+    state_total = sum(usage["total"] for usage in sessions.values())
+    return {
+        "sessions": sessions,
+        "session_bytes": state_total,
+        "cache_bytes": cache_budget.total_bytes(),
+        "cache_budget_bytes": cache_budget.max_bytes,
+        "cache_budget_evictions": cache_budget.evictions,
+        "availability_memo_bytes": memo_bytes,
+        "total_bytes": state_total + memo_bytes,
+    }
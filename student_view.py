@@ -2,6 +2,42 @@ from server_requests import *
 import streamlit as st
 from update_meeting import handle_meeting_actions
 from datetime import datetime
+from change_tracking import TrackedDocument
+from teacher_directory import fetch_teacher_page, prefetch_teacher_page
+from teacher_cards import render_teacher_window
+from weekly_template import WeeklyTemplate
+
+ALL_SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "Computer Science", "History", "Economics"]
+
+
+def render_directory_filters():
+    """Render the teacher directory filters and return them as a dict."""
+    with st.expander("🔎 Filter Teachers"):
+        subject = st.selectbox("Subject", ["Any"] + ALL_SUBJECTS, key="filter_subject")
+        max_rate = st.number_input("Max Hourly Rate (0 = any)", min_value=0, step=5, key="filter_max_rate")
+        min_rating = st.slider("Minimum Rating", 0.0, 5.0, 0.0, 0.5, key="filter_min_rating")
+        window_start = window_end = None
+        weekly_overlap = None
+        student = fetch_student(st.session_state.get("user_id")) if st.session_state.get("user_id") else None
+        weekly = student.weekly if student is not None else None
+        if weekly and st.checkbox("Only teachers whose weekly schedule overlaps mine", key="filter_weekly"):
+            weekly_overlap = weekly.bits
+        if st.checkbox("Only teachers free at this time", key="filter_window"):
+            day = st.date_input("Day", key="filter_day")
+            window_start = datetime.combine(day, st.time_input("From", key="filter_from"))
+            window_end = datetime.combine(day, st.time_input("To", key="filter_to"))
+            if window_end <= window_start:
+                st.warning("The window end must be after its start.")
+                window_start = window_end = None
+
+    return {
+        "subject": None if subject == "Any" else subject,
+        "max_rate": max_rate or None,
+        "min_rating": min_rating or None,
+        "available_from": window_start,
+        "available_to": window_end,
+        "weekly_overlap": weekly_overlap,
+    }
 
 
 def student_view():
@@ -15,65 +51,61 @@ def student_view():
     if choice == "Available Teachers":
         st.subheader("🧑‍🏫 Available Teachers")
 
+        query = st.text_input("Search teachers", placeholder="Name, subject or anything in their profile",
+                              key="directory_query")
+        filters = dict(render_directory_filters(), query=query.strip() or None)
+        sort_by = st.radio("Sort by", ["Recommended", "Listing order"], horizontal=True, key="directory_sort",
+                           disabled=bool(filters["query"]), help="Search results are ordered by relevance.")
+        order = "recommended" if sort_by == "Recommended" else None
+        if st.session_state.get("directory_filters") != filters or st.session_state.get("directory_order") != order:
+            st.session_state.directory_filters = filters
+            st.session_state.directory_order = order
+            st.session_state.directory_page = 0
+        page = st.session_state.get("directory_page", 0)
+
         try:
-            teachers = fetch_data("/teachers/")
+            teachers, has_next = fetch_teacher_page(filters, page, order=order)
+            if has_next:
+                prefetch_teacher_page(filters, page + 1, order=order)
+
+            teachers = [t for t in teachers if t.get("id") != st.session_state.get("user_id")]
             if teachers:
-                for teacher in teachers:
-                    if teacher.get("id") == st.session_state.get("user_id"):
-                        continue
-
-                    name = teacher.get("name", "N/A")
-                    email = teacher.get("email", "N/A")
-                    phone = teacher.get("phone", "N/A")
-                    rate = teacher.get("hourly_rate", "N/A")
-                    rating = teacher.get("rating", "N/A")
-                    subjects = ", ".join(teacher.get("subjects_to_teach", []))
-                    availability = teacher.get("available", [])
-
-                    availability_str = ""
-                    for interval in availability:
-                        try:
-                            start = datetime.fromisoformat(interval["start"]).strftime("%A, %B %d, %Y at %I:%M %p")
-                            end = datetime.fromisoformat(interval["end"]).strftime("%I:%M %p")
-                            availability_str += f"📅 {start} → {end}<br>"
-                        except:
-                            availability_str += f"{interval.get('start', '')} → {interval.get('end', '')}<br>"
-
-                    st.markdown(f"""
-                        <div style='background-color:#2c2f33; padding:15px; border-radius:10px; margin-bottom:20px; color:#f0f0f0'>
-                            <h4>👤 <strong>{name}</strong></h4>
-                            <p>📧 <strong>Email:</strong> {email}<br>
-                               📞 <strong>Phone:</strong> {phone}<br>
-                               💰 <strong>Hourly Rate:</strong> ${rate}<br>
-                               ⭐ <strong>Rating:</strong> {rating}/5<br>
-                               📘 <strong>Subjects:</strong> {subjects}<br>
-                               ⏱️ <strong>Availability:</strong><br>{availability_str}</p>
-                            <form action='#'>
-                                <button style='background-color:#4CAF50; color:white; border:none; padding:10px 15px; border-radius:5px; cursor:pointer'
-                                        onclick="document.getElementById('{teacher.get("id")}').click(); return false;">
-                                    Request Meeting with {name}
-                                </button>
-                            </form>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                    st.button(f"", key=teacher.get("id"), on_click=request_meeting_with_teacher, args=(teacher,))
+                requested = render_teacher_window(teachers)
+                if requested is not None:
+                    st.session_state.meeting_teacher = requested
             else:
                 st.info("No teachers found.")
+
+            if st.session_state.get("meeting_teacher"):
+                request_meeting_with_teacher(st.session_state.meeting_teacher)
+
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("⬅️ Previous", disabled=page == 0):
+                    st.session_state.directory_page = page - 1
+                    st.rerun()
+            with col_page:
+                st.write(f"Page {page + 1}")
+            with col_next:
+                if st.button("Next ➡️", disabled=not has_next):
+                    st.session_state.directory_page = page + 1
+                    st.rerun()
         except Exception as e:
             logger.exception("Error fetching teachers.")
             st.error("Failed to load teacher data. Please try again later.")
 
     elif choice == "My Meetings":
         st.subheader("Your Meetings")
+        meeting_export_buttons(st.session_state.user_id, key="student_export")
         try:
             student_meetings = get_my_meetings(st.session_state.user_id)
             if student_meetings:
                 for meeting in student_meetings:
-                    st.write(f"**Subject:** {meeting.get('topic', 'N/A')}")
-                    st.write(f"**Teacher:** {meeting.get('teacher_name', 'N/A')}")
-                    st.write(f"**Scheduled Time:** {meeting.get('scheduled_time', 'N/A')}")
-                    if st.button(f"Cancel Meeting: {meeting.get('topic')}", key=meeting.get('id')):
+                    st.write(f"**Subject:** {meeting.get('subject', 'N/A')}")
+                    st.write(f"**Teacher:** {participant_names(meeting, 'Teacher') or 'N/A'}")
+                    st.write(f"**Scheduled Time:** {meeting_time(meeting)}")
+                    st.write(f"**Status:** {meeting.get('status', 'Pending')}")
+                    if st.button(f"Cancel Meeting: {meeting.get('subject', 'N/A')}", key=meeting.get('id')):
                         handle_meeting_actions(meeting.get('id'), "Cancel")
                     st.write("---")
             else:
@@ -89,7 +121,7 @@ def student_view():
         user_id = st.session_state.get("user_id")
         #st.write("DEBUG user_id in session:", user_id)
         try:
-            existing_data = fetch_data(f"/students/{user_id}")
+            existing_data = fetch_student(user_id)
             if not existing_data:
                 st.error("Failed to load your profile.")
             else:
@@ -97,24 +129,33 @@ def student_view():
                 name = st.text_input("Full Name", value=existing_data.get("name", ""))
                 about_section = st.text_area("About Me", value=existing_data.get("about_section", ""))
                 phone = st.text_input("Phone Number", value=existing_data.get("phone", ""))
-                all_subjects = [
-
-                    "Math", "Physics", "Chemistry", "Biology",
-
-                    "English", "Computer Science", "History", "Economics"
-                ]
+                current_subjects = existing_data.get("subjects_interested_in_learning", [])
+                # Subjects are free text at sign-up; keep the student's own ones selectable
                 selected_subjects = st.multiselect(
-                    "Subjects Interested In", options=all_subjects,
-                    default=existing_data.get("subjects_interested_in_learning", []))
+                    "Subjects Interested In",
+                    options=ALL_SUBJECTS + [s for s in current_subjects if s not in ALL_SUBJECTS],
+                    default=current_subjects)
+
+                with st.expander("🔁 My Weekly Schedule"):
+                    if st.session_state.get("student_weekly_owner") != user_id:
+                        st.session_state.student_weekly = existing_data.weekly or WeeklyTemplate()
+                        st.session_state.student_weekly_owner = user_id
+                    weekly = st.session_state.student_weekly
+                    weekly_schedule_editor(weekly, key="student_weekly")
 
                 if st.button("Update Profile"):
                     try:
-                        updated_data = existing_data.copy()
-                        updated_data["name"] = name.strip()
-                        updated_data["about_section"] = about_section.strip()
-                        updated_data["phone"] = phone.strip()
-                        updated_data["subjects_interested_in_learning"] = selected_subjects
-                        response = send_data(f"/students/{user_id}", updated_data, method="PUT")
+                        # Send only the fields that differ from what was loaded
+                        tracked = TrackedDocument(f"/students/{user_id}", existing_data)
+                        changes = tracked.diff(
+                            name=name.strip(),
+                            about_section=about_section.strip(),
+                            phone=phone.strip(),
+                            subjects_interested_in_learning=selected_subjects,
+                            weekly_availability=(weekly.to_json() if weekly or existing_data.weekly_availability
+                                                 else None),
+                        )
+                        response = save_changes(tracked, changes)
                         if response:
                             st.success("Profile updated successfully!")
                         else:
@@ -131,7 +172,7 @@ def student_view():
 
         try:
             user_id = st.session_state.get("user_id")
-            student_data = fetch_data(f"/students/{user_id}")
+            student_data = fetch_student(user_id)
 
             if student_data:
                 st.markdown("### 👤 Personal Information")
@@ -147,23 +188,12 @@ def student_view():
                 st.write(", ".join(subjects) if subjects else "_None listed._")
 
                 st.markdown("### 🕒 Availability")
-                availability = student_data.get("available", [])
+                availability = student_data.availability.formatted()
                 if availability:
-                    for i, interval in enumerate(availability):
-                        try:
-                            start_dt = datetime.fromisoformat(interval.get("start", ""))
-                            end_dt = datetime.fromisoformat(interval.get("end", ""))
-                            start_str = start_dt.strftime("%A, %B %d, %Y at %I:%M %p")
-                            end_str = end_dt.strftime("%A, %B %d, %Y at %I:%M %p")
-
-                            html = (
-                                f"<span style='color:gold'><strong>From:</strong></span> {start_str} → "
-                                f"<span style='color:gold'><strong>To:</strong></span> {end_str}"
-                            )
-                            st.markdown(f"{i + 1}. {html}", unsafe_allow_html=True)
-                        except Exception as e:
-                            st.write(
-                                f"{i + 1}. **From:** {interval.get('start', 'N/A')} → **To:** {interval.get('end', 'N/A')}")
+                    st.markdown("<br>".join(
+                        f"{i + 1}. <span style='color:gold'><strong>From:</strong></span> {start_str} → "
+                        f"<span style='color:gold'><strong>To:</strong></span> {end_str}"
+                        for i, (start_str, end_str) in enumerate(availability)), unsafe_allow_html=True)
                 else:
                     st.write("_No availability set._")
 
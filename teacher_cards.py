@@ -0,0 +1,76 @@
+"""
+Batched rendering of teacher directory cards.
+
+Only the visible window of cards is rendered, as one HTML blob, so render
+time and websocket payload no longer grow with the size of the directory.
+Availability is only formatted for cards the student expanded.
+"""
+from html import escape
+
+import streamlit as st
+
+from availability import CARD_FORMAT, parsed_availability
+
+CARD_STYLE = "background-color:#2c2f33; padding:15px; border-radius:10px; margin-bottom:20px; color:#f0f0f0"
+
+
+def availability_html(teacher):
+    return "".join(f"📅 {escape(start)} → {escape(end)}<br>"
+                   for start, end in parsed_availability(teacher).formatted(CARD_FORMAT))
+
+
+def card_html(teacher, expanded=False):
+    """HTML for one teacher card; availability is summarized unless the card is expanded."""
+    available = teacher.get("available") or []
+    if expanded:
+        availability = availability_html(teacher) or "<em>No availability set.</em>"
+    else:
+        availability = f"<em>{len(available)} time slot{'' if len(available) == 1 else 's'}</em>"
+    return (
+        f"<div style='{CARD_STYLE}'>"
+        f"<h4>👤 <strong>{escape(str(teacher.get('name', 'N/A')))}</strong></h4>"
+        f"<p>📧 <strong>Email:</strong> {escape(str(teacher.get('email', 'N/A')))}<br>"
+        f"📞 <strong>Phone:</strong> {escape(str(teacher.get('phone', 'N/A')))}<br>"
+        f"💰 <strong>Hourly Rate:</strong> ${escape(str(teacher.get('hourly_rate', 'N/A')))}<br>"
+        f"⭐ <strong>Rating:</strong> {escape(str(teacher.get('rating', 'N/A')))}/5<br>"
+        f"📘 <strong>Subjects:</strong> {escape(', '.join(teacher.get('subjects_to_teach', [])))}<br>"
+        f"⏱️ <strong>Availability:</strong><br>{availability}</p>"
+        f"</div>"
+    )
+
+
+def cards_html(teachers, expanded_ids=frozenset()):
+    """One HTML blob for a window of teacher cards."""
+    return "".join(card_html(teacher, teacher.get("id") in expanded_ids) for teacher in teachers)
+
+
+def render_teacher_window(teachers):
+    """
+    Render a window of teacher cards as a single element, with window-sized controls above it.
+
+    Args:
+        teachers (list): The teachers in the visible window.
+
+    Returns:
+        dict or None: The teacher a meeting was requested with on this run, if any.
+    """
+    by_id = {teacher.get("id"): teacher for teacher in teachers}
+    names = {teacher_id: teacher.get("name", "N/A") for teacher_id, teacher in by_id.items()}
+    expanded = st.session_state.setdefault("expanded_teachers", set())
+    requested = None
+
+    col_expand, col_request = st.columns(2)
+    with col_expand:
+        shown = st.multiselect("Show availability for", options=list(by_id), format_func=names.get,
+                               default=[teacher_id for teacher_id in by_id if teacher_id in expanded])
+        # Keep expansions made on other pages; update only the ones visible here
+        expanded = (expanded - set(by_id)) | set(shown)
+        st.session_state.expanded_teachers = expanded
+    with col_request:
+        chosen = st.selectbox("Request a meeting with", options=list(by_id), format_func=names.get,
+                              key="request_teacher_choice")
+        if st.button("📅 Request Meeting", key="request_meeting_open") and chosen in by_id:
+            requested = by_id[chosen]
+
+    st.markdown(cards_html(teachers, expanded), unsafe_allow_html=True)
+    return requested
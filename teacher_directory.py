@@ -0,0 +1,220 @@
+from datetime import datetime
+from server_requests import *
+from availability_index import AvailabilityIndex, shared_index
+from directory_snapshot import DirectorySnapshot
+from recommendations import TeacherFeatures, snapshot_features
+from teacher_search import TeacherSearchIndex, shared_search_index
+
+DIRECTORY_PAGE_SIZE = int(os.getenv("DIRECTORY_PAGE_SIZE", "20"))
+# Serve the directory from the process-wide snapshot (see directory_snapshot.py)
+DIRECTORY_SNAPSHOT = os.getenv("DIRECTORY_SNAPSHOT", "1").lower() in ("1", "true", "yes")
+# Seconds a session waits for the very first snapshot load before falling back to its own requests
+DIRECTORY_LOAD_TIMEOUT = float(os.getenv("DIRECTORY_LOAD_TIMEOUT", "10"))
+# Filters the backend has no parameter for; matches_filters and filter_teachers apply them client-side
+CLIENT_SIDE_FILTERS = frozenset({"weekly_overlap", "query"})
+
+
+def directory_params(filters, page, page_size=DIRECTORY_PAGE_SIZE):
+    """
+    Build the query parameters for one page of the teacher directory.
+
+    Args:
+        filters (dict): Any of "subject", "max_rate", "min_rating", "available_from", "available_to",
+            "weekly_overlap", "query".
+        page (int): Zero-based page number.
+        page_size (int): Number of teachers per page.
+
+    Returns:
+        dict: Query parameters; unset filters are omitted. One extra row is
+        requested so the caller can tell whether a next page exists.
+    """
+    params = {"skip": page * page_size, "limit": page_size + 1}
+    for key, value in filters.items():
+        if value is None or value == "" or key in CLIENT_SIDE_FILTERS:
+            continue
+        params[key] = value.isoformat() if isinstance(value, datetime) else value
+    return params
+
+
+def _covers_window(teacher, window_start, window_end):
+    for interval in teacher.get("available", []):
+        try:
+            if (datetime.fromisoformat(interval["start"]) <= window_start
+                    and datetime.fromisoformat(interval["end"]) >= window_end):
+                return True
+        except (KeyError, TypeError, ValueError):
+            continue
+    return False
+
+
+def matches_filters(teacher, filters):
+    """Client-side equivalent of the directory query parameters (the text "query" is left to filter_teachers)."""
+    subject = filters.get("subject")
+    if subject and subject not in teacher.get("subjects_to_teach", []):
+        return False
+    max_rate = filters.get("max_rate")
+    if max_rate is not None and (teacher.get("hourly_rate") or 0) > max_rate:
+        return False
+    min_rating = filters.get("min_rating")
+    if min_rating is not None and (teacher.get("rating") or 0) < min_rating:
+        return False
+    window_start, window_end = filters.get("available_from"), filters.get("available_to")
+    if window_start and window_end and not _covers_window(teacher, window_start, window_end):
+        return False
+    weekly_overlap = filters.get("weekly_overlap")
+    if weekly_overlap:
+        # The student's weekly slots as a bitmap: one AND against the teacher's
+        weekly = getattr(teacher, "weekly", None)
+        if not weekly or not weekly.bits & weekly_overlap:
+            return False
+    return True
+
+
+# Index kinds filter_teachers uses: the process-wide instance and the type sessions build their own from
+_SHARED_INDEXES = {"search": shared_search_index, "availability": shared_index}
+_INDEX_TYPES = {"search": TeacherSearchIndex, "availability": AvailabilityIndex}
+
+
+def listing_index(kind, listing, shared=False):
+    """
+    The "search" or "availability" index to filter `listing` with.
+
+    With ``shared=True`` (the listing of a directory snapshot) this is the
+    process-wide index, which the snapshot's preparers keep in line with it.
+    Any other listing, such as a session's own `/teachers/` response, is
+    synced into an index of the session's own, so sessions never rewrite
+    each other's shared state. Syncing is a no-op while the listing object
+    stays the same, and only re-indexes changed teachers when it is refetched.
+    """
+    if shared:
+        return _SHARED_INDEXES[kind]()
+    indexes = st.session_state.setdefault("listing_indexes", {})
+    if kind not in indexes:
+        indexes[kind] = _INDEX_TYPES[kind]()
+    indexes[kind].sync(listing)
+    return indexes[kind]
+
+
+def filter_teachers(all_teachers, filters, shared=False):
+    """
+    All teachers matching the filters, in listing order; with a text "query", best match first.
+
+    Args:
+        all_teachers (list): A full teacher listing.
+        filters (dict): See directory_params.
+        shared (bool): Whether `all_teachers` is a directory snapshot's listing (see listing_index).
+    """
+    listing = all_teachers
+    window_start, window_end = filters.get("available_from"), filters.get("available_to")
+    if window_start and window_end:
+        # Narrow the scan with the interval index instead of parsing every teacher's availability
+        free_ids = listing_index("availability", listing, shared).teachers_free_between(window_start, window_end)
+        all_teachers = [t for t in all_teachers if t.get("id") in free_ids]
+        filters = dict(filters, available_from=None, available_to=None)
+    matching = [t for t in all_teachers if matches_filters(t, filters)]
+    query = filters.get("query")
+    if query:
+        results = listing_index("search", listing, shared).search(query, limit=None)
+        rank = {teacher_id: position for position, (teacher_id, _) in enumerate(results)}
+        matching = sorted((t for t in matching if t.get("id") in rank), key=lambda t: rank[t.get("id")])
+    return matching
+
+
+def recommended_order(teachers, listing):
+    """
+    Order `teachers` best first for the logged-in student (see recommendations.py).
+
+    Args:
+        teachers (list): The teachers to order, e.g. the ones matching the filters.
+        listing: The full directory they come from: a DirectorySnapshot, whose
+            features are built once and shared by every session, or a list.
+    """
+    student = fetch_student(st.session_state.get("user_id"))
+    if student is None or not teachers:
+        return teachers
+    if isinstance(listing, DirectorySnapshot):
+        features = snapshot_features(listing)
+    else:
+        cached = st.session_state.get("recommendation_features")
+        if cached is None or cached[0] is not listing:
+            cached = (listing, TeacherFeatures.build(listing))
+            st.session_state.recommendation_features = cached
+        features = cached[1]
+
+    # Scores depend on the student record, ordering on the teachers asked for; reuse both while unchanged
+    cached = st.session_state.get("recommendation_order")
+    if cached is None or cached[0] is not features or cached[1] is not student:
+        cached = (features, student, features.score(student), None, None)
+    if cached[3] is not teachers:
+        cached = cached[:3] + (teachers, features.order(cached[2], teachers))
+    st.session_state.recommendation_order = cached
+    return cached[4]
+
+
+def _repeats_first_page(teachers, filters, page, page_size):
+    """Whether a later page starts with the first page's first teacher, i.e. the backend ignored skip."""
+    if page == 0 or not teachers:
+        return False
+    first_page = fetch_data("/teachers/", params=directory_params(filters, 0, page_size))  # cached from page 0
+    return isinstance(first_page, list) and bool(first_page) and first_page[0].get("id") == teachers[0].get("id")
+
+
+def fetch_teacher_page(filters, page, page_size=DIRECTORY_PAGE_SIZE, order=None):
+    """
+    Fetch one page of teachers matching the filters.
+
+    Served from the process-wide directory snapshot when it is enabled and
+    loaded; sessions then share one listing and one set of filter results.
+    Otherwise asks the backend to filter and paginate. If the response shows
+    the parameters were ignored (more rows than requested, rows that don't
+    match, or a later page repeating the first), the session falls back to
+    filtering the cached full listing.
+
+    With ``order="recommended"`` the matching teachers are ranked for the
+    logged-in student, and with a "query" filter they are searched by text
+    and ordered by relevance instead; both need the full listing (never
+    server-side pages).
+
+    Returns:
+        tuple: (teachers on this page, whether a next page exists)
+    """
+    start = page * page_size
+    searching = bool(filters.get("query"))
+    recommended = order == "recommended" and not searching
+    if DIRECTORY_SNAPSHOT:
+        snapshot = shared_directory.get(timeout=DIRECTORY_LOAD_TIMEOUT)
+        if snapshot is not None:
+            key = tuple(sorted((name, value) for name, value in filters.items() if value is not None))
+            matching = snapshot.matching(key, lambda teachers: filter_teachers(teachers, filters, shared=True))
+            if recommended:
+                matching = recommended_order(matching, snapshot)
+            return matching[start:start + page_size], len(matching) > start + page_size
+
+    if recommended or searching:
+        listing = fetch_data("/teachers/") or []
+        matching = filter_teachers(listing, filters)
+        if recommended:
+            matching = recommended_order(matching, listing)
+        return matching[start:start + page_size], len(matching) > start + page_size
+
+    if st.session_state.get("directory_server_side", True):
+        teachers = fetch_data("/teachers/", params=directory_params(filters, page, page_size))
+        if not isinstance(teachers, list):
+            return [], False
+        if (len(teachers) <= page_size + 1 and all(matches_filters(t, filters) for t in teachers)
+                and not _repeats_first_page(teachers, filters, page, page_size)):
+            return teachers[:page_size], len(teachers) > page_size
+        logger.info("Backend ignored directory query parameters; filtering client-side.")
+        st.session_state.directory_server_side = False
+
+    matching = filter_teachers(fetch_data("/teachers/") or [], filters)
+    return matching[start:start + page_size], len(matching) > start + page_size
+
+
+def prefetch_teacher_page(filters, page, page_size=DIRECTORY_PAGE_SIZE, order=None):
+    """Warm the cache for a directory page in the background (no-op in client-side, snapshot, ranked and search modes)."""
+    if (order == "recommended" or filters.get("query")
+            or (DIRECTORY_SNAPSHOT and shared_directory.current() is not None)):
+        return
+    if st.session_state.get("directory_server_side", True):
+        prefetch("/teachers/", params=directory_params(filters, page, page_size))
@@ -0,0 +1,439 @@
+"""
+Full-text search over the teacher directory.
+
+An inverted index maps every token of a teacher's name, subjects and about
+section to the teachers containing it, with field-weighted term frequencies
+for BM25 scoring. Query words not in the index also match terms one typo
+away (found through a map of single-character deletions, so no scan of the
+vocabulary is needed), and the last word, which may be half typed, matches
+the terms it is a prefix of. Teachers are added,
+replaced or removed one at a time when their profile changes; `sync` does
+the same against a full listing, touching only teachers that changed.
+
+Nothing here depends on Streamlit:
+
+    index = TeacherSearchIndex()
+    index.sync(teachers)
+    index.search("physcs tut", limit=10)   # -> [(teacher_id, score), ...]
+"""
+import bisect
+import gc
+import math
+import re
+import threading
+import unicodedata
+
+import numpy as np
+
+# Term-frequency weight of each field (BM25F-style)
+FIELD_WEIGHTS = {"name": 3.0, "subjects_to_teach": 2.0, "about_section": 1.0}
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Score multipliers for inexact matches
+PREFIX_WEIGHT = 0.7
+TYPO_WEIGHT = 0.5
+# Shortest query token expanded by prefix, and by one typo
+MIN_PREFIX_LENGTH = 2
+MIN_TYPO_LENGTH = 4
+# Most indexed terms one query token may expand to by prefix
+MAX_PREFIX_EXPANSIONS = 64
+# Relative drift in teacher count or average length after which cached term scores are recomputed
+STATS_TOLERANCE = 0.1
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercase word tokens with accents removed."""
+    if not text:
+        return []
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return _TOKEN.findall(text.lower())
+
+
+def _deletions(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a, b):
+    """True if `a` and `b` differ by at most one insertion, deletion, substitution or adjacent swap."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:] or (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2]
+                                          and a[i + 2:] == b[i + 2:])
+    return a[i + 1:] == b[i:] if la > lb else a[i:] == b[i + 1:]
+
+
+def _fingerprint(teacher):
+    return tuple(_field_text(teacher, field) for field in FIELD_WEIGHTS)
+
+
+def _field_text(teacher, field):
+    value = teacher.get(field)
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return value if isinstance(value, str) else ""
+
+
+class _TermScores:
+    """
+    One term's BM25 term-frequency part for every teacher that has it, as (rows, scores) arrays.
+
+    Index updates are queued and applied in one pass the next time the
+    arrays are read.
+    """
+
+    __slots__ = ("rows", "scores", "_pending", "_top")
+
+    def __init__(self, rows, scores):
+        self.rows = rows
+        self.scores = scores
+        self._pending = {}  # row -> new score, or None once the teacher no longer has the term
+        self._top = None    # (rows, scores) of the best postings, from `top`
+
+    def put(self, row, score):
+        self._pending[row] = score
+
+    def drop(self, row):
+        self._pending[row] = None
+
+    def arrays(self):
+        if self._pending:
+            changed = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+            keep = ~np.isin(self.rows, changed)
+            added = [(row, score) for row, score in self._pending.items() if score is not None]
+            self.rows = np.concatenate((self.rows[keep], np.array([row for row, _ in added], dtype=np.int64)))
+            self.scores = np.concatenate((self.scores[keep], np.array([score for _, score in added], dtype=float)))
+            self._pending.clear()
+            self._top = None
+        return self.rows, self.scores
+
+    def top(self, count):
+        """At least the `count` best (rows, scores), in no particular order."""
+        rows, scores = self.arrays()
+        if count >= len(rows):
+            return rows, scores
+        if self._top is None or len(self._top[0]) < count:
+            best = np.argpartition(-scores, count - 1)[:count]
+            self._top = (rows[best], scores[best])
+        return self._top
+
+
+class TeacherSearchIndex:
+    """
+    Inverted index over teachers' name, subjects and about section.
+
+    Every teacher keeps the row number it was first indexed under. Each
+    term's BM25 term-frequency scores are computed into arrays on first use
+    and patched as teachers change, so a query is a few array operations
+    over the rows of its terms. The average length the scores are
+    normalized by is only renewed once the teacher count or average length
+    drifts by more than STATS_TOLERANCE, which recomputes them lazily.
+
+    Thread-safe; one instance is shared by every session (see `shared_search_index`).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}     # term -> {row: weighted term frequency}
+        self._docs = {}         # row -> (fingerprint, {term: weighted tf}, weighted length)
+        self._rows = {}         # teacher id -> row
+        self._ids = []          # row -> teacher id
+        self._total_length = 0.0
+        self._terms = []        # sorted vocabulary, for prefix lookups
+        self._deletes = {}      # term with one character deleted -> {terms}
+        self._scored = {}       # term -> _TermScores
+        self._stats = None      # (teacher count, average length) when the cached scores were computed
+        self._source = None
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def replace_teacher(self, teacher):
+        """Index one teacher record, replacing what was indexed for its id (no-op if the text is unchanged)."""
+        teacher_id = teacher.get("id")
+        fingerprint = _fingerprint(teacher)
+        with self._lock:
+            row = self._rows.get(teacher_id)
+            if row is None:
+                row = self._rows[teacher_id] = len(self._ids)
+                self._ids.append(teacher_id)
+            else:
+                existing = self._docs.get(row)
+                if existing is not None and existing[0] == fingerprint:
+                    return
+                self._remove_row(row)
+            frequencies = {}
+            for weight, text in zip(FIELD_WEIGHTS.values(), fingerprint):
+                for token in tokenize(text):
+                    frequencies[token] = frequencies.get(token, 0.0) + weight
+            length = sum(frequencies.values())
+            self._docs[row] = (fingerprint, frequencies, length)
+            self._total_length += length
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._add_term(term)
+                postings[row] = frequency
+                entry = self._scored.get(term)
+                if entry is not None:
+                    entry.put(row, self._bm25(frequency, length))
+
+    def remove_teacher(self, teacher_id):
+        with self._lock:
+            row = self._rows.get(teacher_id)
+            if row is not None:
+                self._remove_row(row)
+
+    def _remove_row(self, row):
+        existing = self._docs.pop(row, None)
+        if existing is None:
+            return
+        self._total_length -= existing[2]
+        for term in existing[1]:
+            postings = self._postings[term]
+            del postings[row]
+            entry = self._scored.get(term)
+            if entry is not None:
+                entry.drop(row)
+            if not postings:
+                del self._postings[term]
+                self._drop_term(term)
+
+    def sync(self, teachers):
+        """
+        Bring the index in line with a full `/teachers/` listing.
+
+        Only teachers whose indexed text changed are re-indexed, and teachers
+        missing from the listing are removed. Syncing the same listing object
+        twice is a no-op.
+        """
+        with self._lock:
+            if teachers is self._source:
+                return
+            bulk = not self._docs
+            if bulk:
+                # Sort the vocabulary once at the end instead of inserting each new term, and skip the
+                # full GC passes the millions of new dicts and sets would otherwise trigger
+                self._terms = None
+                gc_was_enabled = gc.isenabled()
+                gc.disable()
+            try:
+                seen = set()
+                for teacher in teachers:
+                    seen.add(teacher.get("id"))
+                    self.replace_teacher(teacher)
+                for teacher_id, row in self._rows.items():
+                    if teacher_id not in seen:
+                        self._remove_row(row)
+            finally:
+                if bulk:
+                    self._terms = sorted(self._postings)
+                    if gc_was_enabled:
+                        gc.enable()
+            self._source = teachers
+
+    def _add_term(self, term):
+        if self._terms is not None:
+            bisect.insort(self._terms, term)
+        for variant in _deletions(term):
+            self._deletes.setdefault(variant, set()).add(term)
+
+    def _drop_term(self, term):
+        self._scored.pop(term, None)
+        if self._terms is not None:
+            del self._terms[bisect.bisect_left(self._terms, term)]
+        for variant in _deletions(term):
+            terms = self._deletes.get(variant)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[variant]
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+    def _bm25(self, frequency, length):
+        """The term-frequency part of BM25; the idf is applied per query."""
+        return frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / self._stats[1]))
+
+    def _idf(self, df):
+        return math.log(1 + (max(len(self._docs) - df, 0) + 0.5) / (df + 0.5))
+
+    def _refresh_stats(self):
+        count = len(self._docs)
+        average = self._total_length / count
+        if self._stats is not None:
+            old_count, old_average = self._stats
+            if (abs(count - old_count) <= STATS_TOLERANCE * old_count
+                    and abs(average - old_average) <= STATS_TOLERANCE * old_average):
+                return
+        self._stats = (count, average)
+        self._scored.clear()
+
+    def _term_scores(self, term):
+        entry = self._scored.get(term)
+        if entry is None:
+            postings = self._postings[term]
+            rows = np.fromiter(postings, dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=float, count=len(postings))
+            lengths = np.fromiter((self._docs[row][2] for row in postings), dtype=float, count=len(postings))
+            scores = frequencies * (K1 + 1) / (frequencies + K1 * (1 - B + B * lengths / self._stats[1]))
+            entry = self._scored[term] = _TermScores(rows, scores)
+        return entry
+
+    def _token_matches(self, token, prefix):
+        """
+        (weight, _TermScores) for each indexed term the query token matches; empty if none do.
+
+        The exact term is weighted by its own idf. Prefix and typo matches
+        share the idf of all the token's matches together, so a rare
+        completion (or misspelling) can't outrank the word that was typed.
+        """
+        expanded = self.expand(token, prefix)
+        if not expanded:
+            return []
+        shared_idf = self._idf(sum(len(self._postings[term]) for term in expanded))
+        return [(weight * (self._idf(len(self._postings[term])) if weight == 1.0 else shared_idf),
+                 self._term_scores(term))
+                for term, weight in expanded.items()]
+
+    def _dense(self, matches):
+        """One token's score per row (its best-matching term), 0 where it doesn't match."""
+        dense = np.zeros(len(self._ids))
+        arrays = [(weight, entry.arrays()) for weight, entry in matches]
+        if len(arrays) == 1:
+            weight, (rows, scores) = arrays[0]
+            dense[rows] = weight * scores
+        else:
+            np.maximum.at(dense, np.concatenate([rows for _, (rows, _) in arrays]),
+                          np.concatenate([weight * scores for weight, (_, scores) in arrays]))
+        return dense
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def expand(self, token, prefix=True):
+        """
+        Indexed terms a query token matches, with their weight.
+
+        A token that is itself indexed is taken as typed, without typo matches.
+
+        Args:
+            token (str): One token from `tokenize`.
+            prefix (bool): Also match the terms it starts (for the word still being typed).
+
+        Returns:
+            dict: term -> 1.0 for the exact term, PREFIX_WEIGHT for terms it
+            starts, TYPO_WEIGHT for terms one edit away.
+        """
+        with self._lock:
+            matches = {}
+            if len(token) >= MIN_TYPO_LENGTH and token not in self._postings:
+                candidates = set(self._deletes.get(token, ()))
+                for variant in _deletions(token):
+                    if variant in self._postings:
+                        candidates.add(variant)
+                    candidates.update(self._deletes.get(variant, ()))
+                for term in candidates:
+                    if _within_one_edit(token, term):
+                        matches[term] = TYPO_WEIGHT
+            if prefix and len(token) >= MIN_PREFIX_LENGTH:
+                i = bisect.bisect_left(self._terms, token)
+                for term in self._terms[i:i + MAX_PREFIX_EXPANSIONS]:
+                    if not term.startswith(token):
+                        break
+                    matches[term] = PREFIX_WEIGHT
+            if token in self._postings:
+                matches[token] = 1.0
+            return matches
+
+    def search(self, query, limit=20):
+        """
+        Teachers matching every token of `query`, best first.
+
+        Each query token scores a teacher by its best-matching term (exact,
+        one typo away or, for the last token, which may still be being typed,
+        a term it is the prefix of; weighted accordingly) with BM25; token
+        scores are summed.
+
+        Args:
+            query (str): Free text.
+            limit (int): Maximum results, or None for all.
+
+        Returns:
+            list: (teacher id, score) pairs; equal scores keep indexing order.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self._lock:
+            if not self._docs:
+                return []
+            self._refresh_stats()
+            per_token = []
+            for position, token in enumerate(tokens):
+                matches = self._token_matches(token, prefix=position == len(tokens) - 1)
+                if not matches:
+                    return []
+                per_token.append(matches)
+
+            if len(per_token) == 1 and (len(per_token[0]) == 1 or limit is not None):
+                # One token: rank its postings directly, without a row for every teacher. The
+                # best `limit` teachers overall are among the best `limit` of each term.
+                arrays = [(weight, entry.arrays() if limit is None else entry.top(limit))
+                          for weight, entry in per_token[0]]
+                rows = np.concatenate([rows for _, (rows, _) in arrays])
+                values = np.concatenate([weight * scores for weight, (_, scores) in arrays])
+                if len(arrays) > 1:
+                    # Keep each teacher's best term
+                    best = np.argsort(-values, kind="stable")
+                    _, first = np.unique(rows[best], return_index=True)
+                    rows, values = rows[best[first]], values[best[first]]
+            else:
+                total = self._dense(per_token[0])
+                matched = total > 0
+                for matches in per_token[1:]:
+                    dense = self._dense(matches)
+                    matched &= dense > 0
+                    total += dense
+                rows = np.flatnonzero(matched)
+                values = total[rows]
+
+            if limit is not None and limit < len(rows):
+                top = np.argpartition(-values, limit - 1)[:limit]
+                rows, values = rows[top], values[top]
+            order = np.lexsort((rows, -values))
+            ids = self._ids
+            return [(ids[row], score) for row, score in zip(rows[order].tolist(), values[order].tolist())]
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def shared_search_index():
+    """Process-wide search index shared by every session."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = TeacherSearchIndex()
+        return _shared_index
+
+
+def index_snapshot(snapshot):
+    """Bring the shared index in line with a directory snapshot (runs as a SharedDirectory preparer)."""
+    shared_search_index().sync(snapshot.teachers)
@@ -1,7 +1,13 @@
 from server_requests import *
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, timedelta
+from change_tracking import TrackedDocument
 from update_meeting import handle_meeting_actions
+from availability_index import shared_index
+from teacher_search import shared_search_index
+from availability import ParsedAvailability, format_epoch, normalize_availability
+from weekly_template import WEEKLY_HORIZON_DAYS, WeeklyTemplate
+from timing import timed
 
 
 def teacher_view():
@@ -11,24 +17,42 @@ def teacher_view():
     options = ["My Profile", "Edit Availability", "Edit Profile", "Manage Meetings"]
     choice = st.sidebar.radio("Menu", options)
 
-    # -------------------------
-    # Manage Meetings Section
-    # -------------------------
+    # Each section is a fragment: interacting with its widgets reruns only that
+    # section, not the header, sidebar and the rest of the dashboard.
     if choice == "Manage Meetings":
+        meeting_list()
+    elif choice == "Edit Availability":
+        availability_editor()
+    elif choice == "Edit Profile":
+        profile_editor()
+    elif choice == "My Profile":
+        profile_summary()
+
+
+# -------------------------
+# Manage Meetings Section
+# -------------------------
+@st.fragment
+def meeting_list():
+    with timed("fragment.meeting_list"):
         st.subheader("Your Meetings")
+        meeting_export_buttons(st.session_state.user_id, key="teacher_export")
+        status_filter = st.selectbox("Show", ["All", "Pending", "Approved", "Canceled"], key="meeting_status_filter")
         try:
-            teacher_meetings = get_my_meetings(st.session_state.user_id) or []
+            status = None if status_filter == "All" else status_filter
+            teacher_meetings = get_my_meetings(st.session_state.user_id, status=status) or []
             if teacher_meetings:
                 for meeting in teacher_meetings:
-                    st.write(f"**Subject:** {meeting.get('topic', 'N/A')}")
-                    st.write(f"**Student:** {meeting.get('student_name', 'N/A')}")
-                    st.write(f"**Scheduled Time:** {meeting.get('scheduled_time', 'N/A')}")
+                    st.write(f"**Subject:** {meeting.get('subject', 'N/A')}")
+                    st.write(f"**Student:** {participant_names(meeting, 'Student') or 'N/A'}")
+                    st.write(f"**Scheduled Time:** {meeting_time(meeting)}")
+                    st.write(f"**Status:** {meeting.get('status', 'Pending')}")
                     action = st.radio(
-                        f"Actions for {meeting.get('topic', 'Meeting')}",
+                        f"Actions for {meeting.get('subject', 'Meeting')}",
                         ["Approve", "Cancel"],
                         key=meeting.get('id', '')
                     )
-                    if st.button(f"{action} Meeting: {meeting.get('topic', 'N/A')}",
+                    if st.button(f"{action} Meeting: {meeting.get('subject', 'N/A')}",
                                  key=f"{action}_{meeting.get('id', '')}"):
                         handle_meeting_actions(meeting.get('id'), action)
                     st.write("---")
@@ -39,10 +63,13 @@ def teacher_view():
             logger.exception("Error loading meetings for teacher.")
             st.error("Failed to load meetings. Please try again later.")
 
-    # -------------------------
-    # Edit Availability Section
-    # -------------------------
-    elif choice == "Edit Availability":
+
+# -------------------------
+# Edit Availability Section
+# -------------------------
+@st.fragment
+def availability_editor():
+    with timed("fragment.availability_editor"):
         st.subheader("Edit Your Availability")
         st.markdown("Add available time slots below:")
 
@@ -58,18 +85,24 @@ def teacher_view():
 
         if "edit_availability" not in st.session_state:
             try:
-                teacher_data = fetch_data(f"/teachers/{st.session_state.user_id}")
-                if isinstance(teacher_data, dict):
-                    saved_avail = teacher_data.get("available", [])
+                endpoint = f"/teachers/{st.session_state.user_id}"
+                teacher_data = fetch_teacher(st.session_state.user_id)
+                if teacher_data is not None:
+                    weekly = teacher_data.weekly or WeeklyTemplate()
+                    # The saved list includes the expanded weekly schedule; only edit the one-off slots
+                    saved_avail = weekly.uncovered(teacher_data.get("available", []))
                 else:
                     st.warning("Unexpected response format for teacher data.")
-                    saved_avail = []
+                    teacher_data, saved_avail, weekly = {}, [], WeeklyTemplate()
+                # Remember what was loaded so Save only sends what changed
+                st.session_state.availability_doc = TrackedDocument(endpoint, teacher_data)
             except Exception as e:
                 saved_avail = []
                 st.error("Could not load saved availability.")
                 logger.exception("Failed to fetch existing availability.")
             else:
                 st.session_state.edit_availability = saved_avail
+                st.session_state.edit_weekly = weekly
 
         # Add interval
         if st.button("➕ Add Time Interval"):
@@ -85,11 +118,14 @@ def teacher_view():
         # --- Display current availability
         st.markdown("### 🕒 Current Availability:")
 
+        parsed = ParsedAvailability.parse(st.session_state.edit_availability)
         for i, interval in enumerate(st.session_state.edit_availability):
             try:
-                start = datetime.fromisoformat(interval.get('start'))
-                end = datetime.fromisoformat(interval.get('end'))
-                formatted = f"📅 {start.strftime('%A, %d %B %Y')}<br>⏰ {start.strftime('%H:%M')} → {end.strftime('%H:%M')}"
+                if not parsed.valid[i]:
+                    raise ValueError("unparseable interval")
+                start, end = int(parsed.starts[i]), int(parsed.ends[i])
+                formatted = (f"📅 {format_epoch(start, '%A, %d %B %Y')}<br>"
+                             f"⏰ {format_epoch(start, '%H:%M')} → {format_epoch(end, '%H:%M')}")
 
                 st.markdown(f"""
                 <div style='background-color:#2c2f33; padding:10px; border-radius:6px; margin-bottom:10px; color:#f0f0f0'>
@@ -99,34 +135,36 @@ def teacher_view():
 
                 if st.button(f"❌ Remove {i + 1}", key=f"remove_{i}"):
                     st.session_state.edit_availability.pop(i)
-                    st.rerun()
+                    st.rerun(scope="fragment")
 
             except Exception as e:
                 st.warning(f"Invalid interval: {interval}")
 
+        # --- Weekly schedule
+        st.markdown("### 🔁 Weekly Schedule")
+        weekly = st.session_state.setdefault("edit_weekly", WeeklyTemplate())
+        weekly_schedule_editor(weekly, key="weekly")
+
         # --- Save availability
         if st.button("💾 Save Availability"):
             try:
-                user_data = get_user_data(st.session_state.user_id)
-                if not user_data:
-                    st.error("Failed to fetch user data. Cannot update availability.")
-                    return
-
-                payload = {
-                    "name": user_data.get("name"),
-                    "phone": user_data.get("phone"),
-                    "email": user_data.get("email"),
-                    "about_section": user_data.get("about_section", ""),
-                    "available": st.session_state.edit_availability,
-                    "subjects_to_teach": user_data.get("subjects_to_teach", []),
-                    "hourly_rate": user_data.get("hourly_rate", 0),
-                    "meetings": user_data.get("meetings", []),
-                    "rating": user_data.get("rating", 0),
-                }
-
-                success = send_data(f"/teachers/{st.session_state.user_id}", payload, method="PUT")
+                tracked = st.session_state.get("availability_doc") or TrackedDocument(
+                    f"/teachers/{st.session_state.user_id}", {})
+                # Clients that only read `available` see the weekly schedule expanded for the next few weeks
+                now = datetime.now()
+                expanded = weekly.to_available(now, now + timedelta(days=WEEKLY_HORIZON_DAYS))
+                one_offs, report = normalize_availability(st.session_state.edit_availability, now=now)
+                available, _ = normalize_availability(one_offs + expanded, now=now)
+                had_weekly = tracked.original.get("weekly_availability") is not None
+                changes = tracked.diff(available=available,
+                                       weekly_availability=weekly.to_json() if weekly or had_weekly else None)
+                success = save_changes(tracked, changes)
 
                 if success:
+                    st.session_state.edit_availability = one_offs
+                    shared_index().replace_teacher(st.session_state.user_id, available)
+                    if report.changed:
+                        st.info(f"Availability tidied up: {report.summary()}.")
                     st.success("✅ Availability updated successfully!")
                 else:
                     st.error("❌ Failed to update availability.")
@@ -135,15 +173,18 @@ def teacher_view():
                 logger.exception("Error updating availability.")
                 st.error("An error occurred while updating availability.")
 
-    # -------------------------
-    # Edit Profile Section
-    # -------------------------
-    elif choice == "Edit Profile":
+
+# -------------------------
+# Edit Profile Section
+# -------------------------
+@st.fragment
+def profile_editor():
+    with timed("fragment.profile_editor"):
         st.subheader("🛠️ Edit Your Profile")
 
         try:
             user_id = st.session_state.user_id
-            existing_data = fetch_data(f"/teachers/{user_id}")
+            existing_data = fetch_teacher(user_id)
 
             if not existing_data:
                 st.error("Failed to load your profile.")
@@ -151,7 +192,7 @@ def teacher_view():
                 # Extract existing values with fallbacks
                 name = existing_data.get("name", "")
                 about = existing_data.get("about_section", "")
-                hourly_rate = existing_data.get("hourly_rate", 0.0)
+                hourly_rate = float(existing_data.get("hourly_rate") or 0.0)  # stored as int at sign-up
                 current_subjects = existing_data.get("subjects_to_teach", [])
                 phone = existing_data.get("phone", "")
 
@@ -162,19 +203,25 @@ def teacher_view():
                 updated_phone = st.text_input("Phone Number", value=phone)
                 all_subjects = ["Math", "Physics", "Chemistry", "Biology", "English",
                                 "Computer Science"]  # customize as needed
+                # Subjects are free text at sign-up; keep the teacher's own ones selectable
+                all_subjects += [s for s in current_subjects if s not in all_subjects]
                 updated_subjects = st.multiselect("Subjects to Teach", options=all_subjects, default=current_subjects)
 
                 if st.button("Update Profile"):
-                    # Update payload
-                    existing_data["name"] = updated_name.strip()
-                    existing_data["about_section"] = updated_about.strip()
-                    existing_data["hourly_rate"] = updated_rate
-                    existing_data["subjects_to_teach"] = updated_subjects
-                    existing_data["phone"] = updated_phone.strip()
-
-                    response = send_data(f"/teachers/{user_id}", existing_data, method="PUT")
+                    # Send only the fields that differ from what was loaded
+                    tracked = TrackedDocument(f"/teachers/{user_id}", existing_data)
+                    changes = tracked.diff(
+                        name=updated_name.strip(),
+                        about_section=updated_about.strip(),
+                        hourly_rate=updated_rate,
+                        subjects_to_teach=updated_subjects,
+                        phone=updated_phone.strip(),
+                    )
+                    response = save_changes(tracked, changes)
 
                     if response:
+                        # Searches see the new name, subjects and about section right away
+                        shared_search_index().replace_teacher(tracked.merged(changes))
                         st.success("Profile updated successfully!")
                     else:
                         st.error("Update failed. Try again.")
@@ -182,15 +229,18 @@ def teacher_view():
             st.error("An unexpected error occurred.")
             logger.exception("Teacher profile update failed.")
 
-    # -------------------------
-    # My Profile Section
-    # -------------------------
-    elif choice == "My Profile":
+
+# -------------------------
+# My Profile Section
+# -------------------------
+@st.fragment
+def profile_summary():
+    with timed("fragment.profile_summary"):
         st.subheader("📋 My Profile")
 
         try:
             user_id = st.session_state.get("user_id")
-            teacher_data = fetch_data(f"/teachers/{user_id}")
+            teacher_data = fetch_teacher(user_id)
 
             if teacher_data:
                 st.markdown("### 👤 Personal Information")
@@ -210,25 +260,12 @@ def teacher_view():
                 st.write(f"**Rating:** {teacher_data.get('rating', 'N/A')} / 5")
 
                 st.markdown("### 🕒 Availability")
-                availability = teacher_data.get("available", [])
+                availability = teacher_data.availability.formatted()
                 if availability:
-                    for i, interval in enumerate(availability):
-                        try:
-                            start_dt = datetime.fromisoformat(interval.get("start", ""))
-                            end_dt = datetime.fromisoformat(interval.get("end", ""))
-                            start_str = start_dt.strftime("%A, %B %d, %Y at %I:%M %p")
-                            end_str = end_dt.strftime("%A, %B %d, %Y at %I:%M %p")
-
-                            html = (
-                                f"<span style='color:gold'><strong>From:</strong></span> {start_str} → "
-                                f"<span style='color:gold'><strong>To:</strong></span> {end_str}"
-                            )
-                            st.markdown(f"{i + 1}. {html}<br>", unsafe_allow_html=True)
-
-
-                        except Exception as e:
-                            st.write(
-                                f"{i + 1}. **From:** {interval.get('start', 'N/A')} → **To:** {interval.get('end', 'N/A')}")
+                    st.markdown("<br>".join(
+                        f"{i + 1}. <span style='color:gold'><strong>From:</strong></span> {start_str} → "
+                        f"<span style='color:gold'><strong>To:</strong></span> {end_str}"
+                        for i, (start_str, end_str) in enumerate(availability)), unsafe_allow_html=True)
                 else:
                     st.write("_No availability set._")
 
@@ -0,0 +1,46 @@
+import logging
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from log_config import fields
+
+logger = logging.getLogger(__name__)
+
+
+def mark(name):
+    """Remember the current time under `name` (e.g. when the user clicked Submit)."""
+    st.session_state.setdefault("timing_marks", {})[name] = time.perf_counter()
+
+
+def record(name, elapsed_ms):
+    """Store the latest measurement for `name` in session state and log it."""
+    st.session_state.setdefault("timings", {})[name] = round(elapsed_ms, 2)
+    logger.info("timing %s: %.1f ms", name, elapsed_ms,
+                extra=fields(timing=name, ms=round(elapsed_ms, 2), high_volume=True))
+
+
+def record_since(mark_name, name=None):
+    """
+    Record the time elapsed since `mark(mark_name)`, then clear the mark.
+
+    Returns:
+        float or None: Elapsed milliseconds, or None if the mark was never set.
+    """
+    started = st.session_state.get("timing_marks", {}).pop(mark_name, None)
+    if started is None:
+        return None
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    record(name or mark_name, elapsed_ms)
+    return elapsed_ms
+
+
+@contextmanager
+def timed(name):
+    """Context manager recording how long the enclosed block took."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - started) * 1000)
@@ -1,3 +1,6 @@
+from server_requests import *
+
+
 def handle_meeting_actions(meeting_id, action):
     """
     Handle meeting actions like Cancel or Approve.
@@ -12,11 +15,12 @@ def handle_meeting_actions(meeting_id, action):
     try:
         status = "Approved" if action == "Approve" else "Canceled"
         if send_data(f"/meetings/{meeting_id}", {"status": status}, method="PUT"):
-            logger.info(f"Meeting {action}d: {meeting_id}")
+            get_meeting_store(st.session_state.get("user_id")).update_status(meeting_id, status)
+            logger.info("Meeting %sd: %s", action, meeting_id)
             st.success(f"Meeting {action}d successfully.")
         else:
-            logger.error(f"Failed to {action} meeting: {meeting_id}")
+            logger.error("Failed to %s meeting: %s", action, meeting_id)
             st.error(f"Failed to {action} the meeting.")
     except Exception as e:
-        logger.exception(f"Error performing action '{action}' for meeting {meeting_id}")
+        logger.exception("Error performing action '%s' for meeting %s", action, meeting_id)
         st.error(f"An error occurred while trying to {action} the meeting. Please try again.")
@@ -2,31 +2,45 @@ from login_register_logout import *
 from server_requests import *
 from student_view import student_view
 from teacher_view import teacher_view
+from availability_index import shared_index
+from teacher_search import shared_search_index
+from availability import normalize_availability
+from bootstrap import bootstrap_pending, start_bootstrap, wait_for_bootstrap
+from timing import mark, record_since, timed
+from metrics_panel import SHOW_API_METRICS, render_metrics_panel
+from session_memory import track_session
 import streamlit as st
 from datetime import datetime
-import time
+from collections.abc import Mapping
 
 
 def main():
-    # Initialize session state variables
-    if "user_id" not in st.session_state:
-        st.session_state.update({
-            "user_id": None,
-            "user_authenticated": False,
-            "profile_type": None,
-            "navigation": "auth",  # Controls navigation state
-        })
-
-    # Render header
-    render_header()
-
-    # Handle navigation dynamically
-    if st.session_state.navigation == "auth":
-        render_authentication_page()
-    elif st.session_state.navigation == "profile_creation":
-        render_profile_creation()
-    elif st.session_state.navigation == "main_app":
-        render_main_app()
+    with timed("script_run"):
+        track_session()
+        # Initialize session state variables
+        if "user_id" not in st.session_state:
+            st.session_state.update({
+                "user_id": None,
+                "user_authenticated": False,
+                "profile_type": None,
+                "navigation": "auth",  # Controls navigation state
+            })
+
+        # Render header
+        render_header()
+
+        # Handle navigation dynamically
+        if st.session_state.navigation == "auth":
+            render_authentication_page()
+        elif st.session_state.navigation == "profile_creation":
+            render_profile_creation()
+            record_since("login_submit", "time_to_interactive.profile_page")
+        elif st.session_state.navigation == "main_app":
+            render_main_app()
+
+        # Process-wide metrics and every session's memory: admins only
+        if SHOW_API_METRICS and st.session_state.user_authenticated and is_admin(st.session_state.user_id):
+            render_metrics_panel()
 
 
 def render_header():
@@ -59,10 +73,18 @@ def toggle_profile():
     st.success(f"Switched to {new_profile_type} profile!")
 
 
-def validate_and_convert_intervals(intervals):
-    """Ensure all time intervals are dictionaries with ISO 8601 'start' and 'end' strings."""
-    validated = []
+def validate_and_convert_intervals(intervals, with_report=False):
+    """
+    Ensure all time intervals are dictionaries with ISO 8601 'start' and 'end' strings.
 
+    The result is normalized: sorted, with duplicates removed, overlapping
+    intervals merged and past ones dropped (see `normalize_availability`).
+
+    Args:
+        intervals (list): Interval dicts with datetime or string values.
+        with_report (bool): Also return the NormalizationReport.
+    """
+    pairs = []
     for item in intervals:
         if not isinstance(item, dict):
             continue  # skip if not a dictionary
@@ -71,23 +93,18 @@ def validate_and_convert_intervals(intervals):
         end = item.get("end")
 
         if isinstance(start, datetime) and isinstance(end, datetime):
-            validated.append({
-                "start": start.isoformat(),
-                "end": end.isoformat()
-            })
+            pairs.append({"start": start.isoformat(), "end": end.isoformat()})
         elif isinstance(start, str) and isinstance(end, str):
-            try:
-                # Make sure the strings are valid ISO datetime strings
-                datetime.fromisoformat(start)
-                datetime.fromisoformat(end)
-                validated.append({
-                    "start": start,
-                    "end": end
-                })
-            except ValueError:
-                continue  # skip invalid string formats
+            pairs.append({"start": start, "end": end})
         # else: skip silently if data is malformed
-    return validated
+
+    # Invalid formats are dropped by the vectorized parse inside the normalization
+    normalized, report = normalize_availability(pairs, now=datetime.now())
+    report.received = len(intervals)
+    report.invalid += len(intervals) - len(pairs)
+    if report.changed:
+        logger.info("Normalized availability: %s", report.summary())
+    return (normalized, report) if with_report else normalized
 
 
 def create_profile(profile_type):
@@ -164,6 +181,7 @@ def render_authentication_page():
         username = st.text_input("Username", placeholder="Choose a username") if auth_action == "Register" else None
 
         if st.button("Submit"):
+            mark("login_submit")
             handle_auth(auth_action, email, password, full_name, username)
     else:
         st.success(f"Welcome back, {st.session_state.get('user_name', 'User')}!")
@@ -202,16 +220,18 @@ def update_session(user_profile):
     """Update session state with user information."""
     str_id = user_profile.get("user_id")
     st.session_state.user_id = str(str_id)
-    print(f"printing str_id :-> {str_id}")  # Outputs the string ID
+    logger.debug("Session user id: %s", str_id)
 
     # get user by id by calling the endpoint Request URL
     # https://project-privatetutor.onrender.com/users/id/676823f1e3603040e08723a3
     # now we update the fields
     st.session_state.user_authenticated = True
     st.session_state.profile_type = None  # Reset profile type
-    # Store additional information
-    user_data = get_user_data(st.session_state.user_id)
-    st.session_state.user_name = user_profile.get("name", "User")
+    # Start fetching user record, profiles and meetings concurrently; only the user record is awaited here,
+    # the profiles keep loading in the background while the app navigates to the profile page
+    start_bootstrap(st.session_state.user_id)
+    user_data = wait_for_bootstrap(["user"])["user"] or get_user_data(st.session_state.user_id) or {}
+    st.session_state.user_name = user_profile.get("name") or user_data.get("name", "User")
     st.session_state.user_email = user_data.get("email", "")
 
 
@@ -234,11 +254,22 @@ def display_profile(profile):
 
 def render_profile_creation():
     """Improved version: handles welcome spinner and role-based profile creation."""
-    with st.spinner(f"Welcome back, {st.session_state.get('user_name', 'User')}! Loading your profile..."):
-        time.sleep(2)
+    # Only block while the profile prefetch started at login is still in flight
+    if bootstrap_pending(["student_profile", "teacher_profile"]):
+        with st.spinner(f"Welcome back, {st.session_state.get('user_name', 'User')}! Loading your profile..."):
+            wait_for_bootstrap(["student_profile", "teacher_profile"])
+    if "existing_profiles" not in st.session_state:
+        results = wait_for_bootstrap(["student_profile", "teacher_profile"], deadline=0)
+        st.session_state.existing_profiles = [
+            profile_type for profile_type, key in (("Student", "student_profile"), ("Teacher", "teacher_profile"))
+            if isinstance(results.get(key), Mapping)
+        ]
 
     st.title("Create Your Profile")
-    profile_type = st.radio("Select Your Role", ["Student", "Teacher"], key="profile_type_selection")
+    existing_profiles = st.session_state.existing_profiles
+    default_role = 1 if existing_profiles == ["Teacher"] else 0
+    profile_type = st.radio("Select Your Role", ["Student", "Teacher"], index=default_role,
+                            key="profile_type_selection")
 
     # Check if the profile already exists
     existing_profile = check_existing_profile(profile_type)
@@ -320,7 +351,9 @@ def create_student_profile(id, name, phone, email, about_section, subjects_inter
     """Send a request to create a student profile."""
 
     # ✅ Validate intervals
-    validated_intervals = validate_and_convert_intervals(available_intervals)
+    validated_intervals, report = validate_and_convert_intervals(available_intervals, with_report=True)
+    if report.changed:
+        st.info(f"Availability tidied up: {report.summary()}.")
 
     payload = {
         "id": id,
@@ -344,7 +377,9 @@ def create_student_profile(id, name, phone, email, about_section, subjects_inter
 
 
 def create_teacher_profile(id, name, phone, email, about_section, subjects_to_teach, hourly_rate, available_intervals):
-    validated_intervals = validate_and_convert_intervals(available_intervals)
+    validated_intervals, report = validate_and_convert_intervals(available_intervals, with_report=True)
+    if report.changed:
+        st.info(f"Availability tidied up: {report.summary()}.")
     payload = {
         "id": id,
         "name": name,
@@ -359,6 +394,8 @@ def create_teacher_profile(id, name, phone, email, about_section, subjects_to_te
     }
     response = send_data("/teachers", data=payload)
     if response:
+        shared_index().replace_teacher(id, validated_intervals)
+        shared_search_index().replace_teacher(payload)
         st.session_state.profile_type = "Teacher"
         st.session_state.navigation = "main_app"
         st.success("Teacher profile created successfully!")
@@ -0,0 +1,285 @@
+"""
+Recurring weekly availability as a bitmap.
+
+A week is 7 days of 96 fifteen-minute slots, and a template is a single
+672-bit integer with one bit per slot (bit ``day * SLOTS_PER_DAY + slot``,
+Monday is day 0). Dates that differ from the usual week are stored as
+exceptions: a date -> that day's 96 bits, replacing the weekly pattern for
+that date only. Checking whether two templates overlap is one AND of two
+integers. Concrete intervals are only produced on demand, by `expand`, for
+the dates being viewed or queried, and `to_available` / `from_available`
+convert to and from the records' ``available`` list.
+
+Times are naive wall-clock times, like the rest of the availability data.
+"""
+import os
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from availability import ParsedAvailability, from_epoch, normalize_availability, parse_iso_array
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# How far ahead a template is expanded into the `available` list when saved
+WEEKLY_HORIZON_DAYS = int(os.getenv("WEEKLY_HORIZON_DAYS", "28"))
+
+_SLOT = timedelta(minutes=SLOT_MINUTES)
+_DAY = timedelta(days=1)
+
+
+def _slot_of(value, round_up=False):
+    """Slot index of a time of day; partial slots round down (or up)."""
+    seconds = value.hour * 3600 + value.minute * 60 + value.second + (value.microsecond > 0)
+    return -(-seconds // (SLOT_MINUTES * 60)) if round_up else seconds // (SLOT_MINUTES * 60)
+
+
+def _range_bits(first, last):
+    """Bits first .. last - 1 set."""
+    return ((1 << last) - 1) ^ ((1 << first) - 1) if last > first else 0
+
+
+def _runs(bits):
+    """(first, last) slot ranges of consecutive set bits, lowest first."""
+    offset = 0
+    while bits:
+        skip = (bits & -bits).bit_length() - 1
+        bits >>= skip
+        length = (~bits & (bits + 1)).bit_length() - 1
+        yield offset + skip, offset + skip + length
+        bits >>= length
+        offset += skip + length
+
+
+class WeeklyTemplate:
+    """
+    A weekly availability pattern plus per-date exceptions.
+
+    Args:
+        bits (int): One bit per 15-minute slot of the week, Monday 00:00 first.
+        exceptions (dict): date -> 96-bit day pattern replacing the weekly one on that date.
+    """
+
+    __slots__ = ("bits", "exceptions")
+
+    def __init__(self, bits=0, exceptions=None):
+        self.bits = bits
+        self.exceptions = dict(exceptions or {})
+
+    def __eq__(self, other):
+        return isinstance(other, WeeklyTemplate) and (self.bits, self.exceptions) == (other.bits, other.exceptions)
+
+    def __bool__(self):
+        return bool(self.bits) or any(self.exceptions.values())
+
+    def __repr__(self):
+        return f"WeeklyTemplate({self.hours():g} h/week, {len(self.exceptions)} exceptions)"
+
+    def copy(self):
+        return WeeklyTemplate(self.bits, self.exceptions)
+
+    # ------------------------------------------------------------------
+    # Editing
+    # ------------------------------------------------------------------
+    def _week_range(self, weekday, start, end):
+        first = weekday * SLOTS_PER_DAY + _slot_of(start, round_up=True)
+        last = weekday * SLOTS_PER_DAY + (_slot_of(end) if end != time(0) else SLOTS_PER_DAY)
+        if last <= first:  # runs past midnight into the next day
+            last += SLOTS_PER_DAY
+        bits = _range_bits(first, min(last, SLOTS_PER_WEEK))
+        if last > SLOTS_PER_WEEK:  # Sunday night into Monday morning
+            bits |= _range_bits(0, last - SLOTS_PER_WEEK)
+        return bits
+
+    def add(self, weekday, start, end):
+        """Mark `start`-`end` on `weekday` (0 = Monday) as available every week; ends of 00:00 mean midnight."""
+        self.bits |= self._week_range(weekday, start, end)
+        return self
+
+    def remove(self, weekday, start, end):
+        self.bits &= ~self._week_range(weekday, start, end)
+        return self
+
+    def set_exception(self, day, ranges=()):
+        """Replace the pattern on one date: available only in the given (start, end) times, or not at all."""
+        bits = 0
+        for start, end in ranges:
+            bits |= _range_bits(_slot_of(start, round_up=True), _slot_of(end) if end != time(0) else SLOTS_PER_DAY)
+        self.exceptions[day] = bits
+        return self
+
+    def clear_exception(self, day):
+        self.exceptions.pop(day, None)
+        return self
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def day_bits(self, day):
+        """The 96 slot bits in effect on `day`."""
+        bits = self.exceptions.get(day)
+        if bits is None:
+            bits = (self.bits >> (day.weekday() * SLOTS_PER_DAY)) & DAY_MASK
+        return bits
+
+    def weekly_ranges(self, weekday):
+        """(start time, end time) ranges of the weekly pattern on `weekday`; an end of 00:00 is midnight."""
+        day = (self.bits >> (weekday * SLOTS_PER_DAY)) & DAY_MASK
+        return [(self._time(first), self._time(last % SLOTS_PER_DAY)) for first, last in _runs(day)]
+
+    @staticmethod
+    def _time(slot):
+        return time(slot * SLOT_MINUTES // 60, slot * SLOT_MINUTES % 60)
+
+    def hours(self):
+        """Hours per week in the weekly pattern."""
+        return self.bits.bit_count() * SLOT_MINUTES / 60
+
+    def overlaps(self, other):
+        """True if the two weekly patterns share at least one slot (exceptions are not considered)."""
+        return bool(self.bits & other.bits)
+
+    def common(self, other):
+        """The weekly slots both patterns have, as a new template."""
+        return WeeklyTemplate(self.bits & other.bits)
+
+    def overlap_hours(self, other):
+        return (self.bits & other.bits).bit_count() * SLOT_MINUTES / 60
+
+    def covers(self, start, end):
+        """True if every slot touched by [start, end) is available, taking exceptions into account."""
+        day = start.date()
+        while datetime.combine(day, time(0)) < end:
+            first = _slot_of(start.time()) if day == start.date() else 0
+            last = _slot_of(end.time(), round_up=True) if day == end.date() else SLOTS_PER_DAY
+            needed = _range_bits(first, last)
+            if self.day_bits(day) & needed != needed:
+                return False
+            day += _DAY
+        return True
+
+    def uncovered(self, available):
+        """The intervals of an `available` list that the template does not already cover."""
+        if not self:
+            return list(available)
+        parsed = ParsedAvailability.parse(available)
+        return [interval for interval, start, end, ok
+                in zip(available, parsed.starts.tolist(), parsed.ends.tolist(), parsed.valid.tolist())
+                if not ok or not self.covers(from_epoch(start), from_epoch(end))]
+
+    def expand(self, start, end):
+        """
+        Yield the available (start, end) datetimes between `start` and `end`, in order.
+
+        Only the days in the window are looked at, one at a time. Runs that
+        continue past midnight are yielded as one interval.
+        """
+        if isinstance(start, date) and not isinstance(start, datetime):
+            start = datetime.combine(start, time(0))
+        if isinstance(end, date) and not isinstance(end, datetime):
+            end = datetime.combine(end, time(0))
+        day = start.date()
+        pending = None
+        while datetime.combine(day, time(0)) < end:
+            midnight = datetime.combine(day, time(0))
+            for first, last in _runs(self.day_bits(day)):
+                run_start, run_end = midnight + first * _SLOT, midnight + last * _SLOT
+                if pending is not None and pending[1] == run_start:
+                    pending = (pending[0], run_end)
+                    continue
+                if pending is not None:
+                    yield from self._clipped(pending, start, end)
+                pending = (run_start, run_end)
+            day += _DAY
+        if pending is not None:
+            yield from self._clipped(pending, start, end)
+
+    @staticmethod
+    def _clipped(interval, start, end):
+        clipped = (max(interval[0], start), min(interval[1], end))
+        if clipped[1] > clipped[0]:
+            yield clipped
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+    def to_available(self, start, end):
+        """The template between `start` and `end` as an `available` list of ISO string dicts."""
+        return [{"start": s.isoformat(), "end": e.isoformat()} for s, e in self.expand(start, end)]
+
+    @classmethod
+    def from_available(cls, available, start=None, end=None):
+        """
+        Infer a template from an `available` list.
+
+        Each weekday gets its most common day pattern over the dates in
+        [start, end) (by default, the dates the list spans), and dates that
+        differ become exceptions, so expanding the result over those dates
+        gives back the list (normalized, and with partial 15-minute slots
+        trimmed).
+
+        Args:
+            available (list): {"start", "end"} dicts.
+            start, end (date): The window the list describes; days in it with no intervals count as unavailable.
+        """
+        normalized, _ = normalize_availability(available)
+        if not normalized:
+            return cls()
+        days = {}
+        starts, _ = parse_iso_array(interval["start"] for interval in normalized)
+        ends, _ = parse_iso_array(interval["end"] for interval in normalized)
+        for begins, finishes in zip(starts.tolist(), ends.tolist()):
+            begins, finishes = from_epoch(begins), from_epoch(finishes)
+            day, first = begins.date(), _slot_of(begins.time(), round_up=True)
+            while datetime.combine(day, time(0)) < finishes:
+                last = _slot_of(finishes.time()) if finishes.date() == day else SLOTS_PER_DAY
+                days[day] = days.get(day, 0) | _range_bits(first, last)
+                day, first = day + _DAY, 0
+
+        first_day = start or min(days)
+        last_day = end - _DAY if end else max(days)
+        by_weekday = [Counter() for _ in range(7)]
+        day = first_day
+        while day <= last_day:
+            by_weekday[day.weekday()][days.get(day, 0)] += 1
+            day += _DAY
+        bits = 0
+        for weekday, counts in enumerate(by_weekday):
+            if counts:
+                bits |= counts.most_common(1)[0][0] << (weekday * SLOTS_PER_DAY)
+        template = cls(bits)
+        day = first_day
+        while day <= last_day:
+            if days.get(day, 0) != template.day_bits(day):
+                template.exceptions[day] = days.get(day, 0)
+            day += _DAY
+        return template
+
+    def to_json(self):
+        """Compact JSON-friendly form: hex bitmaps keyed by ISO date for exceptions."""
+        return {
+            "slot_minutes": SLOT_MINUTES,
+            "weekly": format(self.bits, "x"),
+            "exceptions": {day.isoformat(): format(bits, "x") for day, bits in sorted(self.exceptions.items())},
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Parse `to_json` output.
+
+        Raises:
+            ValueError: If the data is malformed or uses a different slot size.
+        """
+        if not isinstance(data, dict) or data.get("slot_minutes", SLOT_MINUTES) != SLOT_MINUTES:
+            raise ValueError("not a weekly availability template")
+        try:
+            bits = int(data.get("weekly") or "0", 16)
+            exceptions = {date.fromisoformat(day): int(value, 16) & DAY_MASK
+                          for day, value in (data.get("exceptions") or {}).items()}
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"malformed weekly availability template: {e}") from None
+        return cls(bits & ((1 << SLOTS_PER_WEEK) - 1), exceptions)